@@ -7,7 +7,9 @@ from .models import (
     Bank,
     CurrencyExchangeRate,
     MarketExchangeRate,
-    WorkerActivity
+    WorkerActivity,
+    CurrentRate,
+    CurrentMarketRate,
 )
 
 User = get_user_model()
@@ -33,6 +35,16 @@ class MarketExchangeRateAdmin(admin.ModelAdmin):
     list_filter = ('currency', 'city_name', 'date', 'is_active')
     search_fields = ('city_name', 'currency__code')
 
+@admin.register(CurrentRate)
+class CurrentRateAdmin(admin.ModelAdmin):
+    list_display = ('bank', 'currency', 'buy', 'sell', 'updated_at')
+    list_filter = ('currency', 'bank')
+
+@admin.register(CurrentMarketRate)
+class CurrentMarketRateAdmin(admin.ModelAdmin):
+    list_display = ('city_name', 'currency', 'buy', 'sell', 'updated_at')
+    list_filter = ('currency', 'city_name')
+
 @admin.register(WorkerActivity)
 class WorkerActivityAdmin(admin.ModelAdmin):
     list_display = ('worker', 'action', 'timestamp')
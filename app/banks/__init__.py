@@ -0,0 +1,3 @@
+# Каждый модуль пакета описывает один банк и регистрирует свой парсер
+# через @register (см. app/scraper_registry.py). Чтобы добавить банк,
+# достаточно положить сюда новый модуль.
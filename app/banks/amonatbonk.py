@@ -0,0 +1,26 @@
+import logging
+from ..scraper_registry import StaticScraper, register
+
+logger = logging.getLogger(__name__)
+
+
+@register
+class AmonatbonkScraper(StaticScraper):
+    name = 'amonatbonk'
+    bank_name = 'Amonatbonk'
+    # URL для API АмонатБанк
+    url = 'https://amonatbonk.tj/bitrix/templates/amonatbonk/ajax/ambApi.php?_=1741425512555'
+
+    def parse(self, response):
+        # Проверка успешности запроса
+        if response.status_code != 200:
+            logger.warning(f"Ошибка при запросе: {response.status_code}")
+            return []
+
+        # Извлекаем данные для частных лиц
+        individuals = response.json().get('individuals', {})
+
+        return [
+            {'currency': code, 'buy': rate.get('buy'), 'sell': rate.get('sell')}
+            for code, rate in individuals.items()
+        ]
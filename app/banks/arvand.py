@@ -0,0 +1,35 @@
+import logging
+from ..scraper_registry import StaticScraper, register
+
+logger = logging.getLogger(__name__)
+
+
+@register
+class ArvandScraper(StaticScraper):
+    name = 'arvand'
+    bank_name = 'Arvand'
+    url = 'https://arvand.tj/api/currencies/'
+    verify = False  # У arvand.tj невалидный сертификат
+
+    def parse(self, response):
+        if response.status_code != 200:
+            logger.warning(f"Arvand вернул статус {response.status_code}")
+            return []
+
+        currencies = {}
+
+        for currency_info in response.json():
+            currency_name = currency_info['currency_name']
+
+            # Берём только наличный курс, первую запись по каждой валюте
+            if currency_info['type_currency'] == 'CASH_RATE' and currency_name not in currencies:
+                currencies[currency_name] = {
+                    'currency': currency_name,
+                    'buy': currency_info['buy_rate'],
+                    'sell': currency_info['sell_rate']
+                }
+
+        if not currencies:
+            logger.warning("Валюты с типом CASH_RATE не найдены.")
+
+        return list(currencies.values())
@@ -0,0 +1,25 @@
+from ..scraper_registry import StaticScraper, register
+
+
+@register
+class AzizimoliyaScraper(StaticScraper):
+    name = 'azizimoliya'
+    bank_name = 'Azizimoliya'
+    url = "https://azizimoliya.tj/rates-api/"
+
+    def parse(self, response):
+        response.raise_for_status()
+
+        data = response.json()  # Это словарь, не список
+
+        result = []
+        for currency_code in ["usd", "eur", "rub"]:
+            item = data.get(currency_code)
+            if item:
+                result.append({
+                    "currency": currency_code.upper(),
+                    "buy": item.get("kassa_buy"),
+                    "sell": item.get("kassa_sell")
+                })
+
+        return result
@@ -0,0 +1,136 @@
+import logging
+import re
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+
+from ..parsing import make_soup
+from ..browser_pool import DESKTOP_USER_AGENT
+from ..scraper_registry import BrowserScraper, register
+
+logger = logging.getLogger(__name__)
+
+CURRENCY_MARKERS = ['USD', 'EUR', 'RUB', 'ДОЛЛАР', 'ЕВРО']
+
+# Расширенный список селекторов для поиска таблицы
+TABLE_SELECTORS = [
+    "table[aria-live='polite']",
+    "table.table",
+    ".currency-table",
+    "[data-testid='exchange-table']",
+    "table[class*='currency']",
+    "table[class*='exchange']",
+    "table[class*='rate']",
+    "div[class*='currency'] table",
+    "div[class*='exchange'] table",
+    ".exchange-rates table",
+    "table"
+]
+
+# Расширенные паттерны для извлечения валют
+CURRENCY_PATTERNS = [
+    r'(\d+)\s+([A-Z]{3})',  # "1 USD"
+    r'([A-Z]{3})\s+(\d+)',  # "USD 1"
+    r'([A-Z]{3})',  # Просто "USD"
+]
+
+
+def has_currency_data(text):
+    text = text.upper()
+    return any(currency in text for currency in CURRENCY_MARKERS)
+
+
+def extract_currency(text):
+    """Извлекает код валюты из текста ячейки вида "1 USD", "USD 1" или "USD" """
+    for pattern in CURRENCY_PATTERNS:
+        match = re.search(pattern, text.upper())
+        if match:
+            return match.group(2) if match.group(1).isdigit() else match.group(1)
+    return None
+
+
+@register
+class BRTScraper(BrowserScraper):
+    """Банк Республики Таджикистан: таблица курсов подгружается скриптом"""
+    name = 'brt'
+    bank_name = 'Банк Республики Таджикистан'
+    url = "https://www.brt.tj/"
+    user_agent = DESKTOP_USER_AGENT
+    timeout = 45
+    implicit_wait = 0  # Иначе каждый отсутствующий селектор ждал бы implicit wait
+
+    def find_table(self, driver):
+        # Обычно хватает селектора из прошлого запуска; весь список — только при промахе
+        table_element = self.find_with_learned_selector(
+            driver,
+            TABLE_SELECTORS,
+            lambda element: element.is_displayed() and has_currency_data(element.text),
+        )
+        if table_element:
+            return table_element
+
+        # Если таблица не найдена стандартными способами — ищем родительскую таблицу у текста валюты
+        logger.info("Ищем альтернативными методами...")
+        for pattern in ["USD", "EUR", "RUB", "доллар", "евро"]:
+            for elem in driver.find_elements(By.XPATH, f"//*[contains(text(), '{pattern}')]"):
+                try:
+                    return elem.find_element(By.XPATH, "./ancestor::table[1]")
+                except WebDriverException:
+                    continue
+
+        return None
+
+    def scrape(self, driver):
+        driver.get(self.url)
+
+        if not self.find_table(driver):
+            logger.warning("Таблица курсов не найдена или не загрузилась")
+            return None
+
+        # Получаем HTML после полной загрузки
+        return driver.page_source
+
+    def parse(self, html):
+        if not html:
+            return []
+
+        soup = make_soup(html)
+
+        table = None
+        for selector in self.order_selectors(TABLE_SELECTORS[:-1]):
+            table = soup.select_one(selector)
+            if table:
+                break
+
+        # Альтернативный поиск
+        if not table:
+            table = next((t for t in soup.find_all('table') if has_currency_data(t.get_text())), None)
+
+        if not table:
+            logger.warning("[!] Таблица курсов не найдена в HTML")
+            return []
+
+        result = []
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) < 3:
+                continue
+
+            # Пропускаем заголовки
+            currency_text = cells[0].get_text().strip()
+            if any(header in currency_text.lower() for header in ['асъор', 'валюта', 'currency', 'код']):
+                continue
+
+            # Также проверяем div внутри ячейки
+            currency_div = cells[0].find('div')
+            if currency_div and currency_div.get_text().strip():
+                currency_text = currency_div.get_text().strip()
+
+            currency = extract_currency(currency_text)
+            if currency in self.currencies:
+                result.append({
+                    "currency": currency,
+                    "buy": cells[1].get_text().strip(),
+                    "sell": cells[2].get_text().strip()
+                })
+
+        return result
@@ -0,0 +1,40 @@
+from ..parsing import table_rows
+from ..scraper_registry import StaticScraper, register
+
+# Конвертируем символы в коды валют
+CURRENCY_MAPPING = {
+    '$': 'USD',
+    '€': 'EUR',
+    '₽': 'RUB'
+}
+
+
+@register
+class CBTScraper(StaticScraper):
+    name = 'cbt'
+    bank_name = 'CBT'
+    url = "https://cbt.tj/"
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    timeout = 10
+    fragment_markers = ('id="CASH"', '</table>')
+
+    def parse(self, response):
+        response.raise_for_status()
+
+        result = []
+        for cells in table_rows(response.text, 'table#CASH tbody') or []:
+            if len(cells) < 3 or not cells[0]:
+                continue
+
+            # Конвертируем символ валюты в код
+            currency_code = CURRENCY_MAPPING.get(cells[0].split()[0])
+            if currency_code:
+                result.append({
+                    "currency": currency_code,
+                    "buy": cells[1],
+                    "sell": cells[2]
+                })
+
+        return result
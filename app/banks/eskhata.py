@@ -0,0 +1,49 @@
+import fake_useragent
+from ..parsing import make_soup
+from ..scraper_registry import StaticScraper, register
+
+
+@register
+class EskhataScraper(StaticScraper):
+    name = 'eskhata'
+    bank_name = 'Eskhata'
+    url = 'https://eskhata.com/'
+
+    def get_headers(self):
+        return {'User-Agent': fake_useragent.UserAgent().random}
+
+    def parse(self, response):
+        soup = make_soup(response.text)
+
+        rows = soup.find_all('tr')
+        target_currencies = ['USD', 'EUR', 'RUB']
+
+        found = set()
+        result = []
+
+        for row in rows:
+            cells = row.find_all('td')
+            if len(cells) >= 3:
+                currency = cells[0].text.strip().upper()
+
+                if currency == 'RUR':
+                    currency = 'RUB'
+
+                if currency not in target_currencies:
+                    continue
+
+                # Если эту валюту уже нашли — пропускаем, чтобы не дублировать
+                if currency in found:
+                    continue
+
+                found.add(currency)
+                result.append({
+                    'currency': currency,
+                    'buy': cells[1].text.strip(),
+                    'sell': cells[2].text.strip()
+                })
+
+                if found == set(target_currencies):
+                    break  # нашли все, выходим из цикла
+
+        return result
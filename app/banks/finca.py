@@ -0,0 +1,30 @@
+from ..parsing import make_soup
+from ..scraper_registry import StaticScraper, register
+
+
+@register
+class FincaScraper(StaticScraper):
+    name = 'finca'
+    bank_name = 'Finca'
+    url = "https://finca.tj/"
+    fragment_markers = ('finca-table-rate', '</table>')
+
+    def parse(self, response):
+        response.raise_for_status()
+
+        soup = make_soup(response.text)
+        table = soup.select_one('div.finca-table-rate table')
+
+        result = []
+        if table:
+            rows = table.find("tbody").find_all("tr")
+            for row in rows:
+                cols = row.find_all("td")
+                if len(cols) == 3:
+                    result.append({
+                        "currency": cols[0].get_text(strip=True),
+                        "buy": cols[1].get_text(strip=True),
+                        "sell": cols[2].get_text(strip=True)
+                    })
+
+        return result
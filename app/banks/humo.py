@@ -0,0 +1,37 @@
+from ..parsing import make_soup
+from ..scraper_registry import StaticScraper, register
+
+
+@register
+class HumoScraper(StaticScraper):
+    name = 'humo'
+    bank_name = 'HUMO'
+    url = "https://humo.tj/ru/"
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    timeout = 10
+
+    def parse(self, response):
+        response.raise_for_status()
+
+        soup = make_soup(response.content)
+        humo_section = soup.find('div', class_='kursHUMO')
+
+        result = []
+        if humo_section:
+            # Находим все блоки с курсами валют
+            for kurs_body in humo_section.find_all('div', class_='kursBody'):
+                divs = kurs_body.find_all('div')
+                if len(divs) >= 3:
+                    # Извлекаем код валюты из первого div (например, "1 USD")
+                    currency_code = divs[0].get_text(strip=True).split()[-1]
+
+                    if currency_code in ["USD", "EUR", "RUB"]:
+                        result.append({
+                            "currency": currency_code,
+                            "buy": divs[1].get_text(strip=True),
+                            "sell": divs[2].get_text(strip=True)
+                        })
+
+        return result
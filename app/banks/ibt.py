@@ -0,0 +1,80 @@
+import logging
+import random
+from ..parsing import table_rows
+from ..scraper_registry import StaticScraper, register
+
+logger = logging.getLogger(__name__)
+
+
+def get_random_user_agent():
+    """
+    Возвращает случайный User-Agent
+    """
+    user_agents = [
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/119.0',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    ]
+    return random.choice(user_agents)
+
+
+def extract_rates_from_table(rows):
+    """
+    Извлекает курсы валют из строк таблицы (специально для IBT.tj):
+    валюта в первой ячейке (th), затем покупка и продажа
+    """
+    rates_data = []
+
+    for cells in rows:
+        # Пропускаем заголовки и строки без курсов
+        if len(cells) < 3:
+            continue
+
+        currency_text = cells[0].upper()
+        if currency_text in ['USD', 'EUR', 'RUB']:
+            rates_data.append({
+                'currency': currency_text,
+                'buy': cells[1],
+                'sell': cells[2]
+            })
+
+    return rates_data
+
+
+@register
+class IBTScraper(StaticScraper):
+    name = 'ibt'
+    bank_name = 'IBT'
+    url = 'https://www.ibt.tj/'
+    verify = False  # Проверка SSL для ibt.tj отключена
+    timeout = 10
+    fragment_markers = ('id="ibt"', '</table>')
+
+    def get_headers(self):
+        return {
+            'User-Agent': get_random_user_agent(),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'ru-RU,ru;q=0.8,en-US;q=0.5,en;q=0.3',
+            'Upgrade-Insecure-Requests': '1'
+        }
+
+    def parse(self, response):
+        """
+        Разбирает курсы валют со страницы IBT.tj (только из div#ibt)
+        """
+        response.raise_for_status()
+
+        # Таблица внутри div#ibt: сначала с классом mb-0, иначе любая
+        rows = table_rows(response.text, 'div#ibt table.mb-0')
+        if rows is None:
+            rows = table_rows(response.text, 'div#ibt table')
+        if rows is None:
+            logger.warning("Таблица не найдена в разделе МБТ(Наличные)")
+            return []
+
+        rates = extract_rates_from_table(rows)
+        if not rates:
+            logger.warning("Таблица не содержит валютные данные")
+        return rates
@@ -0,0 +1,52 @@
+import logging
+
+from ..parsing import make_soup
+from ..scraper_registry import BrowserScraper, register
+
+logger = logging.getLogger(__name__)
+
+CURRENCY_TITLES = {
+    "доллар": "USD",
+    "евро": "EUR",
+    "рубль": "RUB",
+}
+
+
+@register
+class ImonScraper(BrowserScraper):
+    name = 'imon'
+    bank_name = 'Imon'
+    url = "https://www.imon.tj/"
+    implicit_wait = 0
+
+    def scrape(self, driver):
+        driver.get(self.url)
+        return driver.page_source
+
+    def parse(self, html):
+        soup = make_soup(html)
+
+        currency_data = []
+        for block in soup.select("div.col-12.col-md.mt-3"):
+            title = block.select_one("h5.title")
+            if not title:
+                continue
+
+            title = title.get_text(strip=True).lower()
+            code = next((code for word, code in CURRENCY_TITLES.items() if word in title), None)
+            if not code:
+                continue
+
+            cols = block.select("div.row .col-6")
+            spans = [col.find("span") for col in cols[:2]]
+            if len(cols) < 2 or not all(spans):
+                logger.warning(f"[!] Недостаточно колонок в блоке валюты {code}")
+                continue
+
+            currency_data.append({
+                "currency": code,
+                "buy": spans[0].get_text(strip=True),
+                "sell": spans[1].get_text(strip=True)
+            })
+
+        return currency_data
@@ -0,0 +1,21 @@
+from ..scraper_registry import StaticScraper, register
+
+
+@register
+class MatinScraper(StaticScraper):
+    name = 'matin'
+    bank_name = 'Matin'
+    url = "https://matin.tj/api/currency"
+    verify = False  # Проверка SSL отключена (временно)
+
+    def parse(self, response):
+        response.raise_for_status()
+
+        return [
+            {
+                "currency": item.get("currency"),
+                "buy": item.get("valuebuy"),
+                "sell": item.get("valuesale")
+            }
+            for item in response.json()
+        ]
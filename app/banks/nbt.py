@@ -0,0 +1,50 @@
+import logging
+from datetime import timedelta
+from ..parsing import table_rows
+from ..scraper_registry import StaticScraper, register
+
+logger = logging.getLogger(__name__)
+
+TARGET_CURRENCIES = {
+    "Доллар США": "USD",
+    "ЕВРО": "EUR",
+    "Российский рубль": "RUB",
+}
+
+
+@register
+class NBTScraper(StaticScraper):
+    """Официальный курс Национального банка Таджикистана"""
+    name = 'nbt'
+    bank_name = 'NBT'
+    url = "https://nbt.tj/ru/kurs/kurs.php"
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+    }
+    encoding = 'utf-8'  # Учитываем кириллицу
+    fragment_markers = ('new__rate__nbt-table', '</tbody>')
+    # Официальный курс устанавливается раз в день
+    refresh_interval = timedelta(hours=24)
+    min_refresh_interval = timedelta(hours=12)
+
+    def parse(self, response):
+        rows = table_rows(response.text, "tbody.new__rate__nbt-table")
+        if rows is None:
+            logger.warning("Таблица курсов NBT не найдена")
+            return []
+
+        result = []
+        for columns in rows:
+            if len(columns) < 5:
+                continue
+
+            currency_name, rate = columns[3], columns[4]
+            if currency_name in TARGET_CURRENCIES:
+                # и покупка, и продажа одинаковы
+                result.append({
+                    "currency": TARGET_CURRENCIES[currency_name],
+                    "buy": rate,
+                    "sell": rate
+                })
+
+        return result
@@ -0,0 +1,29 @@
+from ..parsing import make_soup
+from ..scraper_registry import StaticScraper, register
+
+
+@register
+class OriyonbonkScraper(StaticScraper):
+    name = 'oriyonbonk'
+    bank_name = 'Oriyonbonk'
+    url = 'https://oriyonbonk.tj/ru'
+
+    def parse(self, response):
+        soup = make_soup(response.text)
+
+        currency_blocks = soup.find_all('div', class_='grid grid-cols-[2fr_1fr_1fr] gap-x-10 py-4 border-b-border border-solid border-b')
+        result = []
+
+        for block in currency_blocks:
+            currency_name = block.find('p').text.strip()
+            currency_name = currency_name.split(" ", 1)[1]  # "1 USD" -> "USD"
+
+            p_elements = block.find_all('p', class_='text-right')
+            if len(p_elements) >= 2:
+                result.append({
+                    'currency': currency_name,
+                    'buy': p_elements[0].text.strip(),
+                    'sell': p_elements[1].text.strip()
+                })
+
+        return result
@@ -0,0 +1,50 @@
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from ..parsing import make_soup
+from ..browser_pool import MOBILE_USER_AGENT
+from ..scraper_registry import BrowserScraper, register
+
+logger = logging.getLogger(__name__)
+
+
+@register
+class SpitamenbankScraper(BrowserScraper):
+    name = 'spitamenbank'
+    bank_name = 'Spitamenbank'
+    url = 'https://www.spitamenbank.tj/tj/personal/'
+    user_agent = MOBILE_USER_AGENT
+
+    def scrape(self, driver):
+        driver.get(self.url)
+
+        # Ждем загрузки элементов с курсами
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.ID, "currency-list"))
+        )
+        return driver.page_source
+
+    def parse(self, html):
+        soup = make_soup(html)
+        target_li = soup.find('li', {'c_index': '1'})
+
+        if not target_li:
+            logger.warning("[!] Не найден блок с валютами Spitamenbank (li с c_index='1').")
+            return []
+
+        results = []
+        for row in target_li.select('.currency-values'):
+            divs = row.find_all('div', {'c-val': True})
+            if len(divs) < 3:
+                logger.warning(f"Недостаточно div элементов в строке курса: {len(divs)}")
+                continue
+
+            results.append({
+                'currency': divs[0].text.strip(),
+                'buy': divs[1].get('c-val'),
+                'sell': divs[2].get('c-val')
+            })
+
+        return results
@@ -0,0 +1,49 @@
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from ..parsing import make_soup
+from ..browser_pool import MOBILE_USER_AGENT
+from ..scraper_registry import BrowserScraper, register
+
+logger = logging.getLogger(__name__)
+
+
+@register
+class SSBScraper(BrowserScraper):
+    name = 'ssb'
+    bank_name = 'Sanoatsodirotbonk'
+    url = "https://www.ssb.tj/ru/?type=1"
+    user_agent = MOBILE_USER_AGENT
+
+    def scrape(self, driver):
+        driver.get(self.url)
+
+        # Ждем загрузки блоков с данными
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "main_block"))
+        )
+        return driver.page_source
+
+    def parse(self, html):
+        # Блоки идут по порядку: валюты, покупка, продажа
+        blocks = make_soup(html).find_all(class_="main_block")
+        if len(blocks) < 3:
+            raise ValueError(f"Недостаточно блоков с данными. Найдено: {len(blocks)}, требуется: 3")
+
+        currency_elements, buy_elements, sell_elements = (block.find_all("p") for block in blocks[:3])
+
+        result = []
+        for i, el in enumerate(currency_elements):
+            currency_text = el.get_text(strip=True).upper()
+            if currency_text not in self.currencies:
+                continue
+
+            result.append({
+                "currency": currency_text,
+                "buy": buy_elements[i].get_text(strip=True) if i < len(buy_elements) else None,
+                "sell": sell_elements[i].get_text(strip=True) if i < len(sell_elements) else None
+            })
+
+        return result
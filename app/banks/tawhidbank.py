@@ -0,0 +1,47 @@
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from ..parsing import make_soup
+from ..browser_pool import MOBILE_USER_AGENT
+from ..scraper_registry import BrowserScraper, register
+
+logger = logging.getLogger(__name__)
+
+
+@register
+class TawhidbankScraper(BrowserScraper):
+    name = 'tawhidbank'
+    bank_name = 'Tawhidbank'
+    url = "https://www.tawhidbank.tj/personal"
+    user_agent = MOBILE_USER_AGENT
+
+    def scrape(self, driver):
+        driver.get(self.url)
+
+        # Ждем загрузки элементов с курсами
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "rate-row"))
+        )
+        return driver.page_source
+
+    def parse(self, html):
+        soup = make_soup(html)
+
+        result = []
+        for row in soup.find_all("div", class_="rate-row"):
+            currency_tag = row.find("div", class_="currency-name")
+            rates = row.find_all("div", class_="rate")
+
+            if not currency_tag or len(rates) < 2:
+                logger.warning("Пропущен блок: не хватает данных о валюте или курсах")
+                continue
+
+            result.append({
+                "currency": currency_tag.text.strip(),
+                "buy": rates[0].text.strip(),
+                "sell": rates[1].text.strip()
+            })
+
+        return result
@@ -0,0 +1,38 @@
+from ..parsing import make_soup
+from ..scraper_registry import StaticScraper, register
+
+
+@register
+class TejaratbankScraper(StaticScraper):
+    """Курсы валют со страницы Течарат Банка"""
+    name = 'tejaratbank'
+    bank_name = 'Tejaratbank'
+    url = "https://tejaratbank.tj/"
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    timeout = 10
+
+    def parse(self, response):
+        response.raise_for_status()
+
+        soup = make_soup(response.text)
+
+        # Ищем все элементы с заголовками
+        headings = soup.find_all('div', class_='elementor-heading-title')
+
+        result = []
+        for i, heading in enumerate(headings):
+            text = heading.get_text().strip()
+
+            if text in ['USD', 'EURO', 'RUB']:
+                # Следующие два элемента должны содержать курсы
+                if i + 2 >= len(headings):
+                    continue
+                result.append({
+                    'currency': text,  # EURO приводится к EUR при нормализации
+                    'buy': headings[i + 1].get_text().strip(),
+                    'sell': headings[i + 2].get_text().strip()
+                })
+
+        return result
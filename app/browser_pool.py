@@ -0,0 +1,197 @@
+import atexit
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+logger = logging.getLogger(__name__)
+
+DESKTOP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
+MOBILE_USER_AGENT = "Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36"
+
+
+def find_chrome_binary():
+    """Определяет путь к Chrome/Chromium"""
+    chrome_bin = os.environ.get('CHROME_BIN', '/usr/bin/chromium')
+    if os.path.exists(chrome_bin):
+        return chrome_bin
+
+    # Пробуем альтернативные пути
+    possible_paths = [
+        '/usr/bin/google-chrome',
+        '/usr/bin/google-chrome-stable',
+        '/usr/bin/chromium-browser',
+        '/usr/bin/chromium'
+    ]
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+
+    logger.warning("Не найден исполняемый файл Chrome/Chromium")
+    return None
+
+
+def build_chrome_options():
+    """Общие настройки headless Chromium для всех банков"""
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-plugins")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"--user-agent={DESKTOP_USER_AGENT}")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    options.add_argument('--log-level=3')
+    # Сетевой журнал для поиска JSON/XHR-запроса с курсами (network_capture)
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+    options.add_argument('--silent')
+
+    chrome_bin = find_chrome_binary()
+    if chrome_bin:
+        options.binary_location = chrome_bin
+    return options
+
+
+class BrowserPool:
+    """
+    Пул долгоживущих headless-браузеров для банков с JS-рендерингом.
+
+    Каждый вызов page() получает отдельную вкладку в одном из браузеров пула.
+    Число одновременно открытых вкладок ограничено размером пула, а браузер
+    перезапускается после max_pages страниц, чтобы память не росла бесконечно.
+    """
+
+    def __init__(self, size, max_pages):
+        self.size = size
+        self.max_pages = max_pages
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._pages = {}
+        self._all = set()
+        self._driver_path = None
+
+    def _get_driver_path(self):
+        """Путь к ChromeDriver определяется один раз на процесс"""
+        with self._lock:
+            if self._driver_path is None:
+                system_driver = os.environ.get('CHROMEDRIVER_PATH')
+                if system_driver and os.path.exists(system_driver):
+                    self._driver_path = system_driver
+                else:
+                    try:
+                        self._driver_path = ChromeDriverManager().install()
+                    except Exception as e:
+                        logger.error(f"Ошибка при установке ChromeDriver: {e}")
+                        self._driver_path = ''  # Используем системный chromedriver
+                logger.info(f"ChromeDriver: {self._driver_path or 'системный'}")
+            return self._driver_path
+
+    def _create_driver(self):
+        driver_path = self._get_driver_path()
+        service = Service(driver_path) if driver_path else Service()
+        driver = webdriver.Chrome(service=service, options=build_chrome_options())
+        # Удаляем webdriver property для обхода детекции на всех страницах
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            'source': "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+        })
+        logger.info("Chrome WebDriver успешно создан")
+        return driver
+
+    def _checkout(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        driver = self._create_driver()
+        with self._lock:
+            self._all.add(driver)
+            self._pages[driver] = 0
+        return driver
+
+    def _checkin(self, driver, broken):
+        with self._lock:
+            self._pages[driver] = self._pages.get(driver, 0) + 1
+            recycle = broken or self._pages[driver] >= self.max_pages
+            if not recycle:
+                self._idle.append(driver)
+                return
+            self._all.discard(driver)
+            self._pages.pop(driver, None)
+        self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Предупреждение при закрытии драйвера: {e}")
+
+    @contextmanager
+    def page(self, user_agent=None, page_load_timeout=30, implicit_wait=0):
+        """
+        Выдаёт драйвер с новой изолированной вкладкой; по выходе вкладка
+        закрывается, а cookies браузера очищаются
+        """
+        self._slots.acquire()
+        driver = None
+        broken = False
+        try:
+            driver = self._checkout()
+            main_handle = driver.current_window_handle
+
+            try:
+                driver.switch_to.new_window('tab')
+                driver.set_page_load_timeout(page_load_timeout)
+                driver.implicitly_wait(implicit_wait)
+                if user_agent:
+                    driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': user_agent})
+                # Сбрасываем сетевой журнал прошлых вкладок, чтобы он не копился
+                driver.get_log('performance')
+            except Exception:
+                # Браузер не отвечает — не возвращаем его в пул
+                broken = True
+                raise
+
+            try:
+                yield driver
+            finally:
+                try:
+                    driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+                    driver.close()
+                    driver.switch_to.window(main_handle)
+                except Exception as e:
+                    logger.warning(f"Не удалось закрыть вкладку, браузер будет перезапущен: {e}")
+                    broken = True
+        finally:
+            if driver is not None:
+                self._checkin(driver, broken)
+            self._slots.release()
+
+    def shutdown(self):
+        """Закрывает все браузеры пула"""
+        with self._lock:
+            drivers = list(self._all)
+            self._all.clear()
+            self._idle.clear()
+            self._pages.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+
+browser_pool = BrowserPool(
+    size=settings.BROWSER_POOL_SIZE,
+    max_pages=settings.BROWSER_POOL_MAX_PAGES,
+)
+atexit.register(browser_pool.shutdown)
@@ -0,0 +1,129 @@
+import logging
+import random
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+
+BREAKER_KEY = 'scraper:breaker:{}'
+PROBE_KEY = 'scraper:breaker:{}:probe'
+BREAKER_TIMEOUT = 7 * 24 * 60 * 60
+
+
+class CircuitBreaker:
+    """
+    Предохранитель парсера банка; состояние в общем кэше (Redis), поэтому
+    видно всем воркерам.
+
+    После threshold неудач подряд цепь размыкается, и банк пропускается без
+    запроса к сайту на cooldown секунд. Затем ровно один запуск проходит
+    пробным (half-open): успех замыкает цепь, неудача снова размыкает её.
+    """
+
+    def __init__(self, name, threshold=None, cooldown=None):
+        self.name = name
+        self.threshold = threshold or settings.SCRAPER_BREAKER_THRESHOLD
+        self.cooldown = cooldown or settings.SCRAPER_BREAKER_COOLDOWN
+
+    def get_state(self):
+        return cache.get(BREAKER_KEY.format(self.name)) or {'state': CLOSED, 'failures': 0, 'opened_at': None}
+
+    def _set_state(self, state):
+        cache.set(BREAKER_KEY.format(self.name), state, BREAKER_TIMEOUT)
+
+    def retry_at(self, state=None):
+        """Когда разомкнутая цепь пропустит пробный запуск (timestamp)"""
+        state = state or self.get_state()
+        if state['state'] != OPEN:
+            return None
+        return state['opened_at'] + self.cooldown
+
+    def allow(self):
+        """Можно ли сейчас обращаться к сайту банка"""
+        state = self.get_state()
+        if state['state'] == CLOSED:
+            return True
+        if time.time() < self.retry_at(state):
+            return False
+        # Cooldown прошёл: пропускаем только один пробный запуск
+        return cache.add(PROBE_KEY.format(self.name), 1, self.cooldown)
+
+    def record_success(self):
+        state = self.get_state()
+        if state['state'] == OPEN:
+            logger.info(f"{self.name}: сайт снова отвечает, цепь замкнута")
+        if state['failures'] or state['state'] == OPEN:
+            self._set_state({'state': CLOSED, 'failures': 0, 'opened_at': None})
+        cache.delete(PROBE_KEY.format(self.name))
+
+    def record_failure(self):
+        state = self.get_state()
+        failures = state['failures'] + 1
+
+        if state['state'] == OPEN or failures >= self.threshold:
+            logger.warning(f"{self.name}: {failures} неудач подряд, пропускаю банк {self.cooldown}с")
+            self._set_state({'state': OPEN, 'failures': failures, 'opened_at': time.time()})
+        else:
+            self._set_state({'state': CLOSED, 'failures': failures, 'opened_at': None})
+        cache.delete(PROBE_KEY.format(self.name))
+
+    def describe(self):
+        """Состояние для health-эндпоинта"""
+        state = self.get_state()
+        retry_at = self.retry_at(state)
+        return {
+            'state': state['state'],
+            'failures': state['failures'],
+            'retry_at': datetime.fromtimestamp(retry_at, dt_timezone.utc).isoformat() if retry_at else None,
+        }
+
+
+class RetryBudget:
+    """
+    Общий бюджет времени на попытки одного банка: повтор с экспоненциальной
+    задержкой делается, только если он успевает уложиться в бюджет целиком.
+    """
+
+    def __init__(self, seconds, base_delay=None, max_attempts=None):
+        self.deadline = time.monotonic() + seconds
+        self.base_delay = base_delay if base_delay is not None else settings.SCRAPER_RETRY_BASE_DELAY
+        self.max_attempts = max_attempts or settings.SCRAPER_RETRY_MAX_ATTEMPTS
+        self.attempts = 0
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def next_delay(self):
+        # 1с, 2с, 4с ... плюс случайная добавка, чтобы повторы не совпадали
+        return self.base_delay * 2 ** (self.attempts - 1) * random.uniform(1, 1.5)
+
+    def call(self, func, retry_on):
+        """Вызывает func(), повторяя при исключениях retry_on, пока позволяет бюджет"""
+        while True:
+            self.attempts += 1
+            started = time.monotonic()
+            try:
+                return func()
+            except retry_on as e:
+                if not self.wait_for_retry(time.monotonic() - started):
+                    raise
+                logger.info(f"Повтор после ошибки ({self.attempts}/{self.max_attempts}): {e}")
+
+    def wait_for_retry(self, attempt_duration):
+        """
+        Ждёт перед следующей попыткой и возвращает True, если она укладывается
+        в бюджет (задержка плюс столько же времени, сколько заняла прошлая попытка)
+        """
+        if self.attempts >= self.max_attempts:
+            return False
+        delay = self.next_delay()
+        if delay + attempt_duration > self.remaining():
+            return False
+        time.sleep(delay)
+        return True
@@ -0,0 +1,99 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Если файла со списком городов нет
+DEFAULT_CITIES = [
+    {'id': 1, 'name': 'Душанбе', 'region': 'Душанбе'},
+    {'id': 2, 'name': 'Худжанд', 'region': 'Согдийская область'},
+    {'id': 3, 'name': 'Истаравшан', 'region': 'Согдийская область'},
+]
+
+
+class CityDirectory:
+    """
+    Справочник городов из cities.json в памяти процесса, с индексами по id,
+    названию и региону. Файл перечитывается, только когда меняется его mtime,
+    а mtime проверяется не чаще раза в CITIES_RELOAD_INTERVAL секунд.
+    """
+
+    def __init__(self, path, reload_interval):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._mtime = None
+        self._checked_at = None
+        self._cities = []
+        self._by_id = {}
+        self._by_name = {}
+        self._by_region = {}
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load(self, mtime):
+        if mtime is None:
+            logger.warning(f"{self.path} не найден, использую города по умолчанию")
+            return DEFAULT_CITIES
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('cities', [])
+
+    def _index(self, cities):
+        self._cities = cities
+        self._by_id = {city['id']: city for city in cities}
+        self._by_name = {city['name']: city for city in cities}
+        self._by_region = {}
+        for city in cities:
+            self._by_region.setdefault(city.get('region'), []).append(city)
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+            mtime = self._stat()
+            if self._loaded and mtime == self._mtime:
+                return
+            try:
+                self._index(self._load(mtime))
+            except Exception as e:
+                # Битый файл — остаёмся на прежнем списке и попробуем при следующем изменении
+                logger.error(f"Error loading cities: {e}")
+            self._loaded, self._mtime = True, mtime
+            logger.info(f"Справочник городов загружен: {len(self._cities)}")
+
+    def all(self):
+        """Все города в порядке файла; копия списка — вызывающий может её менять, не трогая справочник"""
+        self._refresh()
+        return list(self._cities)
+
+    def get(self, city_id):
+        self._refresh()
+        return self._by_id.get(city_id)
+
+    def by_name(self, name):
+        self._refresh()
+        return self._by_name.get(name)
+
+    def exists(self, name):
+        return self.by_name(name) is not None
+
+    def in_region(self, region):
+        self._refresh()
+        return list(self._by_region.get(region, []))
+
+
+city_directory = CityDirectory(settings.CITIES_FILE, settings.CITIES_RELOAD_INTERVAL)
@@ -0,0 +1,31 @@
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .rate_cache import get_versions
+
+
+def rates_condition(*scopes):
+    """
+    Условный GET по версиям курсов из кэша: при совпадающем If-None-Match
+    отвечает 304 до запросов к БД и сериализатора.
+    Ответ помечается no-cache, чтобы клиенты и nginx перепроверяли его каждый раз.
+
+    Last-Modified не отдаётся: в нём точность до секунды, и курс, записанный в ту же
+    секунду, что и предыдущий, не изменил бы заголовок — If-Modified-Since дал бы устаревший 304
+    """
+    def etag(request, *args, **kwargs):
+        versions = get_versions(scopes)
+        return '-'.join(f'{scope}{versions[scope]}' for scope in scopes)
+
+    def decorator(view):
+        conditional_view = condition(etag_func=etag)(view)
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            patch_cache_control(response, no_cache=True)
+            return response
+        return inner
+    return decorator
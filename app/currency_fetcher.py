@@ -1,126 +1,248 @@
-from .eskhata import fetch_and_save_currency_data_eskhata
-from .amonatbonk import fetch_and_save_currency_data_amonatbonk
-from .arvand import fetch_and_save_currency_data_arvand
-from .imon import fetch_and_save_currency_data_imon
-from .oriyonbonk import fetch_and_save_currency_data_oriyonbonk
-from .nbt import fetch_and_save_currency_data_nbt
-from .spitamenbank import fetch_and_save_currency_data_spitamenbank
-from .humo import fetch_and_save_currency_data_humo
-from .azizimoliya import fetch_and_save_currency_data_azizimoliya
-from .brt import fetch_and_save_currency_data_brt
-from .cbt import fetch_and_save_currency_data_cbt
-from .finca import fetch_and_save_currency_data_finca
-from .ibt import fetch_and_save_currency_data_ibt
-from .matin import fetch_and_save_currency_data_matin
-from .ssb import fetch_and_save_currency_data_ssb
-from .tawhidbank import fetch_and_save_currency_data_tawhidbank
-from .tejaratbank import fetch_and_save_currency_data_tejaratbank
-
-def fetch_all_currency_data():
-    print("Получение и сохранение данных...")
-
-    try:
-        fetch_and_save_currency_data_nbt()
-        print("Данные с NBT успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с NBT: {e}")
-
-    try:
-        fetch_and_save_currency_data_eskhata()
-        print("Данные с Eskhata успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Eskhata: {e}")
-
-    try:
-        fetch_and_save_currency_data_arvand()
-        print("Данные с Arvand успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Arvand: {e}")
-
-    try:
-        fetch_and_save_currency_data_imon()
-        print("Данные с Imon успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Imon: {e}")
-
-    try:
-        fetch_and_save_currency_data_oriyonbonk()
-        print("Данные с Oriyonbonk успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Oriyonbonk: {e}")
-
-    try:
-        fetch_and_save_currency_data_amonatbonk()
-        print("Данные с Amonatbonk успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Amonatbonk: {e}")
-
-    try:
-        fetch_and_save_currency_data_humo()
-        print("Данные с Humo успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Humo: {e}")
-
-    try:
-        fetch_and_save_currency_data_azizimoliya()
-        print("Данные с Azizimoliya успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Azizimoliya: {e}")
-
-    try:
-        fetch_and_save_currency_data_spitamenbank()
-        print("Данные с Spitamenbank успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Spitamenbank: {e}")
-
-    try:
-        fetch_and_save_currency_data_brt()
-        print("Данные с Bonki Rushd успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Bonki Rushd: {e}")
-
-    try:
-        fetch_and_save_currency_data_cbt()
-        print("Данные с Kommersbank успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Kommersbank: {e}")
-
-    try:
-        fetch_and_save_currency_data_finca()
-        print("Данные с Finca успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Finca: {e}")
-
-    try:
-        fetch_and_save_currency_data_ibt()
-        print("Данные с IBT успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с IBT: {e}")
-
-    try:
-        fetch_and_save_currency_data_matin()
-        print("Данные с Matin успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Matin: {e}")
-
-    try:
-        fetch_and_save_currency_data_ssb()
-        print("Данные с Sanoatsodirotbonk успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Sanoatsodirotbonk: {e}")
-
-
-    try:
-        fetch_and_save_currency_data_tawhidbank()
-        print("Данные с Tawhidbank успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Tawhidbank: {e}")
-
-    try:
-        fetch_and_save_currency_data_tejaratbank()
-        print("Данные с Tejaratbank успешно обновлены.")
-    except Exception as e:
-        print(f"Ошибка при получении данных с Tejaratbank: {e}")
-
-    return True  # или dict, если нужно
-
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .circuit_breaker import CircuitBreaker, RetryBudget
+from .http_fetcher import fetch_all
+from .rate_store import save_rates
+from .scraper_registry import STATIC, BROWSER, PAGE_STATE_KEY, PAGE_STATE_TIMEOUT, get_scrapers
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_KEY = 'scraper:report:{}'
+REPORT_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+# Итоги, которые считаются неудачей для предохранителя банка
+FAILED_STATUSES = ('error', 'empty')
+
+
+def get_last_report(name):
+    """Последний отчёт о запуске парсера (для health-эндпоинта)"""
+    return cache.get(REPORT_CACHE_KEY.format(name))
+
+
+def process_scraper(scraper, get_rates):
+    """
+    Получает курсы банка через get_rates() и очищает их. Запись в БД идёт
+    позже, одним пакетом на весь запуск (см. rate_store.save_rates).
+    Возвращает отчёт: статус, курсы, недостающие валюты и длительность.
+    """
+    started = time.monotonic()
+    report = {
+        'bank': scraper.name,
+        'bank_name': scraper.bank_name,
+        'transport': scraper.transport,
+        'status': 'ok',
+        'error': None,
+        'rates': [],
+        'saved': 0,
+        'missing': [],
+    }
+
+    try:
+        rates = scraper.clean(get_rates())
+        report['rates'] = rates
+        report['missing'] = sorted(set(scraper.currencies) - {rate['currency'] for rate in rates})
+
+        if not rates:
+            report['status'] = 'empty'
+            logger.warning(f"[!] Нет данных от {scraper.bank_name}")
+        elif report['missing']:
+            report['status'] = 'partial'
+            logger.warning(f"[!] {scraper.bank_name}: нет курсов {', '.join(report['missing'])}")
+    except Exception as e:
+        report['status'] = 'error'
+        report['error'] = str(e)
+        logger.error(f"Ошибка при обработке {scraper.bank_name}: {e}")
+
+    report['duration'] = round(time.monotonic() - started, 2)
+    return report
+
+
+def finish_report(report):
+    report.pop('rates', None)
+    report.pop('page_state', None)
+    report['finished_at'] = timezone.now().isoformat()
+    cache.set(REPORT_CACHE_KEY.format(report['bank']), report, REPORT_CACHE_TIMEOUT)
+    return report
+
+
+def run_browser_scraper(scraper):
+    """Выполняет один браузерный парсер в отдельном потоке, с повторами в пределах бюджета"""
+    budget = RetryBudget(scraper.retry_budget)
+    report = process_scraper(scraper, lambda: budget.call(scraper.fetch, scraper.retry_on))
+    report['attempts'] = budget.attempts
+    return report
+
+
+def is_retryable(scraper, fetch_result):
+    """Сетевая ошибка или 5xx — есть смысл повторить запрос"""
+    if not fetch_result.ok:
+        return isinstance(fetch_result.error, scraper.retry_on)
+    return fetch_result.response.status_code >= 500
+
+
+def fetch_static_pages(scrapers):
+    """
+    Загружает страницы пакетом; неудачные запросы повторяются пакетом же
+    с экспоненциальной задержкой, пока позволяет общий бюджет
+    """
+    budget = RetryBudget(max(scraper.retry_budget for scraper in scrapers))
+    results = {}
+    attempts = {}
+    pending = list(scrapers)
+
+    while True:
+        budget.attempts += 1
+        started = time.monotonic()
+        for scraper, fetch_result in zip(pending, fetch_all(s.get_fetch_request(conditional=True) for s in pending)):
+            results[scraper.name] = fetch_result
+            attempts[scraper.name] = budget.attempts
+
+        pending = [scraper for scraper in pending if is_retryable(scraper, results[scraper.name])]
+        if not pending or not budget.wait_for_retry(time.monotonic() - started):
+            break
+        logger.info(f"Повторяю запросы ({budget.attempts + 1}): {', '.join(s.name for s in pending)}")
+
+    return [(results[scraper.name], attempts[scraper.name]) for scraper in scrapers]
+
+
+def run_static_scrapers(scrapers):
+    """
+    Загружает все статические банки конкурентно через общий HTTP-клиент
+    условными запросами, затем разбирает курсы изменившихся страниц
+    """
+    if not scrapers:
+        return []
+
+    reports = []
+
+    for scraper, (fetch_result, attempts) in zip(scrapers, fetch_static_pages(scrapers)):
+        page_state = None
+        if fetch_result.ok and not fetch_result.not_modified:
+            page_state = scraper.build_page_state(fetch_result.response)
+
+        if fetch_result.ok and scraper.is_unchanged(fetch_result.response, page_state):
+            report = short_report(scraper, 'unchanged', duration=fetch_result.duration)
+            logger.info(f"{scraper.bank_name}: страница не изменилась, разбор пропущен")
+            report['attempts'] = attempts
+            reports.append(report)
+            continue
+
+        def get_rates():
+            if not fetch_result.ok:
+                raise fetch_result.error
+            return scraper.parse(fetch_result.response)
+
+        report = process_scraper(scraper, get_rates)
+        report['page_state'] = page_state
+        report['attempts'] = attempts
+        # Время загрузки страницы тоже относится к банку
+        report['duration'] = round(report['duration'] + fetch_result.duration, 2)
+        reports.append(report)
+
+    return reports
+
+
+def short_report(scraper, status, error=None, duration=0):
+    """Отчёт без разбора страницы: страница не изменилась или банк пропущен"""
+    return {
+        'bank': scraper.name,
+        'bank_name': scraper.bank_name,
+        'transport': scraper.transport,
+        'status': status,
+        'error': error,
+        'rates': [],
+        'saved': 0,
+        'missing': [],
+        'duration': round(duration, 2),
+    }
+
+
+def save_reports(reports):
+    """
+    Записывает курсы всех банков запуска одной транзакцией и проставляет saved в отчёты.
+    После успешной записи запоминает состояние страниц для условных запросов.
+    """
+    try:
+        saved = save_rates(
+            {report['bank_name']: report['rates'] for report in reports},
+            confirmed_banks=[report['bank_name'] for report in reports if report['status'] == 'unchanged'],
+        )
+    except Exception as e:
+        logger.error(f"Ошибка при сохранении курсов: {e}")
+        for report in reports:
+            if report['rates']:
+                report['status'] = 'error'
+                report['error'] = f"Ошибка записи в БД: {e}"
+        return
+
+    for report in reports:
+        report['saved'] = saved.get(report['bank_name'], 0)
+        # Неполные ответы не запоминаем, чтобы в следующий раз страница разобралась снова
+        if report.get('page_state') and report['status'] == 'ok':
+            cache.set(PAGE_STATE_KEY.format(report['bank']), report['page_state'], PAGE_STATE_TIMEOUT)
+
+
+def run_scrapers(scrapers=None):
+    """
+    Запускает парсеры из реестра: статические одним пакетом через http_fetcher,
+    браузерные — параллельно через пул браузеров. Потоки только собирают курсы,
+    в БД всё пишется в конце одной транзакцией. Возвращает сводку по запуску.
+    """
+    if scrapers is None:
+        scrapers = get_scrapers()
+
+    # Банки с разомкнутым предохранителем пропускаем сразу, не дожидаясь таймаутов
+    breakers = {scraper.name: CircuitBreaker(scraper.name) for scraper in scrapers}
+    skipped = []
+    allowed = []
+    for scraper in scrapers:
+        if breakers[scraper.name].allow():
+            allowed.append(scraper)
+        else:
+            retry_at = breakers[scraper.name].describe()['retry_at']
+            skipped.append(short_report(scraper, 'skipped', f"Сайт недоступен, следующая попытка после {retry_at}"))
+
+    static = [scraper for scraper in allowed if scraper.transport == STATIC]
+    browser = [scraper for scraper in allowed if scraper.transport == BROWSER]
+
+    started = time.monotonic()
+    max_workers = max(1, min(settings.CURRENCY_UPDATE_MAX_WORKERS, len(browser) + 1))
+
+    # Банки парсятся параллельно: время обновления ≈ время самого медленного банка
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='currency') as executor:
+        static_future = executor.submit(run_static_scrapers, static)
+        reports = list(executor.map(run_browser_scraper, browser))
+        reports = static_future.result() + reports
+
+    save_reports(reports)
+    for report in reports:
+        if report['status'] in FAILED_STATUSES:
+            breakers[report['bank']].record_failure()
+        else:
+            breakers[report['bank']].record_success()
+    reports = [finish_report(report) for report in reports + skipped]
+
+    summary = {
+        'duration': round(time.monotonic() - started, 2),
+        'total': len(reports),
+        'ok': sum(1 for r in reports if r['status'] == 'ok'),
+        'partial': sum(1 for r in reports if r['status'] == 'partial'),
+        'unchanged': sum(1 for r in reports if r['status'] == 'unchanged'),
+        'empty': sum(1 for r in reports if r['status'] == 'empty'),
+        'errors': sum(1 for r in reports if r['status'] == 'error'),
+        'skipped': sum(1 for r in reports if r['status'] == 'skipped'),
+        'banks': reports,
+    }
+
+    logger.info(
+        f"Обновление курсов завершено за {summary['duration']}с: "
+        f"ok={summary['ok']}, unchanged={summary['unchanged']}, partial={summary['partial']}, "
+        f"empty={summary['empty']}, errors={summary['errors']}, skipped={summary['skipped']}"
+    )
+    return summary
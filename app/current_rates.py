@@ -0,0 +1,105 @@
+import logging
+
+from .models import CurrencyExchangeRate, CurrentRate, CurrentMarketRate, MarketExchangeRate
+
+logger = logging.getLogger(__name__)
+
+
+def update_bank_rates(rows):
+    """
+    Переносит только что записанные строки истории курсов в CurrentRate
+    одним upsert: новая строка становится текущим курсом своей пары.
+    """
+    CurrentRate.objects.bulk_create(
+        [
+            CurrentRate(
+                bank_id=row.bank_id,
+                currency_id=row.currency_id,
+                buy=row.buy,
+                sell=row.sell,
+                rate_id=row.id,
+                updated_at=row.created_at,
+            )
+            for row in rows
+        ],
+        update_conflicts=True,
+        unique_fields=['bank', 'currency'],
+        update_fields=['buy', 'sell', 'rate_id', 'updated_at'],
+    )
+
+
+def refresh_bank_rate(bank_id, currency_id):
+    """Пересчитывает текущий курс банка по паре после правки или удаления строки истории через API"""
+    row = CurrencyExchangeRate.objects.filter(bank_id=bank_id, currency_id=currency_id).current().first()
+    if row is None:
+        CurrentRate.objects.filter(bank_id=bank_id, currency_id=currency_id).delete()
+        return
+    CurrentRate.objects.update_or_create(
+        bank_id=bank_id,
+        currency_id=currency_id,
+        defaults={'buy': row.buy, 'sell': row.sell, 'rate_id': row.id, 'updated_at': row.created_at},
+    )
+
+
+def refresh_market_rate(city_name, currency_id):
+    """Пересчитывает текущий рыночный курс пары после добавления, изменения или удаления курса"""
+    row = (
+        MarketExchangeRate.objects
+        .filter(is_active=True, city_name=city_name, currency_id=currency_id)
+        .order_by('-date', '-time', '-id')
+        .first()
+    )
+    if row is None:
+        CurrentMarketRate.objects.filter(city_name=city_name, currency_id=currency_id).delete()
+        return
+    CurrentMarketRate.objects.update_or_create(
+        city_name=city_name,
+        currency_id=currency_id,
+        defaults={'buy': row.buy, 'sell': row.sell, 'rate_id': row.id, 'updated_at': row.created_at},
+    )
+
+
+def _offer(source, name, row, field):
+    return {
+        'source': source,  # 'bank' или 'market'
+        'name': name,  # Банк или город
+        'rate': str(getattr(row, field)),
+        'updated_at': row.updated_at.isoformat(),
+    }
+
+
+def best_rates():
+    """
+    Лучшие курсы по каждой валюте среди банков и рынков городов: самая высокая
+    покупка и самая низкая продажа. Читает только текущие курсы — O(банков),
+    а не всю историю.
+    """
+    offers = [
+        ('bank', row.bank.name, row)
+        for row in CurrentRate.objects
+        .filter(bank__is_active=True, currency__is_active=True)
+        .select_related('bank', 'currency')
+    ]
+    offers += [
+        ('market', row.city_name, row)
+        for row in CurrentMarketRate.objects.filter(currency__is_active=True).select_related('currency')
+    ]
+
+    best = {}
+    for source, name, row in sorted(offers, key=lambda offer: offer[1]):
+        entry = best.setdefault(row.currency.code, {'offers': 0, 'buy': None, 'sell': None})
+        entry['offers'] += 1
+        if entry['buy'] is None or row.buy > entry['buy'][2].buy:
+            entry['buy'] = (source, name, row)
+        if entry['sell'] is None or row.sell < entry['sell'][2].sell:
+            entry['sell'] = (source, name, row)
+
+    return [
+        {
+            'currency': code,
+            'offers': best[code]['offers'],
+            'best_buy': _offer(*best[code]['buy'], 'buy'),
+            'best_sell': _offer(*best[code]['sell'], 'sell'),
+        }
+        for code in sorted(best)
+    ]
@@ -0,0 +1,60 @@
+from datetime import datetime, time, timedelta
+
+import django_filters
+from django.utils import timezone
+
+from .models import CurrencyExchangeRate, MarketExchangeRate, WorkerActivity
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class CurrencyExchangeRateFilter(django_filters.FilterSet):
+    """?bank=&bank_name=&currency=&currency_code=&date_from=&date_to="""
+    bank_name = django_filters.CharFilter(field_name='bank__name', lookup_expr='iexact')
+    currency_code = django_filters.CharFilter(field_name='currency__code', lookup_expr='iexact')
+    # Даты фильтруются диапазоном по created_at (date — его локальная дата), чтобы
+    # PostgreSQL читал только партиции нужных месяцев
+    date_from = django_filters.DateFilter(method='filter_date_from')
+    date_to = django_filters.DateFilter(method='filter_date_to')
+
+    class Meta:
+        model = CurrencyExchangeRate
+        fields = ['bank', 'currency', 'is_active']
+
+    def filter_date_from(self, queryset, name, value):
+        return queryset.filter(created_at__gte=start_of_day(value))
+
+    def filter_date_to(self, queryset, name, value):
+        return queryset.filter(created_at__lt=start_of_day(value + timedelta(days=1)))
+
+
+class MarketExchangeRateFilter(django_filters.FilterSet):
+    """?city=&currency=&currency_code=&date_from=&date_to=&is_active="""
+    city = django_filters.CharFilter(field_name='city_name', lookup_expr='iexact')
+    currency_code = django_filters.CharFilter(field_name='currency__code', lookup_expr='iexact')
+    date_from = django_filters.DateFilter(field_name='date', lookup_expr='gte')
+    date_to = django_filters.DateFilter(field_name='date', lookup_expr='lte')
+
+    class Meta:
+        model = MarketExchangeRate
+        fields = ['currency', 'is_active']
+
+
+class WorkerActivityFilter(django_filters.FilterSet):
+    """?worker_id=&action=&date_from=&date_to="""
+    worker_id = django_filters.NumberFilter(field_name='worker_id')
+    # Диапазоном по timestamp, как в CurrencyExchangeRateFilter, — по индексу activity_timestamp_idx
+    date_from = django_filters.DateFilter(method='filter_date_from')
+    date_to = django_filters.DateFilter(method='filter_date_to')
+
+    class Meta:
+        model = WorkerActivity
+        fields = ['action']
+
+    def filter_date_from(self, queryset, name, value):
+        return queryset.filter(timestamp__gte=start_of_day(value))
+
+    def filter_date_to(self, queryset, name, value):
+        return queryset.filter(timestamp__lt=start_of_day(value + timedelta(days=1)))
@@ -0,0 +1,122 @@
+import asyncio
+import importlib.util
+import logging
+import time
+from urllib.parse import urlsplit
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'ru-RU,ru;q=0.9,en;q=0.8',
+}
+
+# HTTP/2 включается, только если установлен пакет h2 (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+
+class FetchRequest:
+    """Описание одного HTTP-запроса к сайту банка"""
+
+    def __init__(self, name, url, headers=None, verify=True, timeout=None, encoding=None):
+        self.name = name
+        self.url = url
+        self.headers = headers or {}
+        self.verify = verify
+        self.timeout = timeout
+        self.encoding = encoding
+
+    @property
+    def host(self):
+        return urlsplit(self.url).hostname
+
+    def get_timeout(self):
+        """Таймаут запроса: явный, затем по хосту, затем общий"""
+        if self.timeout is not None:
+            return self.timeout
+        host_timeouts = settings.HTTP_FETCH_HOST_TIMEOUTS
+        return host_timeouts.get(self.host, settings.HTTP_FETCH_TIMEOUT)
+
+    def __repr__(self):
+        return f"FetchRequest({self.name!r}, {self.url!r})"
+
+
+class FetchResult:
+    """Ответ (или ошибка) для одного запроса и время его выполнения"""
+
+    def __init__(self, request, response=None, error=None, duration=0.0):
+        self.request = request
+        self.response = response
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def not_modified(self):
+        """Сервер ответил 304 на условный запрос — страница не изменилась"""
+        return self.ok and self.response.status_code == 304
+
+
+def _make_client(verify):
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_FETCH_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_FETCH_MAX_CONNECTIONS,
+        keepalive_expiry=30,
+    )
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        verify=verify,
+        headers=DEFAULT_HEADERS,
+        limits=limits,
+        follow_redirects=True,
+    )
+
+
+async def _fetch_one(clients, request):
+    client = clients[request.verify]
+    started = time.monotonic()
+    try:
+        response = await client.get(
+            request.url,
+            headers=request.headers,
+            timeout=request.get_timeout(),
+        )
+        if request.encoding:
+            response.encoding = request.encoding
+        return FetchResult(request, response=response, duration=time.monotonic() - started)
+    except httpx.HTTPError as e:
+        logger.error(f"Ошибка при запросе к {request.url}: {e!r}")
+        return FetchResult(request, error=e, duration=time.monotonic() - started)
+
+
+async def _fetch_many(requests):
+    # Один пул соединений на запуск; сайты с невалидным сертификатом идут через отдельный клиент
+    async with _make_client(True) as verified, _make_client(False) as unverified:
+        clients = {True: verified, False: unverified}
+        return await asyncio.gather(*(_fetch_one(clients, request) for request in requests))
+
+
+def fetch_all(requests):
+    """
+    Загружает все запросы конкурентно и возвращает список FetchResult в том же порядке
+    """
+    requests = list(requests)
+    if not requests:
+        return []
+    return asyncio.run(_fetch_many(requests))
+
+
+def fetch(request):
+    """
+    Загружает один запрос; при сетевой ошибке пробрасывает исключение
+    """
+    result = fetch_all([request])[0]
+    if result.error is not None:
+        raise result.error
+    return result.response
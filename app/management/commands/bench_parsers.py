@@ -0,0 +1,91 @@
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from app.page_fixtures import FIXTURES_DIR, fixture_path, load_page
+from app.parsing import SELECTOLAX_AVAILABLE, make_soup
+from app.rate_store import reference_cache, save_rates
+from app.scraper_registry import get_scrapers
+
+
+def best_ms(func, number):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1000
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет разбор сохранённых страниц банков (html.parser, lxml и parse() парсера) "
+        "и, с --save, запись всех курсов в БД"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('banks', nargs='*', help="Имена парсеров (по умолчанию все, для которых есть страницы)")
+        parser.add_argument('--number', type=int, default=20, help="Число повторов на замер")
+        parser.add_argument('--fixtures', default=str(FIXTURES_DIR), help="Каталог с сохранёнными страницами")
+        parser.add_argument('--save', action='store_true', help="Замерить запись курсов в БД (транзакция откатывается)")
+
+    def handle(self, *args, **options):
+        fixtures = Path(options['fixtures'])
+        number = options['number']
+        fast_path = 'selectolax' if SELECTOLAX_AVAILABLE else 'lxml.html'
+
+        self.stdout.write(f"Быстрый путь table_rows: {fast_path}")
+        self.stdout.write(f"{'банк':<14}{'html.parser':>13}{'lxml':>10}{'parse()':>10}{'ускорение':>12}")
+
+        rates_by_bank = {}
+        for scraper in get_scrapers(options['banks'] or None):
+            path = fixture_path(scraper.name, fixtures)
+            if not path:
+                continue
+
+            content = path.read_bytes()
+            page = load_page(scraper, content)
+            rates_by_bank[scraper.bank_name] = scraper.clean(scraper.parse(page))
+
+            parse = best_ms(lambda: scraper.parse(page), number)
+            if path.suffix != '.html':
+                self.stdout.write(f"{scraper.name:<14}{'—':>13}{'—':>10}{parse:>8.2f}мс{'—':>12}")
+                continue
+
+            # Было: каждый модуль строил BeautifulSoup на html.parser
+            html_parser = best_ms(lambda: BeautifulSoup(content, 'html.parser'), number)
+            lxml_soup = best_ms(lambda: make_soup(content), number)
+            self.stdout.write(
+                f"{scraper.name:<14}{html_parser:>11.2f}мс{lxml_soup:>8.2f}мс{parse:>8.2f}мс"
+                f"{html_parser / parse:>11.1f}x"
+            )
+
+        if options['save']:
+            self.bench_save(rates_by_bank)
+
+    def bench_save(self, rates_by_bank):
+        """Запись курсов всех банков одним запуском: время и число запросов к БД"""
+        total = sum(len(rates) for rates in rates_by_bank.values())
+        reference_cache.reset()
+
+        try:
+            # Оба запуска в одной транзакции, которая в конце откатывается
+            with transaction.atomic():
+                for label in ('первый запуск, холодный кэш', 'повтор, курсы не изменились'):
+                    with CaptureQueriesContext(connection) as queries:
+                        started = timeit.default_timer()
+                        save_rates(rates_by_bank)
+                        duration = (timeit.default_timer() - started) * 1000
+                    self.stdout.write(
+                        f"Запись {total} курсов ({label}): {duration:.1f}мс, "
+                        f"запросов к БД: {len(queries.captured_queries)}"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            # Банки и валюты, созданные в откаченной транзакции, не должны остаться в кэше
+            reference_cache.reset()
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.scraper_registry import BROWSER, get_scrapers
+
+
+class Command(BaseCommand):
+    help = (
+        "Рендерит страницы браузерных банков с записью сетевых запросов и запоминает "
+        "JSON/XHR-запрос с курсами, который дальше загружается без браузера"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('banks', nargs='*', help="Имена браузерных парсеров (по умолчанию все)")
+
+    def handle(self, *args, **options):
+        try:
+            scrapers = get_scrapers(options['banks'] or None, transport=BROWSER)
+        except KeyError as e:
+            raise CommandError(str(e))
+
+        for scraper in scrapers:
+            scraper.forget_endpoint()
+            try:
+                html, responses = scraper.capture()
+                endpoint = scraper.learn_endpoint(responses, scraper.parse(html))
+            except Exception as e:
+                self.stderr.write(f"[!] {scraper.name}: {e}")
+                continue
+
+            if endpoint:
+                currencies = ', '.join(sorted(endpoint['paths']))
+                self.stdout.write(self.style.SUCCESS(f"[✓] {scraper.name}: {endpoint['url']} ({currencies})"))
+            else:
+                self.stdout.write(f"[-] {scraper.name}: JSON-запроса с курсами нет ({len(responses)} ответов), остаётся браузер")
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.http_fetcher import fetch_all
+from app.page_fixtures import FIXTURES_DIR
+from app.scraper_registry import STATIC, BROWSER, get_scrapers
+
+
+class Command(BaseCommand):
+    help = (
+        "Сохраняет текущие страницы банков в app/fixtures/pages: ответ сайта для "
+        "статических банков и отрендеренный DOM для браузерных"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('banks', nargs='*', help="Имена парсеров (по умолчанию все)")
+        parser.add_argument('--output', default=str(FIXTURES_DIR), help="Каталог для сохранения")
+
+    def save(self, output, scraper, content, is_json=False):
+        # Старая копия с другим расширением только запутает load_fixture
+        for stale in output.glob(f'{scraper.name}.*'):
+            stale.unlink()
+        path = output / f"{scraper.name}.{'json' if is_json else 'html'}"
+        path.write_bytes(content)
+        self.stdout.write(self.style.SUCCESS(f"[✓] {scraper.name}: {path} ({len(content)} байт)"))
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+
+        try:
+            scrapers = get_scrapers(options['banks'] or None)
+        except KeyError as e:
+            raise CommandError(str(e))
+
+        static = [scraper for scraper in scrapers if scraper.transport == STATIC]
+        for scraper, result in zip(static, fetch_all(scraper.get_fetch_request() for scraper in static)):
+            if not result.ok:
+                self.stderr.write(f"[!] {scraper.name}: {result.error}")
+                continue
+            is_json = 'json' in result.response.headers.get('Content-Type', '')
+            self.save(output, scraper, result.response.content, is_json)
+
+        for scraper in (scraper for scraper in scrapers if scraper.transport == BROWSER):
+            try:
+                html = scraper.render()
+            except Exception as e:
+                self.stderr.write(f"[!] {scraper.name}: {e}")
+                continue
+            if not html:
+                self.stderr.write(f"[!] {scraper.name}: страница не отрендерилась")
+                continue
+            self.save(output, scraper, html.encode('utf-8'))
+
+        self.stdout.write("Не забудьте обновить expected.json под новые страницы.")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from app.snapshots import publish_snapshots
+
+
+class Command(BaseCommand):
+    help = (
+        "Публикует снимки публичных курсов (JSON, .gz, .br) для nginx. Дальше они "
+        "обновляются сами после запусков парсеров и правок рыночных курсов"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Каталог снимков (по умолчанию RATE_SNAPSHOT_DIR)")
+
+    def handle(self, *args, **options):
+        for name in publish_snapshots(options['output']):
+            self.stdout.write(self.style.SUCCESS(f"[✓] {name}"))
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app.partitions import ensure_partitions, expired_partitions, archive_partition, detach_partition, is_partitioned
+
+
+class Command(BaseCommand):
+    help = (
+        "Обслуживает месячные партиции истории курсов банков: создаёт партиции "
+        "на месяцы вперёд и отключает (архивирует, удаляет) вышедшие за срок хранения"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead', type=int, default=settings.RATE_PARTITIONS_AHEAD,
+            help="На сколько месяцев вперёд создавать партиции",
+        )
+        parser.add_argument(
+            '--retention-months', type=int, default=settings.RATE_HISTORY_RETENTION_MONTHS,
+            help="Сколько месяцев истории хранить (0 — хранить всё)",
+        )
+        parser.add_argument('--archive-dir', help="Выгрузить отключаемые партиции в gzip-CSV в этот каталог")
+        parser.add_argument('--drop', action='store_true', help="Удалять отключённые партиции, а не оставлять таблицами")
+        parser.add_argument('--dry-run', action='store_true', help="Только показать, что будет сделано")
+
+    def handle(self, *args, **options):
+        if not is_partitioned():
+            raise CommandError("История курсов не разбита на партиции (нужен PostgreSQL и миграция 0006)")
+
+        today = timezone.now().date()
+        if options['dry_run']:
+            self.stdout.write(f"Партиции создаются на {options['ahead']} мес. вперёд")
+        else:
+            for name in ensure_partitions(today, options['ahead']):
+                self.stdout.write(self.style.SUCCESS(f"[✓] Создана {name}"))
+
+        if options['retention_months'] <= 0:
+            return
+
+        archive_dir = Path(options['archive_dir']) if options['archive_dir'] else None
+        if archive_dir and not options['dry_run']:
+            archive_dir.mkdir(parents=True, exist_ok=True)
+
+        for month, name in expired_partitions(today, options['retention_months']).items():
+            if options['dry_run']:
+                self.stdout.write(f"[-] {name}: будет {'удалена' if options['drop'] else 'отключена'}")
+                continue
+            if archive_dir:
+                path = archive_dir / f'{name}.csv.gz'
+                archive_partition(name, path)
+                self.stdout.write(f"[✓] {name}: выгружена в {path}")
+            detach_partition(name, drop=options['drop'])
+            self.stdout.write(self.style.SUCCESS(f"[✓] {name}: {'удалена' if options['drop'] else 'отключена'}"))
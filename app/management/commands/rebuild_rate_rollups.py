@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.models import BankRateRollup, CurrencyExchangeRate, MarketExchangeRate, MarketRateRollup
+from app.rollups import BANK_KEY, MARKET_KEY, roll_rates
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересобирает свёртки OHLC для графиков истории из всех накопленных курсов "
+        "банков и рынков городов. Дальше они обновляются при записи каждого курса"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="Сколько строк курсов сворачивать за раз")
+
+    def rebuild(self, model, key_fields, rows, batch_size):
+        model.objects.all().delete()
+        batch, total = [], 0
+        # По времени: close каждого периода — последний курс, а партии не пересекаются
+        for row in rows.order_by('created_at', 'id').iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) == batch_size:
+                roll_rates(model, key_fields, batch)
+                total += len(batch)
+                batch = []
+        roll_rates(model, key_fields, batch)
+        total += len(batch)
+        self.stdout.write(self.style.SUCCESS(
+            f"[✓] {model._meta.verbose_name_plural}: {total} курсов, {model.objects.count()} периодов"
+        ))
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        with transaction.atomic():
+            self.rebuild(BankRateRollup, BANK_KEY, CurrencyExchangeRate.objects.all(), batch_size)
+            self.rebuild(MarketRateRollup, MARKET_KEY, MarketExchangeRate.objects.filter(is_active=True), batch_size)
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_current_rates(apps, schema_editor):
+    """Заполняет текущие курсы из уже накопленной истории"""
+    CurrencyExchangeRate = apps.get_model('app', 'CurrencyExchangeRate')
+    MarketExchangeRate = apps.get_model('app', 'MarketExchangeRate')
+    CurrentRate = apps.get_model('app', 'CurrentRate')
+    CurrentMarketRate = apps.get_model('app', 'CurrentMarketRate')
+
+    last_ids = (
+        CurrencyExchangeRate.objects
+        .values('bank_id', 'currency_id')
+        .annotate(last_id=models.Max('id'))
+        .values('last_id')
+    )
+    CurrentRate.objects.bulk_create([
+        CurrentRate(
+            bank_id=row.bank_id, currency_id=row.currency_id, buy=row.buy, sell=row.sell,
+            rate_id=row.id, updated_at=row.created_at,
+        )
+        for row in CurrencyExchangeRate.objects.filter(id__in=models.Subquery(last_ids))
+    ])
+
+    current = {}
+    for row in MarketExchangeRate.objects.filter(is_active=True).order_by('-date', '-time', '-id'):
+        current.setdefault((row.city_name, row.currency_id), row)
+    CurrentMarketRate.objects.bulk_create([
+        CurrentMarketRate(
+            city_name=row.city_name, currency_id=row.currency_id, buy=row.buy, sell=row.sell,
+            rate_id=row.id, updated_at=row.created_at,
+        )
+        for row in current.values()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_currencyexchangerate_last_confirmed_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurrentMarketRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city_name', models.CharField(max_length=100)),
+                ('buy', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('sell', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('rate_id', models.BigIntegerField()),
+                ('updated_at', models.DateTimeField()),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.currency')),
+            ],
+            options={
+                'verbose_name': 'Текущий рыночный курс',
+                'verbose_name_plural': 'Текущие рыночные курсы',
+                'constraints': [models.UniqueConstraint(fields=('city_name', 'currency'), name='unique_current_market_rate')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CurrentRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('buy', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('sell', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('rate_id', models.BigIntegerField()),
+                ('updated_at', models.DateTimeField()),
+                ('bank', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='current_rates', to='app.bank')),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.currency')),
+            ],
+            options={
+                'verbose_name': 'Текущий курс банка',
+                'verbose_name_plural': 'Текущие курсы банков',
+                'constraints': [models.UniqueConstraint(fields=('bank', 'currency'), name='unique_current_bank_rate')],
+            },
+        ),
+        migrations.RunPython(fill_current_rates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_current_rates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='currencyexchangerate',
+            index=models.Index(fields=['bank', 'currency', '-created_at'], name='rate_bank_currency_latest_idx'),
+        ),
+    ]
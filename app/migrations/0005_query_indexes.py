@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_rate_latest_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='currencyexchangerate',
+            index=models.Index(fields=['-created_at', '-id'], name='rate_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='currencyexchangerate',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['date'], name='rate_active_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketexchangerate',
+            index=models.Index(fields=['city_name', '-created_at', '-id'], name='market_city_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketexchangerate',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='market_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketexchangerate',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['city_name', 'currency', '-date', '-time', '-id'], name='market_active_pair_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketexchangerate',
+            index=models.Index(fields=['added_by', 'date'], name='market_added_by_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workeractivity',
+            index=models.Index(fields=['-timestamp', '-id'], name='activity_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workeractivity',
+            index=models.Index(fields=['worker', '-timestamp'], name='activity_worker_idx'),
+        ),
+    ]
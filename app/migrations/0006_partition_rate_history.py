@@ -0,0 +1,169 @@
+from django.db import migrations
+
+# История курсов банков становится таблицей, разбитой по месяцам created_at
+# (PARTITION BY RANGE). Первичный ключ партиционированной таблицы обязан
+# включать ключ разбиения, поэтому он становится (id, created_at); уникальность
+# id по-прежнему обеспечивает последовательность. Индексы и внешние ключи
+# старой таблицы пересоздаются на новой и распространяются на все партиции.
+# Дальнейшие партиции создаёт команда rate_partitions (app/partitions.py).
+
+PARTITION_SQL = """
+DO $$
+DECLARE
+    index_defs text[];
+    fk_defs text[];
+    statement text;
+    month date;
+    last_month date;
+BEGIN
+    SELECT coalesce(array_agg(pg_get_indexdef(indexrelid)), '{}') INTO index_defs
+    FROM pg_index
+    WHERE indrelid = 'app_currencyexchangerate'::regclass AND NOT indisprimary;
+
+    SELECT coalesce(array_agg(format(
+        'ALTER TABLE app_currencyexchangerate ADD CONSTRAINT %I %s', conname, pg_get_constraintdef(oid)
+    )), '{}') INTO fk_defs
+    FROM pg_constraint
+    WHERE conrelid = 'app_currencyexchangerate'::regclass AND contype = 'f';
+
+    ALTER TABLE app_currencyexchangerate RENAME TO app_currencyexchangerate_old;
+    -- Имя первичного ключа освобождаем для новой таблицы
+    EXECUTE format(
+        'ALTER TABLE app_currencyexchangerate_old RENAME CONSTRAINT %I TO app_currencyexchangerate_old_pkey',
+        (SELECT conname FROM pg_constraint WHERE conrelid = 'app_currencyexchangerate_old'::regclass AND contype = 'p')
+    );
+
+    CREATE TABLE app_currencyexchangerate (
+        id bigint NOT NULL,
+        buy numeric(10, 4) NOT NULL,
+        sell numeric(10, 4) NOT NULL,
+        date date NOT NULL,
+        time time NOT NULL,
+        is_active boolean NOT NULL,
+        created_at timestamp with time zone NOT NULL,
+        bank_id bigint NOT NULL,
+        currency_id bigint NOT NULL,
+        last_confirmed_at timestamp with time zone NULL,
+        CONSTRAINT app_currencyexchangerate_pkey PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at);
+
+    CREATE TABLE app_currencyexchangerate_default PARTITION OF app_currencyexchangerate DEFAULT;
+
+    -- Месячные партиции от первой записи до трёх месяцев вперёд (границы по UTC)
+    SELECT date_trunc('month', coalesce(min(created_at), now()) AT TIME ZONE 'UTC')::date INTO month
+    FROM app_currencyexchangerate_old;
+    last_month := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF app_currencyexchangerate FOR VALUES FROM (%L) TO (%L)',
+            'app_currencyexchangerate_p' || to_char(month, 'YYYY_MM'),
+            month::text || ' 00:00:00+00',
+            (month + interval '1 month')::date::text || ' 00:00:00+00'
+        );
+        month := (month + interval '1 month')::date;
+    END LOOP;
+
+    INSERT INTO app_currencyexchangerate
+        (id, buy, sell, date, time, is_active, created_at, bank_id, currency_id, last_confirmed_at)
+    SELECT id, buy, sell, date, time, is_active, created_at, bank_id, currency_id, last_confirmed_at
+    FROM app_currencyexchangerate_old;
+
+    DROP TABLE app_currencyexchangerate_old;
+
+    CREATE SEQUENCE app_currencyexchangerate_id_seq OWNED BY app_currencyexchangerate.id;
+    PERFORM setval(
+        'app_currencyexchangerate_id_seq',
+        coalesce((SELECT max(id) FROM app_currencyexchangerate), 0) + 1,
+        false
+    );
+    ALTER TABLE app_currencyexchangerate ALTER COLUMN id SET DEFAULT nextval('app_currencyexchangerate_id_seq');
+
+    FOREACH statement IN ARRAY index_defs LOOP
+        EXECUTE statement;
+    END LOOP;
+    FOREACH statement IN ARRAY fk_defs LOOP
+        EXECUTE statement;
+    END LOOP;
+END $$;
+"""
+
+UNPARTITION_SQL = """
+DO $$
+DECLARE
+    index_defs text[];
+    fk_defs text[];
+    statement text;
+BEGIN
+    SELECT coalesce(array_agg(pg_get_indexdef(indexrelid)), '{}') INTO index_defs
+    FROM pg_index
+    WHERE indrelid = 'app_currencyexchangerate'::regclass AND NOT indisprimary;
+
+    SELECT coalesce(array_agg(format(
+        'ALTER TABLE app_currencyexchangerate ADD CONSTRAINT %I %s', conname, pg_get_constraintdef(oid)
+    )), '{}') INTO fk_defs
+    FROM pg_constraint
+    WHERE conrelid = 'app_currencyexchangerate'::regclass AND contype = 'f' AND conparentid = 0;
+
+    ALTER TABLE app_currencyexchangerate RENAME TO app_currencyexchangerate_partitioned;
+    EXECUTE format(
+        'ALTER TABLE app_currencyexchangerate_partitioned RENAME CONSTRAINT %I TO app_currencyexchangerate_partitioned_pkey',
+        (SELECT conname FROM pg_constraint WHERE conrelid = 'app_currencyexchangerate_partitioned'::regclass AND contype = 'p')
+    );
+    ALTER TABLE app_currencyexchangerate_partitioned ALTER COLUMN id DROP DEFAULT;
+    DROP SEQUENCE app_currencyexchangerate_id_seq;
+
+    CREATE TABLE app_currencyexchangerate (
+        id bigint NOT NULL GENERATED BY DEFAULT AS IDENTITY,
+        buy numeric(10, 4) NOT NULL,
+        sell numeric(10, 4) NOT NULL,
+        date date NOT NULL,
+        time time NOT NULL,
+        is_active boolean NOT NULL,
+        created_at timestamp with time zone NOT NULL,
+        bank_id bigint NOT NULL,
+        currency_id bigint NOT NULL,
+        last_confirmed_at timestamp with time zone NULL,
+        CONSTRAINT app_currencyexchangerate_pkey PRIMARY KEY (id)
+    );
+
+    INSERT INTO app_currencyexchangerate
+        (id, buy, sell, date, time, is_active, created_at, bank_id, currency_id, last_confirmed_at)
+    SELECT id, buy, sell, date, time, is_active, created_at, bank_id, currency_id, last_confirmed_at
+    FROM app_currencyexchangerate_partitioned;
+
+    DROP TABLE app_currencyexchangerate_partitioned;
+
+    PERFORM setval(
+        pg_get_serial_sequence('app_currencyexchangerate', 'id'),
+        coalesce((SELECT max(id) FROM app_currencyexchangerate), 0) + 1,
+        false
+    );
+
+    FOREACH statement IN ARRAY index_defs LOOP
+        EXECUTE statement;
+    END LOOP;
+    FOREACH statement IN ARRAY fk_defs LOOP
+        EXECUTE statement;
+    END LOOP;
+END $$;
+"""
+
+
+def run_on_postgresql(sql):
+    def operation(apps, schema_editor):
+        # Разбиение на партиции есть только в PostgreSQL; на других БД таблица остаётся обычной
+        if schema_editor.connection.vendor == 'postgresql':
+            # Без параметров: иначе %I и %L в format() приняли бы за плейсхолдеры драйвера
+            schema_editor.execute(sql, params=None)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_postgresql(PARTITION_SQL), run_on_postgresql(UNPARTITION_SQL)),
+    ]
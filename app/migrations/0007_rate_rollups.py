@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_partition_rate_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankRateRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Час'), ('day', 'День'), ('week', 'Неделя')], max_length=4)),
+                ('period_start', models.DateTimeField()),
+                ('buy_open', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('buy_high', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('buy_low', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('buy_close', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('sell_open', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('sell_high', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('sell_low', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('sell_close', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('samples', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField()),
+                ('bank', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='app.bank')),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.currency')),
+            ],
+            options={
+                'verbose_name': 'Свёртка курсов банка',
+                'verbose_name_plural': 'Свёртки курсов банков',
+                'constraints': [models.UniqueConstraint(fields=('bank', 'currency', 'granularity', 'period_start'), name='unique_bank_rate_rollup')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MarketRateRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Час'), ('day', 'День'), ('week', 'Неделя')], max_length=4)),
+                ('period_start', models.DateTimeField()),
+                ('buy_open', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('buy_high', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('buy_low', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('buy_close', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('sell_open', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('sell_high', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('sell_low', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('sell_close', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('samples', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField()),
+                ('city_name', models.CharField(max_length=100)),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app.currency')),
+            ],
+            options={
+                'verbose_name': 'Свёртка рыночных курсов',
+                'verbose_name_plural': 'Свёртки рыночных курсов',
+                'constraints': [models.UniqueConstraint(fields=('city_name', 'currency', 'granularity', 'period_start'), name='unique_market_rate_rollup')],
+            },
+        ),
+    ]
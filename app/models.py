@@ -1,7 +1,7 @@
 # app/models.py
 
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import connections, models
 from decimal import Decimal
 
 
@@ -86,6 +86,26 @@ class Bank(models.Model):
         verbose_name_plural = "Банки"
 
 
+class CurrencyExchangeRateQuerySet(models.QuerySet):
+    def current(self):
+        """Текущие (последние записанные) строки курсов по каждой паре банк/валюта"""
+        last_ids = (
+            self.values('bank_id', 'currency_id')
+            .annotate(last_id=models.Max('id'))
+            .values('last_id')
+        )
+        return self.filter(id__in=models.Subquery(last_ids))
+
+    def latest_per_bank(self):
+        """
+        Самая свежая строка каждой пары банк/валюта для чтения. На PostgreSQL —
+        DISTINCT ON по индексу (bank, currency, -created_at), иначе через current()
+        """
+        if connections[self.db].vendor == 'postgresql':
+            return self.order_by('bank_id', 'currency_id', '-created_at').distinct('bank_id', 'currency_id')
+        return self.current()
+
+
 class CurrencyExchangeRate(models.Model):
     """Модель курса валют банков"""
     bank = models.ForeignKey(Bank, on_delete=models.CASCADE, related_name='rates')
@@ -96,6 +116,10 @@ class CurrencyExchangeRate(models.Model):
     time = models.TimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)  # Добавляем поле is_active
     created_at = models.DateTimeField(auto_now_add=True)  # Добавляем для сортировки
+    # Когда парсер последний раз видел этот же курс (новая строка пишется только при изменении)
+    last_confirmed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = CurrencyExchangeRateQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.bank.name} - {self.currency.code}: {self.buy}/{self.sell}"
@@ -104,6 +128,25 @@ class CurrencyExchangeRate(models.Model):
         verbose_name = "Курс банка"
         verbose_name_plural = "Курсы банков"
         ordering = ['-date', '-time']
+        indexes = [
+            # Последний курс каждой пары банк/валюта (?latest=1, DISTINCT ON)
+            models.Index(fields=['bank', 'currency', '-created_at'], name='rate_bank_currency_latest_idx'),
+            # Страницы истории (курсор по created_at)
+            models.Index(fields=['-created_at', '-id'], name='rate_created_idx'),
+            # Статистика: активные курсы за день
+            models.Index(fields=['date'], name='rate_active_date_idx', condition=models.Q(is_active=True)),
+        ]
+
+
+class MarketExchangeRateQuerySet(models.QuerySet):
+    def current(self):
+        """Последний курс по каждой паре город/валюта"""
+        newest = (
+            self.filter(city_name=models.OuterRef('city_name'), currency_id=models.OuterRef('currency_id'))
+            .order_by('-date', '-time', '-id')
+            .values('id')[:1]
+        )
+        return self.filter(id=models.Subquery(newest))
 
 
 class MarketExchangeRate(models.Model):
@@ -130,6 +173,8 @@ class MarketExchangeRate(models.Model):
     # Дополнительная информация
     notes = models.TextField(blank=True, help_text="Дополнительные заметки")
 
+    objects = MarketExchangeRateQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.city_name} - {self.currency.code}: {self.buy}/{self.sell} ({self.date})"
 
@@ -154,11 +199,129 @@ class MarketExchangeRate(models.Model):
         verbose_name = "Рыночный курс"
         verbose_name_plural = "Рыночные курсы"
         ordering = ['-date', '-time']
+        indexes = [
+            # Курсы города у работника, постранично по created_at
+            models.Index(fields=['city_name', '-created_at', '-id'], name='market_city_created_idx'),
+            # Публичный список активных курсов, постранично по created_at
+            models.Index(fields=['-created_at', '-id'], name='market_active_created_idx', condition=models.Q(is_active=True)),
+            # Последний активный курс пары город/валюта (current(), CurrentMarketRate)
+            models.Index(
+                fields=['city_name', 'currency', '-date', '-time', '-id'],
+                name='market_active_pair_idx',
+                condition=models.Q(is_active=True),
+            ),
+            # Сколько курсов работник добавил за день
+            models.Index(fields=['added_by', 'date'], name='market_added_by_date_idx'),
+        ]
 
         # Убираем unique_together, так как оно может вызывать проблемы
         # unique_together = ['currency', 'city_name', 'date', 'is_active']
 
 
+class CurrentRate(models.Model):
+    """Текущий курс банка по валюте: одна строка на пару, обновляется при каждой новой записи курса"""
+    bank = models.ForeignKey(Bank, on_delete=models.CASCADE, related_name='current_rates')
+    currency = models.ForeignKey(Currency, on_delete=models.CASCADE)
+    buy = models.DecimalField(max_digits=10, decimal_places=4)
+    sell = models.DecimalField(max_digits=10, decimal_places=4)
+    # id строки в истории курсов; без внешнего ключа, чтобы историю можно было хранить отдельно
+    rate_id = models.BigIntegerField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.bank.name} - {self.currency.code}: {self.buy}/{self.sell}"
+
+    class Meta:
+        verbose_name = "Текущий курс банка"
+        verbose_name_plural = "Текущие курсы банков"
+        constraints = [
+            models.UniqueConstraint(fields=['bank', 'currency'], name='unique_current_bank_rate'),
+        ]
+
+
+class CurrentMarketRate(models.Model):
+    """Текущий рыночный курс города по валюте: последний активный курс пары"""
+    city_name = models.CharField(max_length=100)
+    currency = models.ForeignKey(Currency, on_delete=models.CASCADE)
+    buy = models.DecimalField(max_digits=10, decimal_places=4)
+    sell = models.DecimalField(max_digits=10, decimal_places=4)
+    rate_id = models.BigIntegerField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.city_name} - {self.currency.code}: {self.buy}/{self.sell}"
+
+    class Meta:
+        verbose_name = "Текущий рыночный курс"
+        verbose_name_plural = "Текущие рыночные курсы"
+        constraints = [
+            models.UniqueConstraint(fields=['city_name', 'currency'], name='unique_current_market_rate'),
+        ]
+
+
+ROLLUP_GRANULARITIES = [
+    ('hour', 'Час'),
+    ('day', 'День'),
+    ('week', 'Неделя'),
+]
+
+
+class RateRollup(models.Model):
+    """OHLC покупки и продажи за период; period_start — начало часа, дня или недели по местному времени"""
+    granularity = models.CharField(max_length=4, choices=ROLLUP_GRANULARITIES)
+    period_start = models.DateTimeField()
+    buy_open = models.DecimalField(max_digits=10, decimal_places=4)
+    buy_high = models.DecimalField(max_digits=10, decimal_places=4)
+    buy_low = models.DecimalField(max_digits=10, decimal_places=4)
+    buy_close = models.DecimalField(max_digits=10, decimal_places=4)
+    sell_open = models.DecimalField(max_digits=10, decimal_places=4)
+    sell_high = models.DecimalField(max_digits=10, decimal_places=4)
+    sell_low = models.DecimalField(max_digits=10, decimal_places=4)
+    sell_close = models.DecimalField(max_digits=10, decimal_places=4)
+    samples = models.PositiveIntegerField(default=0)  # Сколько курсов вошло в период
+    updated_at = models.DateTimeField()  # Время курса, давшего close
+
+    class Meta:
+        abstract = True
+
+
+class BankRateRollup(RateRollup):
+    """Свёртка истории курсов банка по валюте для графиков"""
+    bank = models.ForeignKey(Bank, on_delete=models.CASCADE, related_name='rollups')
+    currency = models.ForeignKey(Currency, on_delete=models.CASCADE)
+
+    def __str__(self):
+        return f"{self.bank.name} - {self.currency.code} ({self.granularity} {self.period_start})"
+
+    class Meta:
+        verbose_name = "Свёртка курсов банка"
+        verbose_name_plural = "Свёртки курсов банков"
+        constraints = [
+            # Он же индекс для выборки графика: пара, шаг и диапазон period_start
+            models.UniqueConstraint(
+                fields=['bank', 'currency', 'granularity', 'period_start'], name='unique_bank_rate_rollup',
+            ),
+        ]
+
+
+class MarketRateRollup(RateRollup):
+    """Свёртка активных рыночных курсов города по валюте для графиков"""
+    city_name = models.CharField(max_length=100)
+    currency = models.ForeignKey(Currency, on_delete=models.CASCADE)
+
+    def __str__(self):
+        return f"{self.city_name} - {self.currency.code} ({self.granularity} {self.period_start})"
+
+    class Meta:
+        verbose_name = "Свёртка рыночных курсов"
+        verbose_name_plural = "Свёртки рыночных курсов"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['city_name', 'currency', 'granularity', 'period_start'], name='unique_market_rate_rollup',
+            ),
+        ]
+
+
 class WorkerActivity(models.Model):
     """Модель для отслеживания активности работников"""
     worker = models.ForeignKey(
@@ -185,4 +348,10 @@ class WorkerActivity(models.Model):
     class Meta:
         verbose_name = "Активность работника"
         verbose_name_plural = "Активность работников"
-        ordering = ['-timestamp']
\ No newline at end of file
+        ordering = ['-timestamp']
+        indexes = [
+            # Журнал постранично и активность за день (диапазон по timestamp)
+            models.Index(fields=['-timestamp', '-id'], name='activity_timestamp_idx'),
+            # Последнее действие работника
+            models.Index(fields=['worker', '-timestamp'], name='activity_worker_idx'),
+        ]
\ No newline at end of file
@@ -5,17 +5,18 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.utils import timezone
 from django.http import HttpResponse, JsonResponse
 from django.contrib.auth import authenticate
+from django.utils.decorators import method_decorator
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery
 import csv
 import logging
-import json
-import os
+from datetime import datetime, time, timedelta
 
 from .models import (
     CustomUser, Currency, Bank,
-    MarketExchangeRate, CurrencyExchangeRate, WorkerActivity
+    MarketExchangeRate, CurrencyExchangeRate, WorkerActivity, BankRateRollup, MarketRateRollup
 )
 from .serializers import (
     UserSerializer, CurrencySerializer, BankSerializer,
@@ -24,37 +25,34 @@ from .serializers import (
     RegisterSerializer, WorkerMarketRateSerializer
 )
 from .permissions import IsAdmin, IsCityWorker, CanManageOwnCityRates
+from .scraper_registry import get_scrapers
+from .currency_fetcher import get_last_report
+from .scheduler import get_schedule
+from .circuit_breaker import CircuitBreaker
+from .rate_cache import (
+    BANK, CITY, bump_versions, get_bank_rates, get_city_rates, store_bank_rates, store_city_rate, forget_bank_rate,
+    forget_city_rate,
+)
+from .conditional import rates_condition
+from .snapshots import publish_snapshots
+from .current_rates import best_rates, refresh_bank_rate, refresh_market_rate, update_bank_rates
+from .rollups import (
+    GRANULARITIES, add_bank_rates, add_market_rate, history, period_start, rebuild_bank_rollups,
+    rebuild_market_rollups,
+)
+from .statistics import get_statistics, invalidate_statistics
+from .cities import city_directory
+from .filters import CurrencyExchangeRateFilter, MarketExchangeRateFilter, WorkerActivityFilter
+from .pagination import CreatedAtCursorPagination, TimestampCursorPagination
 
 logger = logging.getLogger(__name__)
 
 
-# Загрузка городов из JSON
-def load_cities_from_json():
-    """Загружает список городов из JSON файла"""
-    try:
-        # Исправленный путь к файлу
-        json_path = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'public', 'cities.json')
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('cities', [])
-    except FileNotFoundError:
-        logger.warning("cities.json not found, using default cities")
-        return [
-            {'id': 1, 'name': 'Душанбе', 'region': 'Душанбе'},
-            {'id': 2, 'name': 'Худжанд', 'region': 'Согдийская область'},
-            {'id': 3, 'name': 'Истаравшан', 'region': 'Согдийская область'}
-        ]
-    except Exception as e:
-        logger.error(f"Error loading cities: {e}")
-        return []
-
-
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_cities(request):
     """API для получения списка городов"""
-    cities = load_cities_from_json()
-    return Response({'cities': cities})
+    return Response({'cities': city_directory.all()})
 
 
 @api_view(['GET'])
@@ -62,65 +60,7 @@ def get_cities(request):
 def get_admin_statistics(request):
     """Получение статистики для админ панели"""
     try:
-        today = timezone.now().date()
-
-        # Статистика пользователей
-        total_users = CustomUser.objects.count()
-        admin_users = CustomUser.objects.filter(
-            Q(role='admin') | Q(is_superuser=True) | Q(is_staff=True)
-        ).count()
-        worker_users = CustomUser.objects.filter(role='city_worker').count()
-        regular_users = total_users - admin_users - worker_users
-
-        # Статистика городов
-        cities = load_cities_from_json()
-        total_cities = len(cities)
-        cities_with_workers = CustomUser.objects.filter(
-            role='city_worker'
-        ).values('city_name').distinct().count()
-
-        # Статистика курсов
-        today_market_rates = MarketExchangeRate.objects.filter(
-            date=today,
-            is_active=True
-        ).count()
-
-        today_bank_rates = CurrencyExchangeRate.objects.filter(
-            date=today,
-            is_active=True
-        ).count()
-
-        # Статистика активности
-        today_activities = WorkerActivity.objects.filter(
-            created_at__date=today
-        ).count()
-
-        # Формируем ответ
-        statistics = {
-            'users': {
-                'total': total_users,
-                'admins': admin_users,
-                'workers': worker_users,
-                'regular': regular_users
-            },
-            'cities': {
-                'total': total_cities,
-                'active': total_cities,
-                'with_workers': cities_with_workers
-            },
-            'rates': {
-                'today_market': today_market_rates,
-                'today_bank': today_bank_rates,
-                'total_today': today_market_rates + today_bank_rates
-            },
-            'activity': {
-                'today_activities': today_activities
-            },
-            'date': today.isoformat(),
-            'timestamp': timezone.now().isoformat()
-        }
-
-        return Response(statistics, status=status.HTTP_200_OK)
+        return Response(get_statistics(), status=status.HTTP_200_OK)
 
     except Exception as e:
         logger.error(f"Error getting admin statistics: {str(e)}", exc_info=True)
@@ -142,6 +82,37 @@ def health_check(request):
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def scrapers_health(request):
+    """Состояние парсеров банков: метаданные из реестра и итог последнего запуска"""
+    now = timezone.now()
+    scrapers = []
+
+    for scraper in get_scrapers():
+        report = get_last_report(scraper.name)
+        status_value = report['status'] if report else 'unknown'
+
+        # Парсер не отчитывался дольше двух максимальных интервалов обновления
+        if report and now - datetime.fromisoformat(report['finished_at']) > 2 * scraper.max_refresh_interval:
+            status_value = 'stale'
+
+        scrapers.append({
+            **scraper.get_metadata(),
+            'status': status_value,
+            'schedule': get_schedule(scraper),
+            'circuit': CircuitBreaker(scraper.name).describe(),
+            'last_run': report,
+        })
+
+    return Response({
+        'timestamp': now.isoformat(),
+        'total': len(scrapers),
+        'healthy': sum(1 for s in scrapers if s['status'] in ('ok', 'unchanged')),
+        'scrapers': scrapers,
+    })
+
+
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -226,6 +197,7 @@ def register(request):
             # Устанавливаем роль по умолчанию
             user.role = 'user'
             user.save()
+            invalidate_statistics()
 
             # Создаем токены
             refresh = RefreshToken.for_user(user)
@@ -260,18 +232,114 @@ def get_current_user(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@rates_condition(BANK)
+def latest_bank_rates(request):
+    """Текущий курс каждого банка по каждой валюте — из кэша, без обращения к БД"""
+    return Response(get_bank_rates())
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@rates_condition(CITY)
+def latest_market_rates(request):
+    """Текущий рыночный курс каждого города по каждой валюте — из кэша"""
+    return Response(get_city_rates())
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@rates_condition(BANK, CITY)
+def best_rates_view(request):
+    """Где сейчас выгоднее всего купить и продать каждую валюту"""
+    return Response({'timestamp': timezone.now().isoformat(), 'currencies': best_rates()})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@rates_condition(BANK, CITY)
+def rate_history(request):
+    """
+    График курса банка (?bank=) или рынка города (?city=) по валюте (?currency=)
+    за ?date_from=&date_to= (по умолчанию 30 дней). Точки — OHLC из свёрток;
+    шаг выбирается по длине диапазона или задаётся ?granularity=hour|day|week.
+    """
+    params = request.query_params
+    bank, city, currency = params.get('bank'), params.get('city'), params.get('currency')
+    if not currency or bool(bank) == bool(city):
+        return Response({'error': 'Нужны currency и один из параметров bank или city'}, status=status.HTTP_400_BAD_REQUEST)
+
+    granularity = params.get('granularity')
+    if granularity and granularity not in GRANULARITIES:
+        return Response({'error': f"granularity: {', '.join(GRANULARITIES)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        date_to = datetime.strptime(params['date_to'], '%Y-%m-%d').date() if 'date_to' in params else timezone.localdate()
+        date_from = (
+            datetime.strptime(params['date_from'], '%Y-%m-%d').date() if 'date_from' in params
+            else date_to - timedelta(days=30)
+        )
+    except ValueError:
+        return Response({'error': 'Даты в формате YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+    if date_from > date_to:
+        return Response({'error': 'date_from позже date_to'}, status=status.HTTP_400_BAD_REQUEST)
+
+    start = timezone.make_aware(datetime.combine(date_from, time.min))
+    end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+    if bank:
+        source = {'bank': bank}
+        rollups = BankRateRollup.objects.filter(bank__name__iexact=bank, currency__code__iexact=currency)
+    else:
+        source = {'city': city}
+        rollups = MarketRateRollup.objects.filter(city_name__iexact=city, currency__code__iexact=currency)
+
+    return Response({
+        **source,
+        'currency': currency.upper(),
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
+        **history(rollups, start, end, granularity),
+    })
+
+
+class BumpsRatesVersionMixin:
+    """
+    Успешный запрос на запись меняет версию курсов rates_version_scopes (ETag
+    публичных ответов) и перепубликует снимки для nginx
+    """
+    rates_version_scopes = ()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in permissions.SAFE_METHODS and response.status_code < 400:
+            transaction.on_commit(lambda: bump_versions(*self.rates_version_scopes))
+            transaction.on_commit(publish_snapshots)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class InvalidatesStatisticsMixin:
+    """Успешный запрос на запись сбрасывает кэш статистики админ-панели"""
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in permissions.SAFE_METHODS and response.status_code < 400:
+            transaction.on_commit(invalidate_statistics)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+@method_decorator(rates_condition(CITY), name='get')
 class PublicRatesView(generics.ListAPIView):
     """Публичный доступ к курсам валют"""
     serializer_class = MarketExchangeRateSerializer
     permission_classes = [AllowAny]
+    pagination_class = CreatedAtCursorPagination
+    filterset_class = MarketExchangeRateFilter
 
     def get_queryset(self):
-        return MarketExchangeRate.objects.select_related(
-            'currency', 'added_by'
-        ).filter(is_active=True).order_by('city_name', 'currency__code')
+        # Порядок задаёт курсорная пагинация (-created_at, -id)
+        return MarketExchangeRate.objects.select_related('currency', 'added_by').filter(is_active=True)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(InvalidatesStatisticsMixin, viewsets.ModelViewSet):
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAdmin]
@@ -285,10 +353,11 @@ class UserViewSet(viewsets.ModelViewSet):
         return queryset.order_by('-date_joined')
 
 
-class CurrencyViewSet(viewsets.ModelViewSet):
+class CurrencyViewSet(BumpsRatesVersionMixin, viewsets.ModelViewSet):
     queryset = Currency.objects.filter(is_active=True)
     serializer_class = CurrencySerializer
     permission_classes = [IsAdmin]
+    rates_version_scopes = (BANK, CITY)
 
     def get_queryset(self):
         return super().get_queryset().order_by('code')
@@ -303,18 +372,37 @@ class WorkerCurrencyViewSet(viewsets.ReadOnlyModelViewSet):
         return super().get_queryset().order_by('code')
 
 
-class BankViewSet(viewsets.ModelViewSet):
+class BankViewSet(BumpsRatesVersionMixin, viewsets.ModelViewSet):
     queryset = Bank.objects.filter(is_active=True)
     serializer_class = BankSerializer
     permission_classes = [IsAdmin]
+    rates_version_scopes = (BANK,)
 
     def get_queryset(self):
         return super().get_queryset().order_by('name')
 
+    def forget_rates(self, pairs):
+        # Записи кэша хранят название банка — после изменения или удаления они дочитываются из БД
+        for pair in pairs:
+            transaction.on_commit(lambda pair=pair: forget_bank_rate(*pair))
+
+    def perform_update(self, serializer):
+        bank = serializer.save()
+        self.forget_rates(bank.current_rates.values_list('bank_id', 'currency_id'))
+
+    def perform_destroy(self, instance):
+        # Курсы банка удаляются вместе с ним (CASCADE), поэтому пары собираем заранее
+        pairs = list(instance.current_rates.values_list('bank_id', 'currency_id'))
+        instance.delete()
+        self.forget_rates(pairs)
+
 
-class MarketExchangeRateViewSet(viewsets.ModelViewSet):
+class MarketExchangeRateViewSet(BumpsRatesVersionMixin, InvalidatesStatisticsMixin, viewsets.ModelViewSet):
     queryset = MarketExchangeRate.objects.select_related('currency', 'added_by').all()
     permission_classes = [IsAuthenticated, CanManageOwnCityRates]
+    rates_version_scopes = (CITY,)
+    pagination_class = CreatedAtCursorPagination
+    filterset_class = MarketExchangeRateFilter
 
     def get_serializer_class(self):
         """Выбор сериализатора в зависимости от роли пользователя"""
@@ -354,6 +442,10 @@ class MarketExchangeRateViewSet(viewsets.ModelViewSet):
                     date=timezone.now().date()
                 )
 
+            refresh_market_rate(instance.city_name, instance.currency_id)
+            add_market_rate(instance)
+            transaction.on_commit(lambda: store_city_rate(instance))
+
             # Логирование активности
             if user.role == 'city_worker':
                 WorkerActivity.objects.create(
@@ -367,26 +459,92 @@ class MarketExchangeRateViewSet(viewsets.ModelViewSet):
             logger.error(f"Error creating market rate: {str(e)}")
             raise
 
-
-class CurrencyExchangeRateViewSet(viewsets.ModelViewSet):
+    def perform_update(self, serializer):
+        """Изменённый курс мог перестать быть текущим — сбрасываем записи кэша его пар"""
+        old_pair = (serializer.instance.city_name, serializer.instance.currency_id)
+        instance = serializer.save()
+        new_pair = (instance.city_name, instance.currency_id)
+        for pair in {old_pair, new_pair}:
+            refresh_market_rate(*pair)
+            rebuild_market_rollups(*pair, instance.created_at)
+            transaction.on_commit(lambda pair=pair: forget_city_rate(*pair))
+
+    def perform_destroy(self, instance):
+        pair = (instance.city_name, instance.currency_id)
+        created_at = instance.created_at
+        instance.delete()
+        refresh_market_rate(*pair)
+        rebuild_market_rollups(*pair, created_at)
+        transaction.on_commit(lambda: forget_city_rate(*pair))
+
+
+@method_decorator(rates_condition(BANK), name='list')
+class CurrencyExchangeRateViewSet(BumpsRatesVersionMixin, InvalidatesStatisticsMixin, viewsets.ModelViewSet):
     queryset = CurrencyExchangeRate.objects.select_related('bank', 'currency').all()
     serializer_class = CurrencyExchangeRateSerializer
     permission_classes = [IsAuthenticated]  # ✅ Для всех авторизованных
+    rates_version_scopes = (BANK,)
+    pagination_class = CreatedAtCursorPagination
+    filterset_class = CurrencyExchangeRateFilter
+
+    def is_latest(self):
+        return self.request.query_params.get('latest') in ('1', 'true')
 
     def get_queryset(self):
-        return super().get_queryset().order_by('-date', '-created_at')
+        queryset = super().get_queryset()
+        # ?latest=1 — только последний курс каждого банка по каждой валюте
+        if self.is_latest():
+            return queryset.latest_per_bank()
+        return queryset.order_by('-date', '-created_at')
+
+    def paginate_queryset(self, queryset):
+        # Ответ ?latest=1 ограничен банками × валютами, а курсорная сортировка сломала бы DISTINCT ON
+        if self.is_latest():
+            return None
+        return super().paginate_queryset(queryset)
+
+    def perform_create(self, serializer):
+        """Курс, добавленный через API, становится текущим курсом своей пары, как и записанный парсером"""
+        instance = serializer.save()
+        update_bank_rates([instance])
+        add_bank_rates([instance])
+        # До увеличения версии и публикации снимков (finalize_response), чтобы они увидели новый курс
+        transaction.on_commit(lambda: store_bank_rates(
+            [instance], {instance.bank_id: instance.bank.name}, {instance.currency_id: instance.currency.code},
+        ))
+
+    def perform_update(self, serializer):
+        """Изменённая строка могла быть или перестать быть текущей — пересчитываем обе её пары"""
+        old_pair = (serializer.instance.bank_id, serializer.instance.currency_id)
+        instance = serializer.save()
+        new_pair = (instance.bank_id, instance.currency_id)
+        for pair in {old_pair, new_pair}:
+            refresh_bank_rate(*pair)
+            rebuild_bank_rollups(*pair, instance.created_at)
+            transaction.on_commit(lambda pair=pair: forget_bank_rate(*pair))
+
+    def perform_destroy(self, instance):
+        # CurrentRate.rate_id — не внешний ключ, удалённая строка сама из него не пропадёт
+        pair = (instance.bank_id, instance.currency_id)
+        created_at = instance.created_at
+        instance.delete()
+        refresh_bank_rate(*pair)
+        rebuild_bank_rollups(*pair, created_at)
+        transaction.on_commit(lambda: forget_bank_rate(*pair))
 
 
 class WorkerActivityViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = WorkerActivity.objects.select_related('worker', 'related_rate').all()
     serializer_class = WorkerActivitySerializer
     permission_classes = [IsAdmin]
+    pagination_class = TimestampCursorPagination
+    filterset_class = WorkerActivityFilter
 
     def get_queryset(self):
-        return super().get_queryset().order_by('-created_at')
+        return super().get_queryset().order_by('-timestamp')
 
 
-class WorkerViewSet(viewsets.ModelViewSet):
+class WorkerViewSet(InvalidatesStatisticsMixin, viewsets.ModelViewSet):
     queryset = CustomUser.objects.filter(role='city_worker')
     permission_classes = [IsAdmin]
 
@@ -399,7 +557,17 @@ class WorkerViewSet(viewsets.ModelViewSet):
             return UserSerializer
 
     def get_queryset(self):
-        return super().get_queryset().order_by('-date_joined')
+        """
+        Курсы за сегодня и последнее действие — аннотациями, чтобы список
+        работников читался одним запросом, а не двумя на каждого
+        """
+        last_activity = WorkerActivity.objects.filter(worker=OuterRef('pk')).order_by('-timestamp')
+        return super().get_queryset().annotate(
+            today_rates_count=Count('added_rates', filter=Q(added_rates__date=timezone.localdate())),
+            last_activity_action=Subquery(last_activity.values('action')[:1]),
+            last_activity_timestamp=Subquery(last_activity.values('timestamp')[:1]),
+            last_activity_description=Subquery(last_activity.values('description')[:1]),
+        ).order_by('-date_joined')
 
     def perform_create(self, serializer):
         """Логирование создания работника"""
@@ -446,6 +614,27 @@ class WorkerViewSet(viewsets.ModelViewSet):
             logger.error(f"Error updating worker: {str(e)}")
             raise
 
+    def perform_destroy(self, instance):
+        """
+        Курсы работника удаляются вместе с ним (CASCADE) — пересчитываем их пары
+        так же, как при удалении одного курса
+        """
+        weeks = {
+            (city_name, currency_id, period_start(created_at, 'week'))
+            for city_name, currency_id, created_at
+            in instance.added_rates.values_list('city_name', 'currency_id', 'created_at')
+        }
+        instance.delete()
+        if not weeks:
+            return
+        for city_name, currency_id, week in weeks:
+            rebuild_market_rollups(city_name, currency_id, week)
+        for pair in {(city_name, currency_id) for city_name, currency_id, _ in weeks}:
+            refresh_market_rate(*pair)
+            transaction.on_commit(lambda pair=pair: forget_city_rate(*pair))
+        transaction.on_commit(lambda: bump_versions(CITY))
+        transaction.on_commit(publish_snapshots)
+
     def create(self, request, *args, **kwargs):
         """Создание нового работника"""
         try:
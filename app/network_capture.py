@@ -0,0 +1,168 @@
+import base64
+import json
+import logging
+import re
+
+from selenium.common.exceptions import WebDriverException
+
+from .parsing import normalize_currency, normalize_rate
+
+logger = logging.getLogger(__name__)
+
+# Типы запросов страницы, среди которых ищем API с курсами
+XHR_TYPES = ('XHR', 'Fetch')
+# Заголовки, которые не переносим в прямой HTTP-запрос
+SKIP_HEADERS = ('cookie', 'host', 'content-length', 'accept-encoding')
+NUMBER_RE = re.compile(r'^\s*\d+(?:[.,]\d+)?\s*$')
+
+
+def read_json_responses(driver):
+    """
+    Разбирает сетевой журнал (performance log) текущей вкладки и возвращает
+    JSON-ответы XHR/fetch-запросов страницы: [{'url', 'headers', 'data'}, ...].
+    Вызывается, пока вкладка открыта: тела ответов читаются через CDP.
+    """
+    requests = {}
+    candidates = []
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        params = message.get('params', {})
+        if message.get('method') == 'Network.requestWillBeSent':
+            requests[params['requestId']] = params['request']
+        elif message.get('method') == 'Network.responseReceived':
+            if params.get('type') in XHR_TYPES and params['response'].get('status') == 200:
+                candidates.append((params['requestId'], params['response']['url']))
+
+    responses = []
+    for request_id, url in candidates:
+        request = requests.get(request_id, {})
+        # Повторить можно только простой GET без тела
+        if request.get('method', 'GET') != 'GET':
+            continue
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except WebDriverException:
+            continue
+
+        text = body['body']
+        if body.get('base64Encoded'):
+            text = base64.b64decode(text).decode('utf-8', 'replace')
+        try:
+            data = json.loads(text)
+        except ValueError:
+            continue
+
+        headers = {
+            name: value for name, value in request.get('headers', {}).items()
+            if not name.startswith(':') and name.lower() not in SKIP_HEADERS
+        }
+        responses.append({'url': url, 'headers': headers, 'data': data})
+
+    logger.debug(f"Перехвачено JSON-ответов: {len(responses)} из {len(candidates)} XHR/fetch")
+    return responses
+
+
+def iter_leaves(data, path=()):
+    """Все значения-листья JSON с путями к ним: ((ключ или индекс, ...), значение)"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from iter_leaves(value, path + (key,))
+    elif isinstance(data, list):
+        for index, value in enumerate(data):
+            yield from iter_leaves(value, path + (index,))
+    else:
+        yield path, data
+
+
+def get_path(data, path):
+    for key in path:
+        data = data[key]
+    return data
+
+
+def common_prefix(first, second):
+    prefix = []
+    for a, b in zip(first, second):
+        if a != b:
+            break
+        prefix.append(a)
+    return tuple(prefix)
+
+
+def _has_code_key(path, currency):
+    return any(isinstance(key, str) and normalize_currency(key) == currency for key in path)
+
+
+def find_rate_paths(data, rates):
+    """
+    Ищет в JSON пути к уже известным курсам (разобранным со страницы).
+
+    Для каждой валюты выбирается ближайшая пара значений покупки и продажи,
+    рядом с которой есть код валюты: ключом в пути или строкой в том же
+    объекте. Путь к строке с кодом запоминается, чтобы при загрузке проверить,
+    что на этом месте всё ещё та же валюта.
+    Возвращает {currency: {'buy': путь, 'sell': путь, 'code': путь или None}}.
+    """
+    numbers = []
+    codes = []
+    for path, value in iter_leaves(data):
+        if isinstance(value, bool) or value is None:
+            continue
+        if isinstance(value, str) and not NUMBER_RE.match(value):
+            codes.append((path, normalize_currency(value)))
+        elif isinstance(value, (int, float, str)):
+            numbers.append((path, normalize_rate(value)))
+
+    paths = {}
+    for rate in rates:
+        currency = rate['currency']
+        buys = [path for path, value in numbers if value == rate['buy']]
+        sells = [path for path, value in numbers if value == rate['sell']]
+
+        best = None
+        for buy in buys:
+            for sell in sells:
+                if buy == sell:
+                    continue
+                prefix = common_prefix(buy, sell)
+
+                if _has_code_key(buy, currency) and _has_code_key(sell, currency):
+                    code, depth = None, len(prefix)
+                else:
+                    # Строка с кодом в объекте, который содержит и покупку, и продажу
+                    found = [
+                        path for path, value in codes
+                        if value == currency and path[:-1] == prefix[:len(path) - 1]
+                    ]
+                    if not found:
+                        continue
+                    code = max(found, key=len)
+                    depth = len(code) - 1
+
+                score = (len(prefix), depth)
+                if best is None or score > best[0]:
+                    best = (score, {'buy': list(buy), 'sell': list(sell), 'code': list(code) if code else None})
+
+        if best:
+            paths[currency] = best[1]
+    return paths
+
+
+def extract_rates(data, paths):
+    """
+    Курсы из JSON по путям find_rate_paths(). Если структура ответа изменилась,
+    бросает ValueError — тогда курсы снова берутся со страницы через браузер.
+    """
+    rates = []
+    for currency, spec in paths.items():
+        try:
+            if spec['code'] is not None and normalize_currency(get_path(data, spec['code'])) != currency:
+                raise ValueError(f"на месте {currency} теперь другая валюта")
+            rates.append({
+                'currency': currency,
+                'buy': get_path(data, spec['buy']),
+                'sell': get_path(data, spec['sell']),
+            })
+        except (KeyError, IndexError, TypeError):
+            raise ValueError(f"в ответе больше нет курса {currency}")
+    return rates
@@ -0,0 +1,40 @@
+import json
+from pathlib import Path
+
+import httpx
+
+from .scraper_registry import STATIC
+
+# Сохранённые страницы банков: <bank>.html или <bank>.json (ответ API),
+# для браузерных банков — отрендеренный DOM. Ожидаемые курсы — в expected.json.
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures' / 'pages'
+EXTENSIONS = ('.html', '.json')
+
+
+def fixture_path(name, fixtures_dir=FIXTURES_DIR):
+    """Путь к сохранённой странице банка или None, если её нет"""
+    for extension in EXTENSIONS:
+        path = Path(fixtures_dir) / f'{name}{extension}'
+        if path.exists():
+            return path
+    return None
+
+
+def load_page(scraper, content):
+    """Ответ или HTML в том виде, в котором его получает parse() парсера"""
+    if scraper.transport != STATIC:
+        return content.decode('utf-8')
+    response = httpx.Response(200, content=content, request=httpx.Request('GET', scraper.url))
+    if scraper.encoding:
+        response.encoding = scraper.encoding
+    return response
+
+
+def load_fixture(scraper, fixtures_dir=FIXTURES_DIR):
+    """Сохранённая страница банка, готовая для scraper.parse()"""
+    return load_page(scraper, fixture_path(scraper.name, fixtures_dir).read_bytes())
+
+
+def load_expected(fixtures_dir=FIXTURES_DIR):
+    """Ожидаемые очищенные курсы по каждому банку: {bank: {currency: [buy, sell]}}"""
+    return json.loads((Path(fixtures_dir) / 'expected.json').read_text(encoding='utf-8'))
@@ -0,0 +1,18 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация по времени создания: следующая страница
+    выбирается условием WHERE created_at < ..., а не OFFSET, поэтому время
+    ответа не растёт вместе с историей.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class TimestampCursorPagination(CreatedAtCursorPagination):
+    """То же для журнала активности, где время записи хранится в timestamp"""
+    ordering = ('-timestamp', '-id')
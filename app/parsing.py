@@ -0,0 +1,92 @@
+import importlib.util
+import logging
+import re
+from decimal import Decimal, InvalidOperation
+
+import lxml.html
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# selectolax (Modest/Lexbor на C) быстрее lxml.html; используем, если установлен
+SELECTOLAX_AVAILABLE = importlib.util.find_spec('selectolax') is not None
+
+if SELECTOLAX_AVAILABLE:
+    from selectolax.parser import HTMLParser
+
+# Написания кодов валют на сайтах банков
+CURRENCY_ALIASES = {
+    'RUR': 'RUB',
+    'EURO': 'EUR',
+}
+
+
+def make_soup(markup):
+    """BeautifulSoup на парсере lxml — в разы быстрее встроенного html.parser"""
+    return BeautifulSoup(markup, 'lxml')
+
+
+def clean_text(text):
+    """Текст ячейки без переносов и повторяющихся пробелов"""
+    return ' '.join(text.split())
+
+
+def _table_rows_selectolax(markup, selector):
+    node = HTMLParser(markup).css_first(selector)
+    if node is None:
+        return None
+    return [
+        [clean_text(cell.text()) for cell in row.css('th, td')]
+        for row in node.css('tr')
+    ]
+
+
+def _table_rows_lxml(markup, selector):
+    if isinstance(markup, str):
+        # lxml не принимает str с объявлением кодировки внутри
+        markup = markup.encode('utf-8')
+    tree = lxml.html.fromstring(markup, parser=lxml.html.HTMLParser(encoding='utf-8'))
+    nodes = tree.cssselect(selector)
+    if not nodes:
+        return None
+    return [
+        [clean_text(cell.text_content()) for cell in row.cssselect('th, td')]
+        for row in nodes[0].cssselect('tr')
+    ]
+
+
+def table_rows(markup, selector):
+    """
+    Быстрый путь для простых таблиц: находит первый элемент по CSS-селектору
+    и возвращает тексты ячеек (th/td) каждой его строки tr.
+    Возвращает None, если элемент не найден.
+    """
+    if SELECTOLAX_AVAILABLE:
+        return _table_rows_selectolax(markup, selector)
+    return _table_rows_lxml(markup, selector)
+
+
+def normalize_currency(code):
+    """Приводит код валюты к виду USD/EUR/RUB"""
+    if not code:
+        return None
+    code = str(code).strip().upper()
+    return CURRENCY_ALIASES.get(code, code)
+
+
+def normalize_rate(value):
+    """Преобразует курс из строки или числа в Decimal с 4 знаками после запятой"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float, Decimal)):
+        cleaned = str(value)
+    else:
+        # Первое число в строке: "10,95", "10.95 сом." и т.п.
+        match = re.search(r'\d+(?:\.\d+)?', str(value).replace(',', '.'))
+        if not match:
+            return None
+        cleaned = match.group()
+    try:
+        return Decimal(cleaned).quantize(Decimal('0.0001'))
+    except InvalidOperation:
+        return None
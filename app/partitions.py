@@ -0,0 +1,161 @@
+import gzip
+import logging
+from datetime import date
+
+from django.db import connection, transaction
+
+from .models import Bank, CurrentRate
+from .rate_cache import BANK, bump_versions, forget_bank_rate
+from .snapshots import publish_snapshots
+
+logger = logging.getLogger(__name__)
+
+# История курсов банков на PostgreSQL разбита на месячные партиции по created_at
+# (миграция 0006). Границы месяцев — по UTC. Строки вне созданных партиций
+# попадают в DEFAULT-партицию и переносятся из неё при создании нужного месяца.
+PARENT_TABLE = 'app_currencyexchangerate'
+DEFAULT_PARTITION = f'{PARENT_TABLE}_default'
+PARTITION_PREFIX = f'{PARENT_TABLE}_p'
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{PARTITION_PREFIX}{month:%Y_%m}'
+
+
+def _bound(month):
+    return f"'{month:%Y-%m-%d} 00:00:00+00'"
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [PARENT_TABLE])
+        return cursor.fetchone() is not None
+
+
+def list_partitions():
+    """Подключённые месячные партиции: {первое число месяца: имя таблицы}"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [PARENT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        if name.startswith(PARTITION_PREFIX):
+            year, month = name[len(PARTITION_PREFIX):].split('_')
+            partitions[date(int(year), int(month), 1)] = name
+    return partitions
+
+
+def create_partition(month):
+    """
+    Создаёт партицию месяца. Строки этого месяца, уже попавшие в DEFAULT-партицию,
+    переносятся в новую таблицу до подключения, иначе PostgreSQL её не подключит.
+    """
+    name = partition_name(month)
+    start, end = _bound(month), _bound(add_months(month, 1))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE "{PARENT_TABLE}" INCLUDING DEFAULTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+            f'WHERE created_at >= {start} AND created_at < {end} RETURNING *) '
+            f'INSERT INTO "{name}" SELECT * FROM moved'
+        )
+        moved = cursor.rowcount
+        cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" ATTACH PARTITION "{name}" FOR VALUES FROM ({start}) TO ({end})')
+    logger.info(f"Создана партиция {name}" + (f", перенесено из DEFAULT: {moved}" if moved else ""))
+    return name
+
+
+def ensure_partitions(today, ahead):
+    """Создаёт недостающие партиции с текущего месяца на ahead месяцев вперёд"""
+    existing = list_partitions()
+    current = today.replace(day=1)
+    return [
+        create_partition(month)
+        for month in (add_months(current, offset) for offset in range(ahead + 1))
+        if month not in existing
+    ]
+
+
+def expired_partitions(today, retention_months):
+    """Партиции месяцев, целиком вышедших за срок хранения"""
+    oldest_kept = add_months(today.replace(day=1), -retention_months)
+    return {month: name for month, name in sorted(list_partitions().items()) if month < oldest_kept}
+
+
+def archive_partition(name, path):
+    """Выгружает партицию в gzip-CSV с заголовком"""
+    with connection.cursor() as cursor, gzip.open(path, 'wt', encoding='utf-8') as archive:
+        cursor.copy_expert(f'COPY "{name}" TO STDOUT WITH CSV HEADER', archive)
+
+
+def keep_current_rates(name):
+    """
+    Курс без изменений не пишется заново (подтверждается last_confirmed_at), поэтому
+    текущая строка пары может лежать в старой партиции. Такие строки копируются в
+    текущий месяц (created_at = now(), остальные поля как были), и CurrentRate
+    переводится на копии. Банки блокируются, как в save_rates, чтобы параллельная
+    запись курсов не проверила изменение по уходящей строке. Возвращает пары (банк, валюта).
+    """
+    banks, current_rates = Bank._meta.db_table, CurrentRate._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT id FROM {banks} WHERE id IN ('
+            f'SELECT c.bank_id FROM {current_rates} c JOIN "{name}" r ON r.id = c.rate_id'
+            f') ORDER BY id FOR UPDATE'
+        )
+        cursor.execute(
+            f"""
+            WITH kept AS (
+                SELECT r.* FROM "{name}" r JOIN {current_rates} c ON c.rate_id = r.id
+            ), copied AS (
+                INSERT INTO "{PARENT_TABLE}"
+                    (buy, sell, date, time, is_active, created_at, bank_id, currency_id, last_confirmed_at)
+                SELECT buy, sell, date, time, is_active, now(), bank_id, currency_id, last_confirmed_at FROM kept
+                RETURNING id, bank_id, currency_id
+            )
+            UPDATE {current_rates} c SET rate_id = copied.id FROM copied
+            WHERE c.bank_id = copied.bank_id AND c.currency_id = copied.currency_id
+            RETURNING c.bank_id, c.currency_id
+            """
+        )
+        pairs = cursor.fetchall()
+        # В кэше и снимках у текущих курсов прежние id строк
+        for pair in pairs:
+            transaction.on_commit(lambda pair=pair: forget_bank_rate(*pair))
+        if pairs:
+            transaction.on_commit(lambda: bump_versions(BANK))
+            transaction.on_commit(publish_snapshots)
+    return pairs
+
+
+def detach_partition(name, drop=False):
+    """
+    Отключает партицию от истории: таблица остаётся для архива, а с drop=True
+    удаляется — это мгновенно, в отличие от DELETE по диапазону дат.
+    Текущие курсы из партиции перед этим переносятся в текущий месяц (keep_current_rates)
+    """
+    with transaction.atomic():
+        kept = keep_current_rates(name)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"')
+            if drop:
+                cursor.execute(f'DROP TABLE "{name}"')
+    logger.info(
+        f"Партиция {name} {'удалена' if drop else 'отключена'}"
+        + (f", текущих курсов перенесено в текущий месяц: {len(kept)}" if kept else "")
+    )
@@ -3,6 +3,8 @@
 from rest_framework import permissions
 from rest_framework.permissions import BasePermission
 
+from .cities import city_directory
+
 
 class IsAdmin(BasePermission):
     """Разрешение только для администраторов"""
@@ -165,10 +167,8 @@ def get_user_accessible_cities(user):
         return []
 
     if user.role == 'admin':
-        # Админы могут видеть все города - можно вернуть все доступные города
-        # Здесь можно подключить функцию загрузки городов из JSON
-        from .myviews import load_cities_from_json
-        return load_cities_from_json()
+        # Админы могут видеть все города
+        return city_directory.all()
 
     if (user.role == 'city_worker' and
             user.is_worker_active and
@@ -0,0 +1,189 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import serializers
+
+from .models import CurrencyExchangeRate, MarketExchangeRate
+from .serializers import MarketExchangeRateSerializer
+
+logger = logging.getLogger(__name__)
+
+# Последний курс по каждой паре банк/валюта и город/валюта. Записи обновляются
+# при записи курса (write-through), а индекс пар сбрасывается, только когда
+# появляется или пропадает пара; при промахе недостающее дочитывается из БД.
+BANK_RATE_KEY = 'rates:bank:{}:{}'
+CITY_RATE_KEY = 'rates:city:{}:{}'
+BANK_INDEX_KEY = 'rates:bank:index'
+CITY_INDEX_KEY = 'rates:city:index'
+
+# Версии данных для условных GET (ETag/Last-Modified): время последней записи
+# курсов банков ('bank') или рынков городов ('city') в микросекундах
+VERSION_KEY = 'rates:version:{}'
+BANK, CITY = 'bank', 'city'
+
+
+# Поля с форматами DRF, чтобы записи не отличались от ответа сериализатора
+_rate_field = serializers.DecimalField(max_digits=10, decimal_places=4)
+_date_field = serializers.DateField()
+_time_field = serializers.TimeField()
+
+
+def bank_rate_entry(row, bank_name, currency_code):
+    """Курс банка в том же виде, что CurrencyExchangeRateSerializer, без обращения к связанным моделям"""
+    return {
+        'id': row.id,
+        'bank': row.bank_id,
+        'bank_name': bank_name,
+        'currency': row.currency_id,
+        'currency_code': currency_code,
+        'buy': _rate_field.to_representation(row.buy),
+        'sell': _rate_field.to_representation(row.sell),
+        'date': _date_field.to_representation(row.date),
+        'time': _time_field.to_representation(row.time),
+    }
+
+
+def _bank_key(pair):
+    return BANK_RATE_KEY.format(*pair)
+
+
+def _city_key(pair):
+    # Пробелы в ключах кэша недопустимы
+    city_name, currency_id = pair
+    return CITY_RATE_KEY.format(city_name.replace(' ', '_'), currency_id)
+
+
+def _load_bank_rates(bank_ids=None):
+    rows = CurrencyExchangeRate.objects.all()
+    if bank_ids is not None:
+        rows = rows.filter(bank_id__in=bank_ids)
+    rows = rows.current().select_related('bank', 'currency')
+    return {
+        (row.bank_id, row.currency_id): bank_rate_entry(row, row.bank.name, row.currency.code)
+        for row in rows
+    }
+
+
+def _load_city_rates(city_names=None):
+    rows = MarketExchangeRate.objects.filter(is_active=True)
+    if city_names is not None:
+        rows = rows.filter(city_name__in=city_names)
+    rows = rows.current().select_related('currency', 'added_by')
+    return {(row.city_name, row.currency_id): dict(MarketExchangeRateSerializer(row).data) for row in rows}
+
+
+def _read(index_key, make_key, load, scope):
+    """
+    Все записи области из кэша; без индекса область читается из БД целиком,
+    отсутствующие записи — только по своим банкам или городам
+    """
+    index = cache.get(index_key)
+    if index is None:
+        entries = load()
+        cache.set_many({make_key(pair): entry for pair, entry in entries.items()}, settings.RATE_CACHE_TIMEOUT)
+        cache.set(index_key, sorted(entries), settings.RATE_CACHE_TIMEOUT)
+        return list(entries.values())
+
+    cached = cache.get_many([make_key(pair) for pair in index])
+    missing = [pair for pair in index if make_key(pair) not in cached]
+    if missing:
+        loaded = load({scope_id for scope_id, _ in missing})
+        fresh = {make_key(pair): loaded[pair] for pair in missing if pair in loaded}
+        cache.set_many(fresh, settings.RATE_CACHE_TIMEOUT)
+        cached.update(fresh)
+        if len(fresh) < len(missing):
+            # Пары без курсов больше нет — индекс перестроится при следующем чтении
+            cache.delete(index_key)
+        logger.debug(f"Кэш курсов ({scope}): дочитано из БД {len(fresh)} записей")
+    return list(cached.values())
+
+
+def _add_pairs(index_key, pairs):
+    index = cache.get(index_key)
+    if index is not None and not set(pairs) <= set(map(tuple, index)):
+        cache.delete(index_key)
+
+
+def get_bank_rates():
+    """Текущие курсы всех банков, по названию банка и коду валюты"""
+    entries = _read(BANK_INDEX_KEY, _bank_key, _load_bank_rates, 'банки')
+    return sorted(entries, key=lambda entry: (entry['bank_name'], entry['currency_code']))
+
+
+def get_city_rates():
+    """Текущие рыночные курсы всех городов, по городу и коду валюты"""
+    entries = _read(CITY_INDEX_KEY, _city_key, _load_city_rates, 'города')
+    return sorted(entries, key=lambda entry: (entry['city_name'], entry['currency_code']))
+
+
+def store_bank_rates(rows, bank_names, currency_codes):
+    """
+    Write-through после записи курсов парсерами: новые строки становятся
+    текущими курсами своих пар. bank_names и currency_codes — {id: имя/код}.
+    """
+    entries = {
+        (row.bank_id, row.currency_id): bank_rate_entry(row, bank_names[row.bank_id], currency_codes[row.currency_id])
+        for row in rows
+    }
+    if not entries:
+        return
+    cache.set_many({_bank_key(pair): entry for pair, entry in entries.items()}, settings.RATE_CACHE_TIMEOUT)
+    _add_pairs(BANK_INDEX_KEY, entries)
+
+
+def store_city_rate(rate):
+    """Write-through после добавления или изменения рыночного курса: он самый свежий в своей паре"""
+    pair = (rate.city_name, rate.currency_id)
+    if not rate.is_active:
+        forget_city_rate(*pair)
+        return
+    cache.set(_city_key(pair), dict(MarketExchangeRateSerializer(rate).data), settings.RATE_CACHE_TIMEOUT)
+    _add_pairs(CITY_INDEX_KEY, [pair])
+
+
+def forget_bank_rate(bank_id, currency_id):
+    """
+    Строка истории банка изменена или удалена через API — запись пары дочитается
+    из БД при следующем чтении; пары, которой нет в индексе, сбрасывает индекс
+    """
+    pair = (bank_id, currency_id)
+    cache.delete(_bank_key(pair))
+    _add_pairs(BANK_INDEX_KEY, [pair])
+
+
+def forget_city_rate(city_name, currency_id):
+    """
+    Курс пары изменён или удалён — запись дочитается из БД при следующем чтении;
+    пары, которой нет в индексе (курс перенесён в другой город или снова активен), сбрасывает индекс
+    """
+    pair = (city_name, currency_id)
+    cache.delete(_city_key(pair))
+    _add_pairs(CITY_INDEX_KEY, [pair])
+
+
+def _now_version():
+    return time.time_ns() // 1000
+
+
+def get_versions(scopes):
+    """
+    Версии областей {scope: мкс}. Пропавшая из кэша версия начинается заново
+    с текущего времени — клиенты один раз получат полный ответ.
+    """
+    keys = {scope: VERSION_KEY.format(scope) for scope in scopes}
+    cached = cache.get_many(keys.values())
+    versions = {}
+    for scope, key in keys.items():
+        if key not in cached:
+            cache.add(key, _now_version(), None)
+            cached[key] = cache.get(key)
+        versions[scope] = cached[key]
+    return versions
+
+
+def bump_versions(*scopes):
+    """Курсы области изменились: закэшированные клиентами ответы устарели"""
+    version = _now_version()
+    cache.set_many({VERSION_KEY.format(scope): version for scope in scopes}, None)
@@ -0,0 +1,161 @@
+import logging
+import threading
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .current_rates import update_bank_rates
+from .rollups import add_bank_rates
+from .statistics import invalidate_statistics
+from .models import Currency, Bank, CurrencyExchangeRate
+from .rate_cache import BANK, bump_versions, store_bank_rates
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceCache:
+    """
+    Кэш id банков и валют в памяти процесса.
+
+    Загружается целиком двумя запросами при первом обращении; недостающие
+    записи создаются одним bulk_create, так что запись курсов не делает
+    get_or_create на каждую строку.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._banks = None
+        self._currencies = None
+
+    def reset(self):
+        with self._lock:
+            self._banks = None
+            self._currencies = None
+
+    def _warm(self):
+        if self._banks is None:
+            self._banks = dict(Bank.objects.values_list('name', 'id'))
+            self._currencies = dict(Currency.objects.values_list('code', 'id'))
+
+    @staticmethod
+    def _ensure(ids, model, field, keys):
+        missing = set(keys) - set(ids)
+        if not missing:
+            return
+        model.objects.bulk_create([model(**{field: key}) for key in missing], ignore_conflicts=True)
+        ids.update(model.objects.filter(**{f'{field}__in': missing}).values_list(field, 'id'))
+
+    def resolve(self, bank_names, currency_codes):
+        """Возвращает словари name → id и code → id, создавая недостающие записи"""
+        with self._lock:
+            self._warm()
+            self._ensure(self._banks, Bank, 'name', bank_names)
+            self._ensure(self._currencies, Currency, 'code', currency_codes)
+            return self._banks, self._currencies
+
+
+reference_cache = ReferenceCache()
+
+
+def latest_rate_rows(bank_ids):
+    """Текущие (последние записанные) строки курсов банков по каждой валюте"""
+    return CurrencyExchangeRate.objects.filter(bank_id__in=bank_ids).current()
+
+
+def latest_rates(bank_ids):
+    """Текущие курсы банков одним запросом: {(bank_id, currency_id): строка}"""
+    rows = latest_rate_rows(bank_ids).only('id', 'bank_id', 'currency_id', 'buy', 'sell')
+    return {(row.bank_id, row.currency_id): row for row in rows}
+
+
+def _write(rates_by_bank, confirmed_banks, now):
+    touched_banks = set(rates_by_bank) | set(confirmed_banks)
+    bank_ids, currency_ids = reference_cache.resolve(
+        touched_banks,
+        {rate['currency'] for rates in rates_by_bank.values() for rate in rates},
+    )
+    with transaction.atomic():
+        # Блокируем строки банков до чтения текущих курсов: параллельный запуск
+        # (ручной update_currency и диспетчер) ждёт, пока этот не запишет свои строки,
+        # иначе оба увидят один старый курс и оба запишут «изменившийся»
+        list(
+            Bank.objects.select_for_update()
+            .filter(id__in=[bank_ids[name] for name in touched_banks])
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        current = latest_rates([bank_ids[name] for name in rates_by_bank])
+
+        new_rows = []
+        confirmed_ids = []
+        saved = {}
+        for bank_name, rates in rates_by_bank.items():
+            saved[bank_name] = 0
+            for rate in rates:
+                key = (bank_ids[bank_name], currency_ids[rate['currency']])
+                row = current.get(key)
+                # Курс не изменился — подтверждаем текущую строку вместо новой
+                if row is not None and row.buy == rate['buy'] and row.sell == rate['sell']:
+                    confirmed_ids.append(row.id)
+                    continue
+                new_rows.append(CurrencyExchangeRate(
+                    bank_id=key[0],
+                    currency_id=key[1],
+                    buy=rate['buy'],
+                    sell=rate['sell'],
+                    last_confirmed_at=now,
+                ))
+                saved[bank_name] += 1
+
+        if new_rows:
+            CurrencyExchangeRate.objects.bulk_create(new_rows)
+            update_bank_rates(new_rows)
+            add_bank_rates(new_rows)
+            # Кэш текущих курсов обновляем только после фиксации транзакции
+            bank_names = {bank_ids[name]: name for name in rates_by_bank}
+            currency_codes = {currency_id: code for code, currency_id in currency_ids.items()}
+            transaction.on_commit(lambda: store_bank_rates(new_rows, bank_names, currency_codes))
+            transaction.on_commit(invalidate_statistics)
+            transaction.on_commit(lambda: bump_versions(BANK))
+        if confirmed_ids:
+            CurrencyExchangeRate.objects.filter(id__in=confirmed_ids).update(last_confirmed_at=now)
+        if confirmed_banks:
+            # Страница банка не изменилась — подтверждаем все его текущие курсы
+            latest_rate_rows([bank_ids[name] for name in confirmed_banks]).update(last_confirmed_at=now)
+
+    return saved, len(confirmed_ids)
+
+
+def save_rates(rates_by_bank, confirmed_banks=()):
+    """
+    Сохраняет очищенные курсы всех банков запуска одной транзакцией.
+
+    Новая строка пишется только если покупка или продажа изменились; у неизменных
+    курсов обновляется last_confirmed_at текущей строки. Для банков из
+    confirmed_banks (страница не изменилась) подтверждаются все текущие курсы.
+
+    rates_by_bank: {bank_name: [{'currency', 'buy', 'sell'}, ...]}.
+    Возвращает {bank_name: число новых записей}.
+    """
+    rates_by_bank = {name: rates for name, rates in rates_by_bank.items() if rates}
+    confirmed_banks = list(confirmed_banks)
+    if not rates_by_bank and not confirmed_banks:
+        return {}
+
+    now = timezone.now()
+    for attempt in range(2):
+        try:
+            saved, confirmed = _write(rates_by_bank, confirmed_banks, now)
+            break
+        except IntegrityError:
+            # Банк или валюту удалили после загрузки кэша — перечитываем и пробуем ещё раз
+            if attempt:
+                raise
+            logger.warning("Кэш банков/валют устарел, перечитываю")
+            reference_cache.reset()
+
+    logger.info(
+        f"[✓] Сохранено {sum(saved.values())} новых курсов, подтверждено без изменений: {confirmed}, "
+        f"страниц без изменений: {len(confirmed_banks)}"
+    )
+    return saved
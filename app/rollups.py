@@ -0,0 +1,167 @@
+import logging
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import BankRateRollup, CurrencyExchangeRate, MarketExchangeRate, MarketRateRollup
+
+logger = logging.getLogger(__name__)
+
+# Свёртки OHLC для графиков истории. Каждая новая строка курса добавляется в
+# свой час, день и неделю; период без изменений курса строки не получает,
+# на графике действует close предыдущего периода.
+GRANULARITIES = {
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+}
+OHLC_FIELDS = [
+    f'{side}_{point}' for side in ('buy', 'sell') for point in ('open', 'high', 'low', 'close')
+]
+
+BANK_KEY = ('bank_id', 'currency_id')
+MARKET_KEY = ('city_name', 'currency_id')
+
+
+def period_start(moment, granularity):
+    """Начало часа, дня или недели (с понедельника) по местному времени"""
+    local = timezone.localtime(moment)
+    if granularity == 'hour':
+        return local.replace(minute=0, second=0, microsecond=0)
+    day = local.date()
+    if granularity == 'week':
+        day -= timedelta(days=day.weekday())
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _new_bucket(model, key_fields, key, granularity, start, row):
+    bucket = model(granularity=granularity, period_start=start, samples=0, updated_at=row.created_at)
+    for field, value in zip(key_fields, key):
+        setattr(bucket, field, value)
+    for field in OHLC_FIELDS:
+        setattr(bucket, field, getattr(row, field.split('_')[0]))
+    return bucket
+
+
+def _add(bucket, row):
+    bucket.buy_high = max(bucket.buy_high, row.buy)
+    bucket.buy_low = min(bucket.buy_low, row.buy)
+    bucket.sell_high = max(bucket.sell_high, row.sell)
+    bucket.sell_low = min(bucket.sell_low, row.sell)
+    if row.created_at >= bucket.updated_at:
+        bucket.buy_close, bucket.sell_close, bucket.updated_at = row.buy, row.sell, row.created_at
+    bucket.samples += 1
+
+
+def roll_rates(model, key_fields, rows):
+    """
+    Добавляет строки курсов в свёртки: одна выборка затронутых периодов
+    и один upsert, сколько бы ни было строк
+    """
+    rows = sorted(rows, key=lambda row: row.created_at)
+    if not rows:
+        return
+
+    touched = {}
+    for row in rows:
+        key = tuple(getattr(row, field) for field in key_fields)
+        for granularity in GRANULARITIES:
+            touched.setdefault((key, granularity, period_start(row.created_at, granularity)), []).append(row)
+
+    # Выборка с запасом по каждому полю ключа, лишнее отсеивается по словарю
+    lookup = {f'{field}__in': {key[i] for key, _, _ in touched} for i, field in enumerate(key_fields)}
+    existing = {
+        (tuple(getattr(bucket, field) for field in key_fields), bucket.granularity, bucket.period_start): bucket
+        for bucket in model.objects.filter(**lookup, period_start__in={start for _, _, start in touched})
+    }
+
+    buckets = []
+    for (key, granularity, start), bucket_rows in touched.items():
+        bucket = _new_bucket(model, key_fields, key, granularity, start, bucket_rows[0])
+        previous = existing.get((key, granularity, start))
+        if previous is not None:
+            # Без id, иначе bulk_create разобьёт новые и существующие периоды на два запроса
+            for field in OHLC_FIELDS + ['samples', 'updated_at']:
+                setattr(bucket, field, getattr(previous, field))
+        for row in bucket_rows:
+            _add(bucket, row)
+        buckets.append(bucket)
+
+    model.objects.bulk_create(
+        buckets,
+        update_conflicts=True,
+        unique_fields=[field.removesuffix('_id') for field in key_fields] + ['granularity', 'period_start'],
+        update_fields=OHLC_FIELDS + ['samples', 'updated_at'],
+    )
+
+
+def add_bank_rates(rows):
+    """Новые строки истории курсов банков (уже записанные, с created_at)"""
+    roll_rates(BankRateRollup, BANK_KEY, rows)
+
+
+def add_market_rate(rate):
+    """Новый рыночный курс; неактивные курсы в графики не попадают"""
+    if rate.is_active:
+        roll_rates(MarketRateRollup, MARKET_KEY, [rate])
+
+
+def rebuild_bank_rollups(bank_id, currency_id, moment):
+    """
+    Строка истории банка изменена или удалена через API: свёртки её недели
+    (а с ней дней и часов) пересчитываются из строк пары, как их записал save_rates
+    """
+    start = period_start(moment, 'week')
+    end = start + GRANULARITIES['week']
+    BankRateRollup.objects.filter(
+        bank_id=bank_id, currency_id=currency_id, period_start__gte=start, period_start__lt=end,
+    ).delete()
+    rows = CurrencyExchangeRate.objects.filter(
+        bank_id=bank_id, currency_id=currency_id, created_at__gte=start, created_at__lt=end,
+    )
+    roll_rates(BankRateRollup, BANK_KEY, list(rows))
+
+
+def rebuild_market_rollups(city_name, currency_id, moment):
+    """
+    Курс пары изменён или удалён: свёртки его недели (а с ней дней и часов)
+    пересчитываются из активных курсов
+    """
+    start = period_start(moment, 'week')
+    end = start + GRANULARITIES['week']
+    MarketRateRollup.objects.filter(
+        city_name=city_name, currency_id=currency_id, period_start__gte=start, period_start__lt=end,
+    ).delete()
+    rows = MarketExchangeRate.objects.filter(
+        is_active=True, city_name=city_name, currency_id=currency_id, created_at__gte=start, created_at__lt=end,
+    )
+    roll_rates(MarketRateRollup, MARKET_KEY, list(rows))
+
+
+def pick_granularity(start, end):
+    """Самый мелкий шаг, при котором в диапазон укладывается не больше RATE_HISTORY_MAX_POINTS точек"""
+    for granularity, step in GRANULARITIES.items():
+        if (end - start) / step <= settings.RATE_HISTORY_MAX_POINTS:
+            return granularity
+    return 'week'
+
+
+def _point(bucket):
+    return {
+        'period': timezone.localtime(bucket.period_start).isoformat(),
+        'buy': {point: str(getattr(bucket, f'buy_{point}')) for point in ('open', 'high', 'low', 'close')},
+        'sell': {point: str(getattr(bucket, f'sell_{point}')) for point in ('open', 'high', 'low', 'close')},
+        'samples': bucket.samples,
+    }
+
+
+def history(queryset, start, end, granularity=None):
+    """Точки графика свёртки за [start, end): {'granularity', 'points'}"""
+    granularity = granularity or pick_granularity(start, end)
+    buckets = queryset.filter(
+        granularity=granularity,
+        period_start__gte=period_start(start, granularity),
+        period_start__lt=end,
+    ).order_by('period_start')
+    return {'granularity': granularity, 'points': [_point(bucket) for bucket in buckets]}
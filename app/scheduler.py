@@ -0,0 +1,100 @@
+import logging
+import random
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_KEY = 'scraper:schedule:{}'
+FETCH_COUNT_KEY = 'scraper:fetches:{}'
+SCHEDULE_TIMEOUT = 30 * 24 * 60 * 60
+
+# Во сколько раз меняется интервал опроса после запуска
+SPEED_UP = 0.5  # курсы изменились — опрашиваем чаще
+BACK_OFF = 1.5  # курсы те же — реже
+JITTER = 0.1  # ±10% к интервалу, чтобы банки не собирались в одну минуту
+
+
+def get_schedule(scraper):
+    """Текущий интервал и время следующего запуска парсера"""
+    state = cache.get(SCHEDULE_KEY.format(scraper.name))
+    if state is None:
+        return {'interval': int(scraper.refresh_interval.total_seconds()), 'next_run_at': None}
+    return state
+
+
+def is_due(scraper, now):
+    next_run_at = get_schedule(scraper)['next_run_at']
+    return next_run_at is None or datetime.fromisoformat(next_run_at) <= now
+
+
+def next_interval(scraper, interval, report):
+    """Новый интервал опроса по итогу запуска, в пределах min/max интервала банка"""
+    if report['status'] in ('ok', 'partial') and report['saved']:
+        interval *= SPEED_UP
+    elif report['status'] in ('ok', 'partial', 'unchanged'):
+        interval *= BACK_OFF
+    # Ошибки и пустые ответы интервал не меняют
+
+    low = scraper.min_refresh_interval.total_seconds()
+    high = scraper.max_refresh_interval.total_seconds()
+    return int(min(max(interval, low), high))
+
+
+def reschedule(scrapers, reports, now=None):
+    """Пересчитывает интервалы и время следующего запуска по отчётам run_scrapers()"""
+    now = now or timezone.now()
+    by_name = {scraper.name: scraper for scraper in scrapers}
+
+    for report in reports:
+        scraper = by_name.get(report['bank'])
+        if scraper is None:
+            continue
+
+        interval = next_interval(scraper, get_schedule(scraper)['interval'], report)
+        delay = interval * random.uniform(1 - JITTER, 1 + JITTER)
+        state = {
+            'interval': interval,
+            'next_run_at': (now + timedelta(seconds=delay)).isoformat(),
+        }
+        cache.set(SCHEDULE_KEY.format(scraper.name), state, SCHEDULE_TIMEOUT)
+        logger.debug(f"{scraper.bank_name}: следующий запуск через {delay / 3600:.1f}ч")
+
+
+def daily_budget(scrapers):
+    """Сколько загрузок банков разрешено в сутки"""
+    if settings.CURRENCY_DAILY_FETCH_BUDGET:
+        return settings.CURRENCY_DAILY_FETCH_BUDGET
+    # По умолчанию — столько же, сколько давал общий запуск раз в 12 часов
+    return 2 * len(scrapers)
+
+
+def take_due(scrapers, now=None):
+    """
+    Выбирает парсеры, которым пора запускаться, в пределах суточного бюджета.
+    Сначала идут самые просроченные; остальные ждут следующего диспетчера.
+    """
+    now = now or timezone.now()
+    due = [scraper for scraper in scrapers if is_due(scraper, now)]
+    if not due:
+        return []
+
+    def overdue(scraper):
+        next_run_at = get_schedule(scraper)['next_run_at']
+        return now - datetime.fromisoformat(next_run_at) if next_run_at else timedelta.max
+
+    due.sort(key=overdue, reverse=True)
+
+    key = FETCH_COUNT_KEY.format(now.date().isoformat())
+    cache.add(key, 0, 2 * 24 * 60 * 60)
+    remaining = daily_budget(scrapers) - cache.get(key, 0)
+    if remaining < len(due):
+        logger.warning(f"Суточный бюджет загрузок почти исчерпан: откладываю {len(due) - max(remaining, 0)} банков")
+        due = due[:max(remaining, 0)]
+
+    if due:
+        cache.incr(key, len(due))
+    return due
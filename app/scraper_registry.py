@@ -0,0 +1,380 @@
+import hashlib
+import importlib
+import logging
+import pkgutil
+from datetime import timedelta
+
+import httpx
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .browser_pool import browser_pool
+from .http_fetcher import FetchRequest, fetch
+from .network_capture import read_json_responses, find_rate_paths, extract_rates
+from .parsing import normalize_currency, normalize_rate
+from .rate_store import save_rates
+
+logger = logging.getLogger(__name__)
+
+# Способ получения страницы банка
+STATIC = 'static'
+BROWSER = 'browser'
+
+# ETag/Last-Modified и хэш фрагмента с курсами от последней записанной загрузки.
+# Состояние живёт сутки, после этого страница гарантированно разбирается заново.
+PAGE_STATE_KEY = 'scraper:page:{}'
+PAGE_STATE_TIMEOUT = 24 * 60 * 60
+
+# Селектор, который в прошлый раз нашёл курсы на странице браузерного банка
+LEARNED_SELECTOR_KEY = 'scraper:selector:{}'
+LEARNED_SELECTOR_TIMEOUT = 90 * 24 * 60 * 60
+
+# JSON/XHR-запрос, из которого страница браузерного банка берёт курсы.
+# Раз в неделю находка сверяется со страницей заново; если отдельного
+# запроса с курсами нет, повторный поиск — не раньше чем через сутки.
+ENDPOINT_KEY = 'scraper:endpoint:{}'
+ENDPOINT_TIMEOUT = 7 * 24 * 60 * 60
+ENDPOINT_MISS_TIMEOUT = 24 * 60 * 60
+
+_registry = {}
+_discovered = False
+
+
+def register(scraper_class):
+    """Декоратор: регистрирует класс парсера банка в общем реестре"""
+    name = scraper_class.name
+    if not name or not scraper_class.bank_name:
+        raise ImproperlyConfigured(f"{scraper_class.__name__}: не заданы name или bank_name")
+    if name in _registry and _registry[name] is not scraper_class:
+        raise ImproperlyConfigured(f"Парсер '{name}' уже зарегистрирован: {_registry[name].__name__}")
+    _registry[name] = scraper_class
+    return scraper_class
+
+
+def autodiscover():
+    """Импортирует все модули пакета app.banks, чтобы они зарегистрировали свои парсеры"""
+    global _discovered
+    if _discovered:
+        return
+
+    from . import banks
+    for module in pkgutil.iter_modules(banks.__path__):
+        importlib.import_module(f'{banks.__name__}.{module.name}')
+    _discovered = True
+
+
+def get_scrapers(names=None, transport=None):
+    """Возвращает экземпляры зарегистрированных парсеров (все или только указанные)"""
+    autodiscover()
+
+    if names is not None:
+        unknown = set(names) - set(_registry)
+        if unknown:
+            raise KeyError(f"Неизвестные парсеры: {', '.join(sorted(unknown))}")
+
+    return [
+        scraper_class()
+        for name, scraper_class in sorted(_registry.items())
+        if (names is None or name in names)
+        and (transport is None or scraper_class.transport == transport)
+    ]
+
+
+def get_scraper(name):
+    """Возвращает экземпляр парсера по имени"""
+    autodiscover()
+    return _registry[name]()
+
+
+class BankScraper:
+    """
+    Базовый класс парсера банка.
+
+    Подкласс описывает банк метаданными и реализует fetch(), который
+    возвращает список словарей {'currency', 'buy', 'sell'}; курсы могут быть
+    строками или числами — нормализация и сохранение общие для всех банков.
+    """
+    name = None  # Ключ в реестре: 'nbt', 'brt', ...
+    bank_name = None  # Название банка в таблице Bank
+    transport = None
+    currencies = ('USD', 'EUR', 'RUB')
+    refresh_interval = timedelta(hours=12)  # Начальный интервал опроса
+    # Пределы, в которых планировщик подстраивает интервал под частоту изменений
+    min_refresh_interval = timedelta(hours=3)
+    max_refresh_interval = timedelta(hours=24)
+    timeout = None
+    retry_budget = 60  # Секунд на все попытки банка за один запуск
+    retry_on = ()  # Исключения, при которых попытку стоит повторить
+
+    def fetch(self):
+        raise NotImplementedError
+
+    def clean(self, rates):
+        """Нормализует коды валют и курсы, отбрасывает неполные и неожиданные записи"""
+        cleaned = {}
+        for rate in rates or []:
+            code = normalize_currency(rate.get('currency'))
+            if code not in self.currencies or code in cleaned:
+                continue
+
+            buy = normalize_rate(rate.get('buy'))
+            sell = normalize_rate(rate.get('sell'))
+            if not buy or not sell:
+                logger.warning(f"[!] {self.bank_name}: некорректный курс {code}: {rate.get('buy')}, {rate.get('sell')}")
+                continue
+
+            cleaned[code] = {'currency': code, 'buy': buy, 'sell': sell}
+        return list(cleaned.values())
+
+    def save(self, rates):
+        """Сохраняет очищенные курсы банка; возвращает число сохранённых записей"""
+        return save_rates({self.bank_name: rates}).get(self.bank_name, 0)
+
+    def get_metadata(self):
+        return {
+            'name': self.name,
+            'bank_name': self.bank_name,
+            'transport': self.transport,
+            'currencies': list(self.currencies),
+            'refresh_interval': int(self.refresh_interval.total_seconds()),
+            'min_refresh_interval': int(self.min_refresh_interval.total_seconds()),
+            'max_refresh_interval': int(self.max_refresh_interval.total_seconds()),
+            'timeout': self.timeout,
+        }
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name}>"
+
+
+class StaticScraper(BankScraper):
+    """
+    Банк, курсы которого доступны обычным HTTP-запросом (HTML или JSON).
+
+    Запрос отправляется условным (If-None-Match/If-Modified-Since), а ответ
+    сравнивается по хэшу фрагмента с курсами: если страница не изменилась,
+    разбор и запись в БД пропускаются.
+    """
+    transport = STATIC
+    retry_on = (httpx.TransportError,)
+    url = None
+    headers = None
+    verify = True
+    encoding = None
+    # (начало, конец) фрагмента страницы с курсами; None — хэшируется весь ответ
+    fragment_markers = None
+
+    def get_headers(self):
+        return self.headers
+
+    def get_page_state(self):
+        return cache.get(PAGE_STATE_KEY.format(self.name)) or {}
+
+    def get_fetch_request(self, conditional=False):
+        headers = dict(self.get_headers() or {})
+        if conditional:
+            state = self.get_page_state()
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+
+        return FetchRequest(
+            self.name,
+            self.url,
+            headers=headers,
+            verify=self.verify,
+            timeout=self.timeout,
+            encoding=self.encoding,
+        )
+
+    def get_fragment(self, response):
+        """Часть ответа, от которой зависят курсы (без счётчиков, токенов и т.п.)"""
+        if self.fragment_markers:
+            start_marker, end_marker = self.fragment_markers
+            text = response.text
+            start = text.find(start_marker)
+            end = text.find(end_marker, start + 1) if start != -1 else -1
+            if end != -1:
+                return text[start:end].encode()
+        return response.content
+
+    def build_page_state(self, response):
+        return {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'hash': hashlib.sha256(self.get_fragment(response)).hexdigest(),
+        }
+
+    def is_unchanged(self, response, page_state):
+        """Страница не изменилась с последней записи: 304 или тот же хэш фрагмента"""
+        if response.status_code == 304:
+            return True
+        previous = self.get_page_state().get('hash')
+        return previous is not None and previous == page_state['hash']
+
+    def parse(self, response):
+        raise NotImplementedError
+
+    def fetch(self):
+        return self.parse(fetch(self.get_fetch_request()))
+
+
+class BrowserScraper(BankScraper):
+    """
+    Банк, страница которого рендерится JavaScript и требует браузера.
+
+    scrape() работает с вкладкой пула и возвращает отрендеренный HTML; разбор
+    в parse() идёт уже после освобождения вкладки и не зависит от браузера,
+    поэтому проверяется на сохранённых страницах (app/fixtures/pages).
+
+    Пока страница рендерится, записываются её сетевые запросы: если курсы
+    пришли отдельным JSON-ответом, он запоминается, и следующие запуски
+    загружают его обычным HTTP без браузера.
+    """
+    transport = BROWSER
+    retry_on = (WebDriverException,)
+    retry_budget = 150
+    user_agent = None
+    timeout = 30
+    implicit_wait = 10
+
+    learned_selector_timeout = 5  # Секунд на проверку запомненного селектора
+    capture_endpoint = True  # Искать JSON/XHR-запрос с курсами, пока страница рендерится
+
+    def scrape(self, driver):
+        raise NotImplementedError
+
+    def parse(self, html):
+        raise NotImplementedError
+
+    def get_learned_selector(self):
+        return cache.get(LEARNED_SELECTOR_KEY.format(self.name))
+
+    def learn_selector(self, selector):
+        if selector != self.get_learned_selector():
+            logger.info(f"{self.bank_name}: запоминаю селектор {selector!r}")
+            cache.set(LEARNED_SELECTOR_KEY.format(self.name), selector, LEARNED_SELECTOR_TIMEOUT)
+
+    def order_selectors(self, selectors):
+        """Список селекторов, где запомненный идёт первым"""
+        learned = self.get_learned_selector()
+        if learned in selectors:
+            return [learned] + [selector for selector in selectors if selector != learned]
+        return list(selectors)
+
+    @staticmethod
+    def wait_for_selector(driver, selectors, match, timeout):
+        """
+        Одно ожидание, которое на каждом опросе проверяет все селекторы.
+        Возвращает (селектор, элемент) первого элемента, прошедшего match, или None.
+        """
+        def find(d):
+            for selector in selectors:
+                for element in d.find_elements(By.CSS_SELECTOR, selector):
+                    if match(element):
+                        return selector, element
+            return False
+
+        try:
+            return WebDriverWait(driver, timeout, ignored_exceptions=(WebDriverException,)).until(find)
+        except TimeoutException:
+            return None
+
+    def find_with_learned_selector(self, driver, selectors, match):
+        """
+        Сначала коротко проверяет селектор, сработавший в прошлый раз, и только
+        при промахе перебирает весь список с полным таймаутом, запоминая находку
+        """
+        learned = self.get_learned_selector()
+        if learned in selectors:
+            found = self.wait_for_selector(driver, [learned], match, self.learned_selector_timeout)
+            if found:
+                return found[1]
+            logger.info(f"{self.bank_name}: запомненный селектор {learned!r} не сработал, перебираю все")
+
+        found = self.wait_for_selector(driver, selectors, match, self.timeout)
+        if not found:
+            return None
+        self.learn_selector(found[0])
+        return found[1]
+
+    def get_endpoint(self):
+        return cache.get(ENDPOINT_KEY.format(self.name))
+
+    def forget_endpoint(self):
+        cache.delete(ENDPOINT_KEY.format(self.name))
+
+    def learn_endpoint(self, responses, rates):
+        """
+        Ищет среди JSON-ответов страницы тот, в котором есть все разобранные
+        курсы, и запоминает его как быстрый путь. Возвращает endpoint или None.
+        """
+        rates = self.clean(rates)
+        if not rates:
+            return None
+
+        for response in responses:
+            paths = find_rate_paths(response['data'], rates)
+            if len(paths) == len(rates):
+                endpoint = {'url': response['url'], 'headers': response['headers'], 'paths': paths}
+                cache.set(ENDPOINT_KEY.format(self.name), endpoint, ENDPOINT_TIMEOUT)
+                logger.info(f"{self.bank_name}: курсы приходят из {response['url']}, дальше загружаю его без браузера")
+                return endpoint
+
+        cache.set(ENDPOINT_KEY.format(self.name), {'url': None}, ENDPOINT_MISS_TIMEOUT)
+        logger.info(f"{self.bank_name}: среди {len(responses)} JSON-ответов страницы курсов нет")
+        return None
+
+    def fetch_endpoint(self, endpoint):
+        """Курсы напрямую из JSON-запроса страницы, без браузера"""
+        request = FetchRequest(self.name, endpoint['url'], headers=endpoint['headers'], timeout=self.timeout)
+        response = fetch(request)
+        response.raise_for_status()
+        return extract_rates(response.json(), endpoint['paths'])
+
+    def open_page(self):
+        return browser_pool.page(
+            user_agent=self.user_agent,
+            page_load_timeout=self.timeout,
+            implicit_wait=self.implicit_wait,
+        )
+
+    def render(self):
+        """Открывает страницу банка во вкладке пула и возвращает её HTML"""
+        with self.open_page() as driver:
+            return self.scrape(driver)
+
+    def capture(self):
+        """Как render(), но ещё возвращает JSON-ответы XHR/fetch-запросов страницы"""
+        with self.open_page() as driver:
+            html = self.scrape(driver)
+            return html, read_json_responses(driver)
+
+    def fetch(self):
+        """
+        Сначала запомненный JSON-запрос обычным HTTP; браузер нужен, только
+        если его ещё нет или он перестал отдавать курсы
+        """
+        endpoint = self.get_endpoint()
+        if endpoint and endpoint['url']:
+            try:
+                return self.fetch_endpoint(endpoint)
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"{self.bank_name}: {endpoint['url']} больше не отдаёт курсы ({e}), открываю страницу")
+                self.forget_endpoint()
+                endpoint = None
+
+        if endpoint is None and self.capture_endpoint:
+            html, responses = self.capture()
+            rates = self.parse(html)
+            self.learn_endpoint(responses, rates)
+            return rates
+        return self.parse(self.render())
+
+    def get_metadata(self):
+        metadata = super().get_metadata()
+        metadata['endpoint'] = (self.get_endpoint() or {}).get('url')
+        return metadata
@@ -6,8 +6,6 @@ from django.utils import timezone
 from django.conf import settings
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 import logging
-import json
-import os
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -16,6 +14,7 @@ from .models import (
     CustomUser, Currency, Bank,
     CurrencyExchangeRate, MarketExchangeRate, WorkerActivity
 )
+from .cities import city_directory
 
 
 class CustomDateTimeField(serializers.DateTimeField):
@@ -38,25 +37,6 @@ def get_local_time():
         return timezone.now()
 
 
-def load_cities_from_json():
-    """Загружает список городов из JSON файла"""
-    try:
-        json_path = os.path.join(os.path.dirname(__file__), 'cities.json')
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('cities', [])
-    except FileNotFoundError:
-        logger.warning("cities.json not found, using default cities")
-        return [
-            {'id': 1, 'name': 'Душанбе', 'region': 'Душанбе'},
-            {'id': 2, 'name': 'Худжанд', 'region': 'Согдийская область'},
-            {'id': 3, 'name': 'Истаравшан', 'region': 'Согдийская область'}
-        ]
-    except Exception as e:
-        logger.error(f"Error loading cities: {e}")
-        return []
-
-
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Кастомный сериализатор для JWT-токенов с обновлением last_login"""
 
@@ -204,6 +184,9 @@ class WorkerSerializer(serializers.ModelSerializer):
 
     def get_added_rates_count(self, obj):
         """Получение количества добавленных курсов за сегодня"""
+        # WorkerViewSet считает курсы аннотацией today_rates_count
+        if hasattr(obj, 'today_rates_count'):
+            return obj.today_rates_count
         try:
             # Получаем сегодняшнюю дату в локальной зоне
             local_today = get_local_time().date()
@@ -221,8 +204,15 @@ class WorkerSerializer(serializers.ModelSerializer):
     def get_last_activity(self, obj):
         """Получение последней активности работника"""
         try:
-            # ИСПРАВЛЕНО: Используем правильное поле для сортировки
-            last_activity = obj.activities.order_by('-timestamp').first()
+            if hasattr(obj, 'last_activity_action'):
+                # Аннотации WorkerViewSet: у работника без действий все три поля None
+                last_activity = WorkerActivity(
+                    action=obj.last_activity_action,
+                    timestamp=obj.last_activity_timestamp,
+                    description=obj.last_activity_description,
+                ) if obj.last_activity_action is not None else None
+            else:
+                last_activity = obj.activities.order_by('-timestamp').first()
             if last_activity:
                 return {
                     'action': last_activity.action,
@@ -287,9 +277,7 @@ class CreateWorkerSerializer(serializers.ModelSerializer):
         # Проверяем, что город существует в списке городов
         city_name = attrs.get('city_name')
         if city_name:
-            cities = load_cities_from_json()
-            city_names = [city['name'] for city in cities]
-            if city_name not in city_names:
+            if not city_directory.exists(city_name):
                 raise serializers.ValidationError({
                     'city_name': f'Город "{city_name}" не найден в списке доступных городов'
                 })
@@ -501,9 +489,7 @@ class AssignWorkerSerializer(serializers.Serializer):
             raise serializers.ValidationError("Необходимо указать название города")
 
         # Проверяем, что город существует в списке городов
-        cities = load_cities_from_json()
-        city_names = [city['name'] for city in cities]
-        if value not in city_names:
+        if not city_directory.exists(value):
             raise serializers.ValidationError(f"Город '{value}' не найден в списке доступных городов")
 
         return value
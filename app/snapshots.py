@@ -0,0 +1,111 @@
+import gzip
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .current_rates import best_rates
+from .rate_cache import get_bank_rates, get_city_rates
+
+try:
+    import brotli
+except ImportError:  # Необязательная зависимость: без неё пишутся только .gz
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Снимки публичных курсов: готовый JSON и его сжатые копии, которые nginx
+# (nginx/nginx.conf и nginx/nginx.prod.conf) отдаёт сам, не обращаясь к Django. Публикуются после
+# каждого запуска парсеров с новыми курсами и каждой правки рыночного курса.
+CITIES_DIR = 'cities'
+CURRENCIES_DIR = 'currencies'
+
+
+def _file_name(name):
+    return f"{name.replace('/', '_')}.json"
+
+
+def render_snapshots():
+    """{относительный путь: содержимое} всех снимков"""
+    bank_rates = get_bank_rates()
+    city_rates = get_city_rates()
+    snapshots = {
+        'bank-rates.json': bank_rates,
+        'rates.json': city_rates,
+        'best-rates.json': {'timestamp': timezone.now().isoformat(), 'currencies': best_rates()},
+    }
+
+    by_city = {}
+    for entry in city_rates:
+        by_city.setdefault(entry['city_name'], []).append(entry)
+    for city_name, entries in by_city.items():
+        snapshots[f'{CITIES_DIR}/{_file_name(city_name)}'] = entries
+
+    by_currency = {}
+    for source, entries in (('bank', bank_rates), ('market', city_rates)):
+        for entry in entries:
+            currency = by_currency.setdefault(entry['currency_code'], {'bank': [], 'market': []})
+            currency[source].append(entry)
+    for code, entries in by_currency.items():
+        snapshots[f'{CURRENCIES_DIR}/{_file_name(code)}'] = entries
+
+    return snapshots
+
+
+def _replace(path, content):
+    # Через временный файл: nginx никогда не отдаст наполовину записанный снимок. Имя
+    # уникально — снимки одновременно публикуют воркеры gunicorn и Celery
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)  # mkstemp создаёт файл только для владельца, а читает его nginx
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def write_snapshot(path, payload):
+    """Пишет JSON, .gz и (если есть brotli) .br с одинаковым mtime — его nginx отдаёт в Last-Modified и ETag"""
+    content = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    variants = {path: content, path.with_name(f'{path.name}.gz'): gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[path.with_name(f'{path.name}.br')] = brotli.compress(content)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    now = timezone.now().timestamp()
+    for variant, data in variants.items():
+        _replace(variant, data)
+        os.utime(variant, (now, now))
+
+
+def publish_snapshots(root=None):
+    """
+    Перерисовывает все снимки и удаляет снимки пропавших городов и валют.
+    Ошибка записи не мешает записи курсов: nginx отдаст прежний снимок или API.
+    """
+    root = Path(root or settings.RATE_SNAPSHOT_DIR)
+    try:
+        snapshots = render_snapshots()
+        for name, payload in snapshots.items():
+            write_snapshot(root / name, payload)
+
+        published = {root / name for name in snapshots}
+        for directory in (CITIES_DIR, CURRENCIES_DIR):
+            for path in (root / directory).glob('*.json'):
+                if path not in published:
+                    for variant in (path, path.with_name(f'{path.name}.gz'), path.with_name(f'{path.name}.br')):
+                        variant.unlink(missing_ok=True)
+    except OSError as e:
+        logger.error(f"Не удалось опубликовать снимки курсов в {root}: {e}")
+        return []
+
+    logger.info(f"Снимки курсов опубликованы: {len(snapshots)} в {root}")
+    return sorted(snapshots)
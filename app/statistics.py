@@ -0,0 +1,83 @@
+import logging
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Value
+from django.utils import timezone
+
+from .cities import city_directory
+from .models import CurrencyExchangeRate, CustomUser, MarketExchangeRate, WorkerActivity
+
+logger = logging.getLogger(__name__)
+
+# Статистика админ-панели целиком лежит в кэше несколько секунд и сбрасывается
+# при записи курсов, пользователей и работников — опрос панели почти не стоит запросов
+STATISTICS_KEY = 'statistics:admin'
+
+
+def _today_counts(today):
+    """Курсы и действия работников за сегодня одним запросом: {'market', 'bank', 'activity'}"""
+    start = timezone.make_aware(datetime.combine(today, time.min))
+    counters = [
+        ('market', MarketExchangeRate.objects.filter(date=today, is_active=True)),
+        ('bank', CurrencyExchangeRate.objects.filter(date=today, is_active=True)),
+        ('activity', WorkerActivity.objects.filter(timestamp__gte=start, timestamp__lt=start + timedelta(days=1))),
+    ]
+    # По строке на счётчик; таблица без сегодняшних строк строки не даёт
+    queries = [
+        queryset.order_by().annotate(kind=Value(kind)).values('kind').annotate(total=Count('id'))
+        for kind, queryset in counters
+    ]
+    counts = {kind: 0 for kind, _ in counters}
+    counts.update(dict(queries[0].union(*queries[1:], all=True).values_list('kind', 'total')))
+    return counts
+
+
+def compute_statistics():
+    total_cities = len(city_directory.all())
+    today = timezone.localdate()
+    users = CustomUser.objects.aggregate(
+        total=Count('id'),
+        admins=Count('id', filter=Q(role='admin') | Q(is_superuser=True) | Q(is_staff=True)),
+        workers=Count('id', filter=Q(role='city_worker')),
+        cities_with_workers=Count('city_name', filter=Q(role='city_worker'), distinct=True),
+    )
+    today_counts = _today_counts(today)
+
+    return {
+        'users': {
+            'total': users['total'],
+            'admins': users['admins'],
+            'workers': users['workers'],
+            'regular': users['total'] - users['admins'] - users['workers'],
+        },
+        'cities': {
+            'total': total_cities,
+            'active': total_cities,
+            'with_workers': users['cities_with_workers'],
+        },
+        'rates': {
+            'today_market': today_counts['market'],
+            'today_bank': today_counts['bank'],
+            'total_today': today_counts['market'] + today_counts['bank'],
+        },
+        'activity': {
+            'today_activities': today_counts['activity'],
+        },
+        'date': today.isoformat(),
+        'timestamp': timezone.now().isoformat(),
+    }
+
+
+def get_statistics():
+    """Статистика админ-панели из кэша"""
+    statistics = cache.get(STATISTICS_KEY)
+    if statistics is None:
+        statistics = compute_statistics()
+        cache.set(STATISTICS_KEY, statistics, settings.STATISTICS_CACHE_TIMEOUT)
+    return statistics
+
+
+def invalidate_statistics():
+    cache.delete(STATISTICS_KEY)
@@ -1,53 +1,88 @@
 from celery import shared_task
-from .currency_fetcher import (
-    fetch_and_save_currency_data_nbt,
-    fetch_and_save_currency_data_eskhata,
-    fetch_and_save_currency_data_arvand,
-    fetch_and_save_currency_data_imon,
-    fetch_and_save_currency_data_oriyonbonk,
-    fetch_and_save_currency_data_amonatbonk,
-    fetch_and_save_currency_data_spitamenbank,
-    fetch_and_save_currency_data_humo,
-    fetch_and_save_currency_data_azizimoliya,
-    fetch_and_save_currency_data_brt,
-    fetch_and_save_currency_data_cbt,
-    fetch_and_save_currency_data_finca,
-    fetch_and_save_currency_data_ibt,
-    fetch_and_save_currency_data_matin,
-    fetch_and_save_currency_data_ssb,
-    fetch_and_save_currency_data_tawhidbank,
-    fetch_and_save_currency_data_tejaratbank,
-)
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.utils import timezone
+from .currency_fetcher import run_scrapers
+from .partitions import ensure_partitions, is_partitioned
+from .snapshots import publish_snapshots
+from .scheduler import reschedule, take_due
+from .scraper_registry import get_scrapers
 import logging
+import secrets
 
 logger = logging.getLogger('app')
 
+DISPATCH_LOCK_KEY = 'scraper:dispatch:lock'
+
+# Удаляет ключ, только если в нём всё ещё наш токен — сравнение и удаление одной командой
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def release_lock(key, token):
+    """Снимает блокировку, только если её держит этот запуск, а не следующий, взявший её после таймаута"""
+    cache = caches['default']
+    if isinstance(cache, RedisCache):
+        # Токен — int, а RedisCache хранит целые числа без pickle, так что скрипт сравнивает их как есть
+        client = cache._cache.get_client(key, write=True)
+        client.eval(RELEASE_LOCK_SCRIPT, 1, cache.make_and_validate_key(key), token)
+    elif cache.get(key) == token:
+        cache.delete(key)
+
+
+def run_and_reschedule(scrapers):
+    summary = run_scrapers(scrapers)
+    reschedule(scrapers, summary['banks'])
+    if any(report.get('saved') for report in summary['banks']):
+        publish_snapshots()
+    return summary
+
+
+@shared_task
+def dispatch_currency_updates():
+    """
+    Запускается beat'ом каждые несколько минут и обновляет только те банки,
+    у которых подошло время по их собственному адаптивному расписанию
+    """
+    # Не запускаем второй диспетчер, пока предыдущий ещё парсит
+    token = secrets.randbits(62)
+    if not caches['default'].add(DISPATCH_LOCK_KEY, token, settings.CURRENCY_DISPATCH_LOCK_TIMEOUT):
+        logger.info("Предыдущее обновление курсов ещё идёт, пропускаю")
+        return None
+
+    try:
+        scrapers = take_due(get_scrapers())
+        if not scrapers:
+            return None
+        logger.info(f"Обновляю курсы: {', '.join(scraper.name for scraper in scrapers)}")
+        return run_and_reschedule(scrapers)
+    finally:
+        release_lock(DISPATCH_LOCK_KEY, token)
+
+
+@shared_task
+def update_currency(names=None):
+    """Обновляет курсы всех банков из реестра (или только перечисленных в names)"""
+    return run_and_reschedule(get_scrapers(names))
+
+
 @shared_task
-def update_currency():
-    funcs = [
-        fetch_and_save_currency_data_nbt,
-        fetch_and_save_currency_data_eskhata,
-        fetch_and_save_currency_data_arvand,
-        fetch_and_save_currency_data_imon,
-        fetch_and_save_currency_data_oriyonbonk,
-        fetch_and_save_currency_data_amonatbonk,
-        fetch_and_save_currency_data_spitamenbank,
-        fetch_and_save_currency_data_humo,
-        fetch_and_save_currency_data_azizimoliya,
-        fetch_and_save_currency_data_brt,
-        fetch_and_save_currency_data_cbt,
-        fetch_and_save_currency_data_finca,
-        fetch_and_save_currency_data_ibt,
-        fetch_and_save_currency_data_matin,
-        fetch_and_save_currency_data_ssb,
-        fetch_and_save_currency_data_tawhidbank,
-        fetch_and_save_currency_data_tejaratbank,
-    ]
-
-    for func in funcs:
-        try:
-            func()
-            logger.info(f"{func.__name__} успешно выполнена.")
-        except Exception as e:
-            logger.error(f"Ошибка в {func.__name__}: {e}")
+def update_bank_currency(name):
+    """Обновляет курсы одного банка — удобно для ручного перезапуска упавшего парсера"""
+    return run_and_reschedule(get_scrapers([name]))
 
+
+@shared_task
+def maintain_rate_partitions():
+    """
+    Заранее создаёт партиции истории курсов на месяцы вперёд, чтобы новые курсы
+    не попадали в DEFAULT-партицию. Старые партиции отключает команда rate_partitions.
+    """
+    if not is_partitioned():
+        return []
+    return ensure_partitions(timezone.now().date(), settings.RATE_PARTITIONS_AHEAD)
@@ -1,3 +1,950 @@
-from django.test import TestCase
+import gzip
+import json
+import math
+import multiprocessing
+import os
+import sys
+import tempfile
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from .cities import CityDirectory
+from .current_rates import best_rates
+from .filters import WorkerActivityFilter
+from .models import (
+    Bank, BankRateRollup, Currency, CurrencyExchangeRate, CurrentRate, CustomUser, MarketExchangeRate,
+    MarketRateRollup, WorkerActivity,
+)
+from .network_capture import extract_rates, find_rate_paths
+from .rate_cache import get_bank_rates, get_city_rates
+from .page_fixtures import load_expected, load_fixture
+from .partitions import (
+    PARENT_TABLE, add_months, create_partition, detach_partition, expired_partitions, is_partitioned, list_partitions,
+    partition_name,
+)
+from .rate_store import reference_cache, save_rates
+from .scraper_registry import get_scrapers
+from .snapshots import publish_snapshots
+from .statistics import compute_statistics
+from .tasks import DISPATCH_LOCK_KEY, dispatch_currency_updates
+
+
+def use_temp_snapshot_dir(test):
+    """Снимки курсов, публикуемые после записи, пишутся во временный каталог теста"""
+    directory = tempfile.TemporaryDirectory()
+    test.addCleanup(directory.cleanup)
+    override = test.settings(RATE_SNAPSHOT_DIR=directory.name)
+    override.enable()
+    test.addCleanup(override.disable)
+    return directory.name
+
+
+def parse_fixture(scraper):
+    """Курсы банка из сохранённой страницы: {currency: [buy, sell]}"""
+    rates = scraper.clean(scraper.parse(load_fixture(scraper)))
+    return {rate['currency']: [str(rate['buy']), str(rate['sell'])] for rate in rates}
+
+
+class BankParserTests(SimpleTestCase):
+    """Разбор сохранённых страниц всех банков без обращения к сайтам"""
+
+    def test_every_bank_has_fixture(self):
+        expected = load_expected()
+        self.assertEqual(sorted(expected), sorted(scraper.name for scraper in get_scrapers()))
+
+    def test_parsers_extract_expected_rates(self):
+        expected = load_expected()
+        for scraper in get_scrapers():
+            with self.subTest(bank=scraper.name):
+                self.assertEqual(parse_fixture(scraper), expected[scraper.name])
+
+
+class EndpointCaptureTests(SimpleTestCase):
+    """Поиск курсов в перехваченном JSON и загрузка их по запомненным путям"""
+
+    rates = [
+        {'currency': 'USD', 'buy': Decimal('10.9000'), 'sell': Decimal('11.0500')},
+        {'currency': 'EUR', 'buy': Decimal('11.9000'), 'sell': Decimal('12.1000')},
+    ]
+    data = {'updated': '2024-05-01', 'items': [
+        {'code': 'EUR', 'buy': '11.90', 'sell': '12.10'},
+        {'code': 'USD', 'buy': 10.9, 'sell': '11,05'},
+    ]}
+
+    def test_rates_found_next_to_currency_code(self):
+        paths = find_rate_paths(self.data, self.rates)
+        self.assertEqual(paths['USD'], {'buy': ['items', 1, 'buy'], 'sell': ['items', 1, 'sell'], 'code': ['items', 1, 'code']})
+        self.assertEqual(extract_rates(self.data, paths)[0], {'currency': 'USD', 'buy': 10.9, 'sell': '11,05'})
+
+    def test_currency_as_key(self):
+        data = {'USD': {'buy': 10.9, 'sell': 11.05}, 'EUR': {'buy': 11.9, 'sell': 12.1}}
+        paths = find_rate_paths(data, self.rates)
+        self.assertEqual(paths['EUR'], {'buy': ['EUR', 'buy'], 'sell': ['EUR', 'sell'], 'code': None})
+
+    def test_changed_structure_raises(self):
+        paths = find_rate_paths(self.data, self.rates)
+        reordered = {'items': list(reversed(self.data['items']))}
+        with self.assertRaises(ValueError):
+            extract_rates(reordered, paths)
+        with self.assertRaises(ValueError):
+            extract_rates({'items': []}, paths)
+
+
+class SaveRatesTests(TestCase):
+    """Запись курсов одного запуска: число запросов не зависит от числа банков"""
+
+    def setUp(self):
+        reference_cache.reset()
+        self.rates_by_bank = {}
+        for scraper in get_scrapers():
+            self.rates_by_bank[scraper.bank_name] = scraper.clean(scraper.parse(load_fixture(scraper)))
+
+    def tearDown(self):
+        reference_cache.reset()
+
+    def test_all_banks_saved(self):
+        saved = save_rates(self.rates_by_bank)
+        total = sum(len(rates) for rates in self.rates_by_bank.values())
+        self.assertEqual(sum(saved.values()), total)
+        self.assertEqual(CurrencyExchangeRate.objects.count(), total)
+
+    def test_warm_cache_query_count(self):
+        save_rates(self.rates_by_bank)
+        for rates in self.rates_by_bank.values():
+            for rate in rates:
+                rate['buy'] += Decimal('0.01')
+
+        # SAVEPOINT, блокировка банков, выборка текущих курсов, вставка новых строк, upsert CurrentRate,
+        # выборка и upsert свёрток OHLC, RELEASE. Upsert свёрток (час, день и неделя
+        # каждой пары) — один запрос, кроме SQLite с его лимитом параметров
+        rollups = 3 * sum(len(rates) for rates in self.rates_by_bank.values())
+        fields = [field for field in BankRateRollup._meta.concrete_fields if not field.primary_key]
+        batches = math.ceil(rollups / connection.ops.bulk_batch_size(fields, range(rollups)))
+        with self.assertNumQueries(7 + batches):
+            save_rates(self.rates_by_bank)
+
+    def test_unchanged_rates_are_confirmed_not_inserted(self):
+        save_rates(self.rates_by_bank)
+        count = CurrencyExchangeRate.objects.count()
+
+        saved = save_rates(self.rates_by_bank)
+
+        self.assertEqual(sum(saved.values()), 0)
+        self.assertEqual(CurrencyExchangeRate.objects.count(), count)
+        self.assertFalse(CurrencyExchangeRate.objects.filter(last_confirmed_at__isnull=True).exists())
+
+
+class CurrentRatesTests(TestCase):
+    """Текущие курсы обновляются при каждой записи, лучшие считаются только по ним"""
+
+    def setUp(self):
+        reference_cache.reset()
+        self.rates_by_bank = {}
+        for scraper in get_scrapers():
+            self.rates_by_bank[scraper.bank_name] = scraper.clean(scraper.parse(load_fixture(scraper)))
+
+    def tearDown(self):
+        reference_cache.reset()
+
+    def test_one_row_per_pair(self):
+        save_rates(self.rates_by_bank)
+        bank_name, rates = next(iter(self.rates_by_bank.items()))
+        rates[0]['sell'] += Decimal('1')
+        save_rates({bank_name: rates})
+
+        total = sum(len(rates) for rates in self.rates_by_bank.values())
+        self.assertEqual(CurrentRate.objects.count(), total)
+        current = CurrentRate.objects.get(bank__name=bank_name, currency__code=rates[0]['currency'])
+        self.assertEqual(current.sell, rates[0]['sell'])
+        self.assertEqual(current.rate_id, CurrencyExchangeRate.objects.latest('id').id)
+
+    def test_best_rates(self):
+        save_rates(self.rates_by_bank)
+        offers = [
+            (bank_name, rate) for bank_name, rates in self.rates_by_bank.items()
+            for rate in rates if rate['currency'] == 'USD'
+        ]
+        usd = next(entry for entry in best_rates() if entry['currency'] == 'USD')
+
+        self.assertEqual(usd['offers'], len(offers))
+        self.assertEqual(usd['best_buy']['rate'], str(max(rate['buy'] for _, rate in offers)))
+        self.assertEqual(usd['best_sell']['rate'], str(min(rate['sell'] for _, rate in offers)))
+
+
+class LatestBankRatesApiTests(TestCase):
+    """?latest=1 на api/public/bank-rates/: по строке на пару банк/валюта, а не вся история"""
+
+    def setUp(self):
+        reference_cache.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create(username='reader'))
+        self.rates_by_bank = {}
+        for scraper in get_scrapers():
+            self.rates_by_bank[scraper.bank_name] = scraper.clean(scraper.parse(load_fixture(scraper)))
+
+    def tearDown(self):
+        reference_cache.reset()
+
+    def test_latest_returns_one_row_per_pair(self):
+        save_rates(self.rates_by_bank)
+        for rates in self.rates_by_bank.values():
+            for rate in rates:
+                rate['sell'] += Decimal('0.01')
+        save_rates(self.rates_by_bank)
+
+        total = sum(len(rates) for rates in self.rates_by_bank.values())
+        history = self.client.get('/api/public/bank-rates/', {'page_size': 1000}).json()
+        self.assertEqual(len(history['results']), 2 * total)
+
+        latest = self.client.get('/api/public/bank-rates/', {'latest': '1'}).json()
+        self.assertEqual(len(latest), total)
+        self.assertEqual({row['id'] for row in latest}, set(CurrentRate.objects.values_list('rate_id', flat=True)))
+
+    def test_cursor_pages_and_filters(self):
+        save_rates(self.rates_by_bank)
+        total = sum(len(rates) for rates in self.rates_by_bank.values())
+
+        seen = []
+        url, params = '/api/public/bank-rates/', {'page_size': 10}
+        while url:
+            page = self.client.get(url, params).json()
+            seen += [row['id'] for row in page['results']]
+            url, params = page['next'], None
+        self.assertEqual(len(seen), total)
+        self.assertEqual(len(set(seen)), total)
+
+        usd = self.client.get('/api/public/bank-rates/', {'currency_code': 'usd', 'page_size': 1000}).json()
+        self.assertEqual({row['currency_code'] for row in usd['results']}, {'USD'})
+
+        today = timezone.localdate()
+        for params, expected in (({'date_from': today}, total), ({'date_to': today - timedelta(days=1)}, 0)):
+            page = self.client.get('/api/public/bank-rates/', {**params, 'page_size': 1000}).json()
+            self.assertEqual(len(page['results']), expected, params)
+
+
+class BankRateWriteApiTests(TestCase):
+    """Правка и удаление курса банка через api/public/bank-rates/<id>/ пересчитывают текущий курс пары"""
+
+    def setUp(self):
+        reference_cache.reset()
+        cache.clear()
+        self.root = Path(use_temp_snapshot_dir(self))
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create(username='editor'))
+        save_rates({'Тест-банк': [{'currency': 'USD', 'buy': Decimal('10.5'), 'sell': Decimal('10.9')}]})
+        self.row = CurrencyExchangeRate.objects.get()
+
+    def tearDown(self):
+        reference_cache.reset()
+
+    def url(self, row):
+        return f'/api/public/bank-rates/{row.id}/'
+
+    def best_usd(self):
+        return next((entry for entry in best_rates() if entry['currency'] == 'USD'), None)
+
+    def test_create_becomes_current(self):
+        response = self.client.post('/api/public/bank-rates/', {
+            'bank': self.row.bank_id, 'currency': self.row.currency_id, 'buy': '11.0', 'sell': '11.4',
+        })
+
+        self.assertEqual(response.status_code, 201)
+        current = CurrentRate.objects.get()
+        self.assertEqual(current.rate_id, response.json()['id'])
+        self.assertEqual(current.buy, Decimal('11.0'))
+
+    def test_patch_updates_current_rate(self):
+        response = self.client.patch(self.url(self.row), {'buy': '12.0'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(CurrentRate.objects.get().buy, Decimal('12.0'))
+        self.assertEqual(Decimal(self.best_usd()['best_buy']['rate']), Decimal('12.0'))
+
+    def test_delete_falls_back_to_previous_row(self):
+        save_rates({'Тест-банк': [{'currency': 'USD', 'buy': Decimal('11.0'), 'sell': Decimal('11.4')}]})
+        newest = CurrencyExchangeRate.objects.latest('id')
+
+        self.assertEqual(self.client.delete(self.url(newest)).status_code, 204)
+        current = CurrentRate.objects.get()
+        self.assertEqual((current.rate_id, current.buy), (self.row.id, Decimal('10.5')))
+
+        self.assertEqual(self.client.delete(self.url(self.row)).status_code, 204)
+        self.assertFalse(CurrentRate.objects.exists())
+        self.assertIsNone(self.best_usd())
+
+    def test_cache_and_snapshots_follow_writes(self):
+        get_bank_rates()  # Прогреваем кэш: запись пары должна обновиться, а не дочитаться случайно
+
+        def published():
+            snapshot = json.loads((self.root / 'bank-rates.json').read_text(encoding='utf-8'))
+            return [(entry['id'], Decimal(entry['buy'])) for entry in snapshot]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.url(self.row), {'buy': '12.0'})
+        expected = [(self.row.id, Decimal('12.0'))]
+        self.assertEqual([(entry['id'], Decimal(entry['buy'])) for entry in get_bank_rates()], expected)
+        self.assertEqual(published(), expected)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            created = self.client.post('/api/public/bank-rates/', {
+                'bank': self.row.bank_id, 'currency': self.row.currency_id, 'buy': '11.0', 'sell': '11.4',
+            }).json()
+        self.assertEqual(published(), [(created['id'], Decimal('11.0'))])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/public/bank-rates/{created['id']}/")
+        self.assertEqual(published(), expected)
+
+
+class RollupTests(TestCase):
+    """Свёртки OHLC обновляются при записи курсов и отдаются в /api/public/history/"""
+
+    def setUp(self):
+        reference_cache.reset()
+        self.client = APIClient()
+
+    def tearDown(self):
+        reference_cache.reset()
+
+    def test_bank_rates_rolled_up(self):
+        for buy, sell in (('10.5', '10.9'), ('10.8', '11.2'), ('10.6', '11.0')):
+            save_rates({'Bank A': [{'currency': 'USD', 'buy': Decimal(buy), 'sell': Decimal(sell)}]})
+
+        buckets = BankRateRollup.objects.filter(bank__name='Bank A')
+        self.assertEqual(sorted(buckets.values_list('granularity', flat=True)), ['day', 'hour', 'week'])
+        for bucket in buckets:
+            self.assertEqual(bucket.samples, 3)
+            self.assertEqual(
+                [bucket.buy_open, bucket.buy_high, bucket.buy_low, bucket.buy_close],
+                [Decimal('10.5'), Decimal('10.8'), Decimal('10.5'), Decimal('10.6')],
+            )
+
+        params = {'bank': 'Bank A', 'currency': 'usd', 'date_from': timezone.localdate()}
+        response = self.client.get('/api/public/history/', params).json()
+        self.assertEqual(response['granularity'], 'hour')
+        self.assertEqual(response['points'][0]['sell'], {'open': '10.9000', 'high': '11.2000', 'low': '10.9000', 'close': '11.0000'})
+
+    def test_granularity_follows_range(self):
+        today = timezone.localdate()
+        for days, expected in ((1, 'hour'), (90, 'day'), (5 * 365, 'week')):
+            params = {'bank': 'Bank A', 'currency': 'USD', 'date_from': today - timedelta(days=days)}
+            self.assertEqual(self.client.get('/api/public/history/', params).json()['granularity'], expected)
+        self.assertEqual(self.client.get('/api/public/history/', {'currency': 'USD'}).status_code, 400)
+
+    def test_market_rollups_rebuilt_on_delete(self):
+        worker = CustomUser.objects.create(username='worker', role='city_worker', city_name='Dushanbe')
+        self.client.force_authenticate(worker)
+        usd = Currency.objects.create(code='USD', name='US Dollar')
+        for buy in ('10.5', '10.7'):
+            self.client.post('/api/workers/rates/', {'currency': usd.id, 'buy': buy, 'sell': '11'})
+
+        hour = MarketRateRollup.objects.get(city_name='Dushanbe', granularity='hour')
+        self.assertEqual((hour.samples, hour.buy_close), (2, Decimal('10.7')))
+
+        self.client.delete(f"/api/workers/rates/{MarketExchangeRate.objects.latest('id').id}/")
+        hour = MarketRateRollup.objects.get(city_name='Dushanbe', granularity='hour')
+        self.assertEqual((hour.samples, hour.buy_high, hour.buy_close), (1, Decimal('10.5'), Decimal('10.5')))
+
+    def test_bank_rollups_rebuilt_on_update_and_delete(self):
+        self.client.force_authenticate(CustomUser.objects.create(username='editor'))
+        for buy in ('10.5', '10.7'):
+            save_rates({'Bank A': [{'currency': 'USD', 'buy': Decimal(buy), 'sell': Decimal('11')}]})
+        latest = CurrencyExchangeRate.objects.latest('id')
+
+        self.client.patch(f'/api/public/bank-rates/{latest.id}/', {'buy': '12.0'})
+        hour = BankRateRollup.objects.get(bank__name='Bank A', granularity='hour')
+        self.assertEqual((hour.samples, hour.buy_high, hour.buy_close), (2, Decimal('12.0'), Decimal('12.0')))
+
+        self.client.delete(f'/api/public/bank-rates/{latest.id}/')
+        for bucket in BankRateRollup.objects.filter(bank__name='Bank A'):
+            self.assertEqual(
+                (bucket.samples, bucket.buy_open, bucket.buy_high, bucket.buy_low, bucket.buy_close),
+                (1, Decimal('10.5'), Decimal('10.5'), Decimal('10.5'), Decimal('10.5')),
+            )
+
+
+class WorkerListTests(TestCase):
+    """Список работников в админке: число запросов не зависит от числа работников"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create(username='admin', role='admin'))
+        self.usd = Currency.objects.create(code='USD', name='US Dollar')
+
+    def add_workers(self, count):
+        for _ in range(count):
+            number = CustomUser.objects.count()
+            worker = CustomUser.objects.create(username=f'worker{number}', role='city_worker', city_name=f'City {number}')
+            for buy in ('10.5', '10.6'):
+                rate = MarketExchangeRate.objects.create(
+                    currency=self.usd, city_name=worker.city_name, buy=Decimal(buy), sell=Decimal('11'), added_by=worker,
+                )
+                WorkerActivity.objects.create(worker=worker, action='add_rate', description=buy, related_rate=rate)
+
+    def list_workers(self):
+        with CaptureQueriesContext(connection) as queries:
+            workers = self.client.get('/api/admin/workers/').json()
+        return workers, len(queries)
+
+    def test_constant_queries(self):
+        self.add_workers(2)
+        workers, few = self.list_workers()
+        self.assertEqual([worker['added_rates_count'] for worker in workers], [2, 2])
+        self.assertEqual([worker['last_activity']['description'] for worker in workers], ['10.6', '10.6'])
+
+        self.add_workers(5)
+        workers, many = self.list_workers()
+        self.assertEqual(len(workers), 7)
+        self.assertEqual(few, many)
+
+    def test_activity_by_local_date(self):
+        self.add_workers(1)
+        # 00:30 по Душанбе — ещё предыдущие сутки по UTC
+        moment = timezone.make_aware(datetime(2026, 10, 10, 0, 30))
+        WorkerActivity.objects.update(timestamp=moment)
+        for params, count in (
+            ({'date_from': '2026-10-10', 'date_to': '2026-10-10'}, 2),
+            ({'date_to': '2026-10-09'}, 0),
+            ({'date_from': '2026-10-11'}, 0),
+        ):
+            results = self.client.get('/api/admin/worker-activity/', params).json()['results']
+            self.assertEqual(len(results), count, params)
+
+
+class StatisticsTests(TestCase):
+    """Статистика админ-панели: два запроса при промахе, ни одного из кэша, сброс при записи"""
+
+    def setUp(self):
+        cache.clear()
+        use_temp_snapshot_dir(self)
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create(username='admin', role='admin'))
+        self.worker = CustomUser.objects.create(username='worker', role='city_worker', city_name='Dushanbe')
+        self.usd = Currency.objects.create(code='USD', name='US Dollar')
+        rate = MarketExchangeRate.objects.create(
+            currency=self.usd, city_name='Dushanbe', buy=Decimal('10.5'), sell=Decimal('11'), added_by=self.worker,
+        )
+        WorkerActivity.objects.create(worker=self.worker, action='add_rate', description='', related_rate=rate)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_counters(self):
+        with self.assertNumQueries(2):
+            statistics = compute_statistics()
+        self.assertEqual(statistics['users'], {'total': 2, 'admins': 1, 'workers': 1, 'regular': 0})
+        self.assertEqual(statistics['cities']['with_workers'], 1)
+        self.assertEqual(statistics['rates'], {'today_market': 1, 'today_bank': 0, 'total_today': 1})
+        self.assertEqual(statistics['activity'], {'today_activities': 1})
+
+    def test_cached_and_invalidated(self):
+        first = self.client.get('/api/admin/statistics/').json()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/admin/statistics/').json(), first)
+
+        self.client.force_authenticate(self.worker)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/workers/rates/', {'currency': self.usd.id, 'buy': '10.6', 'sell': '11'})
+        self.client.force_authenticate(CustomUser.objects.get(username='admin'))
+        self.assertEqual(self.client.get('/api/admin/statistics/').json()['rates']['today_market'], 2)
+
+
+class CityDirectoryTests(SimpleTestCase):
+    """Справочник городов читает файл один раз и перечитывает только после изменения"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'cities.json'
+        self.write([{'id': 1, 'name': 'Душанбе', 'region': 'Душанбе'}])
+        self.cities = CityDirectory(self.path, reload_interval=0)
+
+    def write(self, cities, mtime=None):
+        self.path.write_text(json.dumps({'cities': cities}), encoding='utf-8')
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_lookups(self):
+        self.write([
+            {'id': 1, 'name': 'Душанбе', 'region': 'Душанбе'},
+            {'id': 2, 'name': 'Худжанд', 'region': 'Согдийская область'},
+            {'id': 3, 'name': 'Истаравшан', 'region': 'Согдийская область'},
+        ])
+        self.assertEqual(self.cities.get(2)['name'], 'Худжанд')
+        self.assertTrue(self.cities.exists('Истаравшан'))
+        self.assertFalse(self.cities.exists('Москва'))
+        self.assertEqual([city['id'] for city in self.cities.in_region('Согдийская область')], [2, 3])
+
+    def test_reloads_only_on_mtime_change(self):
+        self.assertEqual(len(self.cities.all()), 1)
+        with mock.patch('builtins.open') as opened:
+            self.cities.all()
+        opened.assert_not_called()
+
+        self.write([{'id': 1, 'name': 'Душанбе'}, {'id': 2, 'name': 'Худжанд'}], mtime=self.path.stat().st_mtime + 10)
+        self.assertEqual(len(self.cities.all()), 2)
+
+    def test_returns_copies(self):
+        self.cities.all().clear()
+        self.cities.in_region('Душанбе').append({'id': 2, 'name': 'Худжанд'})
+        self.assertEqual([city['id'] for city in self.cities.all()], [1])
+        self.assertEqual([city['id'] for city in self.cities.in_region('Душанбе')], [1])
+
+
+class ConditionalGetTests(TestCase):
+    """Публичные курсы отдают ETag; пока курсы не менялись, повторный запрос получает 304 без БД"""
+
+    def setUp(self):
+        cache.clear()
+        use_temp_snapshot_dir(self)
+        reference_cache.reset()
+        self.client = APIClient()
+        self.usd = Currency.objects.create(code='USD', name='US Dollar')
+        self.worker = CustomUser.objects.create(username='worker', role='city_worker', city_name='Dushanbe')
+
+    def tearDown(self):
+        reference_cache.reset()
+        cache.clear()
+
+    def test_not_modified_until_rate_written(self):
+        url = '/api/public/rates/latest/'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.force_authenticate(self.worker)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/workers/rates/', {'currency': self.usd.id, 'buy': '10.5', 'sell': '11'})
+        self.client.force_authenticate(None)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_bank_rates_follow_scraper_writes(self):
+        self.client.force_authenticate(self.worker)
+        etag = self.client.get('/api/public/bank-rates/')['ETag']
+        self.assertEqual(self.client.get('/api/public/bank-rates/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            save_rates({'Bank A': [{'currency': 'USD', 'buy': Decimal('10.5'), 'sell': Decimal('10.9')}]})
+        self.assertEqual(self.client.get('/api/public/bank-rates/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        # Рынки городов не менялись
+        self.assertEqual(
+            self.client.get('/api/public/rates/', HTTP_IF_NONE_MATCH=self.client.get('/api/public/rates/')['ETag']).status_code,
+            304,
+        )
+
+
+    def test_if_modified_since_ignored(self):
+        url = '/api/public/rates/latest/'
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response)
+
+        # Курс записан в ту же секунду — заголовок с точностью до секунды его бы не заметил
+        self.client.force_authenticate(self.worker)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/workers/rates/', {'currency': self.usd.id, 'buy': '10.5', 'sell': '11'})
+        self.client.force_authenticate(None)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+class SnapshotTests(TestCase):
+    """Снимки публичных курсов для nginx: JSON и .gz, по городам и валютам"""
+
+    def setUp(self):
+        cache.clear()
+        reference_cache.reset()
+        self.root = Path(use_temp_snapshot_dir(self))
+
+    def tearDown(self):
+        reference_cache.reset()
+        cache.clear()
+
+    def test_publish(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            save_rates({'Bank A': [{'currency': 'USD', 'buy': Decimal('10.5'), 'sell': Decimal('10.9')}]})
+        worker = CustomUser.objects.create(username='worker', role='city_worker', city_name='Худжанд')
+        MarketExchangeRate.objects.create(
+            currency=Currency.objects.get(code='USD'), city_name='Худжанд', buy=Decimal('10.6'), sell=Decimal('11'),
+            added_by=worker,
+        )
+
+        names = publish_snapshots()
+        self.assertIn('cities/Худжанд.json', names)
+        self.assertEqual(json.loads((self.root / 'bank-rates.json').read_text()), get_bank_rates())
+        usd = json.loads(gzip.decompress((self.root / 'currencies/USD.json.gz').read_bytes()))
+        self.assertEqual(([row['bank_name'] for row in usd['bank']], [row['city_name'] for row in usd['market']]), (['Bank A'], ['Худжанд']))
+
+        # Города без курсов больше нет — его снимок удаляется
+        MarketExchangeRate.objects.all().delete()
+        cache.clear()
+        publish_snapshots()
+        self.assertFalse((self.root / 'cities/Худжанд.json').exists())
+        self.assertFalse((self.root / 'cities/Худжанд.json.gz').exists())
+
+    def test_concurrent_publishes(self):
+        # Воркеры gunicorn и Celery — отдельные процессы: каждый файл целиком от одного из них
+        payloads = {name: [{'bank_name': name, 'buy': str(i)} for i in range(5000)] for name in 'AB'}
+
+        def publish(name):
+            with mock.patch('app.snapshots.render_snapshots', return_value={'bank-rates.json': payloads[name]}):
+                failed = sum(publish_snapshots(self.root) != ['bank-rates.json'] for _ in range(50))
+            sys.exit(failed)
+
+        processes = [multiprocessing.get_context('fork').Process(target=publish, args=(name,)) for name in payloads]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertEqual([process.exitcode for process in processes], [0, 0])
+        self.assertIn(json.loads((self.root / 'bank-rates.json').read_text()), list(payloads.values()))
+        gz = json.loads(gzip.decompress((self.root / 'bank-rates.json.gz').read_bytes()))
+        self.assertIn(gz, list(payloads.values()))
+        self.assertEqual(list(self.root.glob('.*.tmp')), [])
+        self.assertEqual((self.root / 'bank-rates.json').stat().st_mode & 0o777, 0o644)
+
+
+class DispatchLockTests(SimpleTestCase):
+    """Блокировка диспетчера парсеров"""
+
+    def tearDown(self):
+        cache.delete(DISPATCH_LOCK_KEY)
+
+    def test_keeps_lock_taken_by_next_run(self):
+        def take_due(scrapers):
+            # Блокировка истекла посреди парсинга, и её взял следующий запуск
+            cache.set(DISPATCH_LOCK_KEY, 'next-run')
+            return []
+
+        with mock.patch('app.tasks.get_scrapers', return_value=[]), \
+                mock.patch('app.tasks.take_due', side_effect=take_due):
+            dispatch_currency_updates()
+        self.assertEqual(cache.get(DISPATCH_LOCK_KEY), 'next-run')
+
+    def test_releases_own_lock(self):
+        with mock.patch('app.tasks.get_scrapers', return_value=[]), \
+                mock.patch('app.tasks.take_due', return_value=[]):
+            dispatch_currency_updates()
+        self.assertIsNone(cache.get(DISPATCH_LOCK_KEY))
+
+
+class PartitionTests(SimpleTestCase):
+    """Месячные партиции истории курсов: имена и срок хранения"""
+
+    def test_months(self):
+        self.assertEqual(add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        self.assertEqual(add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+        self.assertEqual(partition_name(date(2026, 3, 1)), 'app_currencyexchangerate_p2026_03')
+
+    def test_expired_partitions(self):
+        partitions = {add_months(date(2026, 1, 1), offset): f'p{offset}' for offset in range(12)}
+        with mock.patch('app.partitions.list_partitions', return_value=partitions):
+            expired = expired_partitions(date(2026, 10, 18), retention_months=6)
+        self.assertEqual(list(expired.values()), ['p0', 'p1', 'p2'])
+
+
+@skipUnless(connection.vendor == 'postgresql', "Партиции есть только в PostgreSQL")
+class PartitionMigrationTests(TransactionTestCase):
+    """
+    Миграция 0006 туда и обратно на заполненной таблице, создание партиций поверх
+    DEFAULT и отключение партиции с текущими курсами
+    """
+
+    before, partitioned = [('app', '0005_query_indexes')], [('app', '0006_partition_rate_history')]
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate(target)
+        return executor.loader.project_state(target).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes('app'))
+
+    def query(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def assertTableIntact(self, count):
+        self.assertEqual(self.query(f'SELECT count(*) FROM {PARENT_TABLE}')[0][0], count)
+        (max_id, next_id), = self.query(
+            f"SELECT max(id), nextval(pg_get_serial_sequence('{PARENT_TABLE}', 'id')) FROM {PARENT_TABLE}"
+        )
+        self.assertGreater(next_id, max_id)
+        indexes = dict(self.query(
+            'SELECT indexrelid::regclass::text, indisunique FROM pg_index WHERE indrelid = %s::regclass', [PARENT_TABLE]
+        ))
+        self.assertLessEqual({'rate_bank_currency_latest_idx', 'rate_created_idx', 'rate_active_date_idx'}, set(indexes))
+        # Только первичный ключ, под прежним именем: повторный прогон не добавляет копий индексов
+        self.assertEqual([name for name, unique in indexes.items() if unique], [f'{PARENT_TABLE}_pkey'])
+        foreign_keys = self.query(
+            "SELECT confrelid::regclass::text FROM pg_constraint"
+            " WHERE conrelid = %s::regclass AND contype = 'f' AND conparentid = 0",
+            [PARENT_TABLE],
+        )
+        self.assertEqual(sorted(table for table, in foreign_keys), ['app_bank', 'app_currency'])
+
+    def test_migrate_forward_and_back(self):
+        apps = self.migrate(self.before)
+        bank = apps.get_model('app', 'Bank').objects.create(name='Bank A')
+        currency = apps.get_model('app', 'Currency').objects.create(code='USD', name='US Dollar')
+        rates = apps.get_model('app', 'CurrencyExchangeRate')
+        rows = rates.objects.bulk_create([
+            rates(bank=bank, currency=currency, buy=Decimal('10') + i, sell=Decimal('11') + i) for i in range(30)
+        ])
+        # Строки за последние полгода, по нескольку на месяц; created_at задаётся в обход auto_now_add
+        now = timezone.now()
+        for i, row in enumerate(rows):
+            rates.objects.filter(id=row.id).update(created_at=now - timedelta(days=6 * i))
+
+        self.migrate(self.partitioned)
+        self.assertTrue(is_partitioned())
+        self.assertTableIntact(30)
+        self.assertIn(add_months(now.date().replace(day=1), -4), list_partitions())
+
+        # Строка за пределами созданных месяцев попадает в DEFAULT и переезжает в новую партицию
+        month = add_months(now.date().replace(day=1), 12)
+        future = CurrencyExchangeRate.objects.create(bank_id=bank.id, currency_id=currency.id, buy=1, sell=2)
+        CurrencyExchangeRate.objects.filter(id=future.id).update(created_at=now + timedelta(days=365))
+        self.assertGreater(future.id, max(row.id for row in rows))
+        in_table = f'SELECT tableoid::regclass::text FROM {PARENT_TABLE} WHERE id = %s'
+        self.assertEqual(self.query(in_table, [future.id])[0][0], f'{PARENT_TABLE}_default')
+
+        self.assertEqual(create_partition(month), partition_name(month))
+        self.assertEqual(self.query(in_table, [future.id])[0][0], partition_name(month))
+        self.assertIn(month, list_partitions())
+        self.assertTableIntact(31)
+
+        self.migrate(self.before)
+        self.assertFalse(is_partitioned())
+        self.assertTableIntact(31)
+
+    def test_detach_keeps_current_rates(self):
+        use_temp_snapshot_dir(self)
+        reference_cache.reset()
+        self.addCleanup(reference_cache.reset)
+        save_rates({'Bank A': [
+            {'currency': 'USD', 'buy': Decimal('10'), 'sell': Decimal('11')},
+            {'currency': 'EUR', 'buy': Decimal('12'), 'sell': Decimal('13')},
+        ]})
+        save_rates({'Bank A': [{'currency': 'EUR', 'buy': Decimal('12.5'), 'sell': Decimal('13')}]})
+        usd, old_eur, eur = CurrencyExchangeRate.objects.order_by('id')
+
+        # USD с тех пор не менялся: его текущая строка и старая строка EUR — в давно прошедшем месяце
+        month = add_months(timezone.now().date().replace(day=1), -24)
+        CurrencyExchangeRate.objects.filter(id__in=[usd.id, old_eur.id]).update(
+            created_at=timezone.make_aware(datetime.combine(month + timedelta(days=3), time.min)),
+        )
+        name = create_partition(month)
+
+        detach_partition(name, drop=True)
+
+        self.assertFalse(CurrencyExchangeRate.objects.filter(id__in=[usd.id, old_eur.id]).exists())
+        current = {row.currency.code: row for row in CurrencyExchangeRate.objects.current().select_related('currency')}
+        self.assertEqual(current['EUR'].id, eur.id)
+        self.assertEqual((current['USD'].buy, current['USD'].date), (usd.buy, usd.date))
+        self.assertEqual(
+            dict(CurrentRate.objects.values_list('currency__code', 'rate_id')),
+            {code: row.id for code, row in current.items()},
+        )
+        self.assertEqual(CurrencyExchangeRate.objects.latest_per_bank().count(), 2)
+        self.assertEqual({entry['id'] for entry in get_bank_rates()}, {row.id for row in current.values()})
+
+
+class RateCacheTests(TestCase):
+    """Кэш текущих курсов: заполняется при записи, читается без запросов к БД"""
+
+    def setUp(self):
+        cache.clear()
+        reference_cache.reset()
+        self.rates_by_bank = {}
+        for scraper in get_scrapers():
+            self.rates_by_bank[scraper.bank_name] = scraper.clean(scraper.parse(load_fixture(scraper)))
+
+    def tearDown(self):
+        reference_cache.reset()
+        cache.clear()
+
+    def test_cache_matches_database(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            save_rates(self.rates_by_bank)
+        cached = get_bank_rates()
+        cache.clear()
+        self.assertEqual(cached, get_bank_rates())
+        self.assertEqual(len(cached), sum(len(rates) for rates in self.rates_by_bank.values()))
+
+    def test_write_through(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            save_rates(self.rates_by_bank)
+        get_bank_rates()
+
+        bank_name, rates = next(iter(self.rates_by_bank.items()))
+        rates[0]['buy'] += Decimal('0.5')
+        with self.captureOnCommitCallbacks(execute=True):
+            save_rates({bank_name: rates})
+
+        with self.assertNumQueries(0):
+            entries = get_bank_rates()
+        entry = next(
+            entry for entry in entries
+            if entry['bank_name'] == bank_name and entry['currency_code'] == rates[0]['currency']
+        )
+        self.assertEqual(entry['buy'], str(rates[0]['buy']))
+
+    def test_market_rate_moved_to_new_city(self):
+        use_temp_snapshot_dir(self)
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create(username='admin', role='admin'))
+        usd = Currency.objects.create(code='USD', name='US Dollar')
+        for buy in ('10.5', '10.6'):
+            with self.captureOnCommitCallbacks(execute=True):
+                rate = client.post('/api/admin/market-exchange-rates/', {
+                    'currency': usd.id, 'city_name': 'Душанбе', 'buy': buy, 'sell': '11',
+                }, format='json').json()
+        self.assertEqual([entry['city_name'] for entry in get_city_rates()], ['Душанбе'])
+
+        # В Душанбе остаётся прежний курс, а новая пара должна попасть в индекс
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch(f"/api/admin/market-exchange-rates/{rate['id']}/", {'city_name': 'Худжанд'}, format='json')
+        entries = get_city_rates()
+        self.assertEqual([(entry['city_name'], entry['buy']) for entry in entries], [
+            ('Душанбе', '10.5000'), ('Худжанд', '10.6000'),
+        ])
+
+
+    def test_worker_deleted_with_rates(self):
+        use_temp_snapshot_dir(self)
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create(username='admin', role='admin'))
+        usd = Currency.objects.create(code='USD', name='US Dollar')
+        for buy in ('10.5', '10.6'):
+            worker = CustomUser.objects.create(username=f'worker{buy}', role='city_worker', city_name='Душанбе')
+            with self.captureOnCommitCallbacks(execute=True):
+                client.post('/api/admin/market-exchange-rates/', {
+                    'currency': usd.id, 'city_name': 'Душанбе', 'buy': buy, 'sell': '11',
+                }, format='json')
+            MarketExchangeRate.objects.filter(buy=Decimal(buy)).update(added_by=worker)
+        self.assertEqual([entry['buy'] for entry in get_city_rates()], ['10.6000'])
+
+        # Вместе с работником удалился его курс — текущим снова становится курс первого
+        with self.captureOnCommitCallbacks(execute=True):
+            client.delete(f'/api/admin/workers/{worker.id}/')
+        self.assertEqual([entry['buy'] for entry in get_city_rates()], ['10.5000'])
+        hour = MarketRateRollup.objects.get(city_name='Душанбе', granularity='hour')
+        self.assertEqual((hour.samples, hour.buy_close), (1, Decimal('10.5')))
+
+    def test_bank_renamed_and_deleted(self):
+        use_temp_snapshot_dir(self)
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create(username='admin', role='admin'))
+        with self.captureOnCommitCallbacks(execute=True):
+            save_rates({
+                name: [{'currency': 'USD', 'buy': Decimal('10.5'), 'sell': Decimal('11')}] for name in ('Bank A', 'Bank B')
+            })
+        self.assertEqual([entry['bank_name'] for entry in get_bank_rates()], ['Bank A', 'Bank B'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch(f"/api/admin/banks/{Bank.objects.get(name='Bank A').id}/", {'name': 'Bank C'}, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            client.delete(f"/api/admin/banks/{Bank.objects.get(name='Bank B').id}/")
+        self.assertEqual([entry['bank_name'] for entry in get_bank_rates()], ['Bank C'])
+
+class QueryPlanTests(TestCase):
+    """Запросы горячих эндпоинтов идут по своим индексам, а не полным просмотром таблицы"""
+
+    @classmethod
+    def setUpTestData(cls):
+        banks = Bank.objects.bulk_create([Bank(name=f'Bank {i}') for i in range(10)])
+        currencies = Currency.objects.bulk_create([Currency(code=code, name=code) for code in ('USD', 'EUR', 'RUB')])
+        CurrencyExchangeRate.objects.bulk_create([
+            CurrencyExchangeRate(bank=bank, currency=currency, buy=Decimal('10') + i, sell=Decimal('11') + i)
+            for i in range(20) for bank in banks for currency in currencies
+        ])
+
+        worker = CustomUser.objects.create(username='worker', role='city_worker', city_name='City 0')
+        rates = MarketExchangeRate.objects.bulk_create([
+            MarketExchangeRate(
+                currency=currency, city_name=f'City {city}', buy=Decimal('10'), sell=Decimal('11'),
+                added_by=worker, is_active=i % 4 != 0,
+            )
+            for i in range(10) for city in range(10) for currency in currencies
+        ])
+        WorkerActivity.objects.bulk_create([
+            WorkerActivity(worker=worker, action='add_rate', description='', related_rate=rate) for rate in rates
+        ])
+
+    def assertUsesIndex(self, queryset, index_name):
+        names = {index_name}
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # На маленьком наборе данных планировщик и так предпочёл бы полный просмотр;
+                # без статистики свежих строк он не отличает селективные индексы
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'ANALYZE {queryset.model._meta.db_table}')
+                # У таблицы с партициями план называет индексы партиций, унаследованные от индекса родителя
+                cursor.execute(
+                    'SELECT child.relname FROM pg_inherits'
+                    ' JOIN pg_class child ON child.oid = inhrelid JOIN pg_class parent ON parent.oid = inhparent'
+                    ' WHERE parent.relname = %s',
+                    [index_name],
+                )
+                names.update(name for name, in cursor.fetchall())
+        elif connection.vendor != 'sqlite':
+            self.skipTest(f"План запроса для {connection.vendor} не проверяется")
+        plan = queryset.explain()
+        self.assertTrue(any(name in plan for name in names), plan)
+
+    def test_bank_rates_history_page(self):
+        self.assertUsesIndex(CurrencyExchangeRate.objects.order_by('-created_at', '-id')[:101], 'rate_created_idx')
+
+    def test_bank_rates_latest_per_bank(self):
+        pair = {'bank': Bank.objects.get(name='Bank 1'), 'currency': Currency.objects.get(code='USD')}
+        rows = CurrencyExchangeRate.objects.filter(**pair).order_by('bank', 'currency', '-created_at')
+        self.assertUsesIndex(rows, 'rate_bank_currency_latest_idx')
+
+    def test_today_bank_rates_count(self):
+        today = timezone.now().date()
+        self.assertUsesIndex(CurrencyExchangeRate.objects.filter(date=today, is_active=True), 'rate_active_date_idx')
+
+    def test_worker_city_rates_page(self):
+        rows = MarketExchangeRate.objects.filter(city_name='City 1').order_by('-created_at', '-id')[:101]
+        self.assertUsesIndex(rows, 'market_city_created_idx')
+
+    def test_public_rates_page(self):
+        rows = MarketExchangeRate.objects.filter(is_active=True).order_by('-created_at', '-id')[:101]
+        self.assertUsesIndex(rows, 'market_active_created_idx')
+
+    def test_current_market_rate(self):
+        currency = Currency.objects.get(code='USD')
+        rows = (
+            MarketExchangeRate.objects
+            .filter(is_active=True, city_name='City 1', currency=currency)
+            .order_by('-date', '-time', '-id')[:1]
+        )
+        self.assertUsesIndex(rows, 'market_active_pair_idx')
+
+    def test_today_activity(self):
+        start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        rows = WorkerActivity.objects.filter(timestamp__gte=start, timestamp__lt=start + timedelta(days=1))
+        self.assertUsesIndex(rows, 'activity_timestamp_idx')
+
+    def test_activity_date_filter(self):
+        # Вчерашний день: без диапазона по timestamp пришлось бы просмотреть весь журнал
+        day = timezone.localdate() - timedelta(days=1)
+        rows = WorkerActivityFilter({'date_from': day, 'date_to': day}, queryset=WorkerActivity.objects.order_by()).qs
+        self.assertUsesIndex(rows, 'activity_timestamp_idx')
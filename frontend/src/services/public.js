@@ -2,10 +2,10 @@
 import apiClient from './client.js'
 
 export const publicAPI = {
-  // Получение рыночных курсов валют
+  // Получение текущих рыночных курсов валют (последний курс по каждому городу и валюте)
   async getRates() {
     try {
-      const response = await apiClient.get('/public/rates/')
+      const response = await apiClient.get('/public/rates/latest/')
       return response
     } catch (error) {
       console.error('Get public rates error:', error)
@@ -2,7 +2,6 @@
 import { defineStore } from 'pinia'
 import { ref, computed } from 'vue'
 import apiClient from '@/services/client.js'
-import { adminAPI } from '@/services/admin.js'
 
 export const useRatesStore = defineStore('rates', () => {
   const bankRates = ref([])
@@ -18,7 +17,8 @@ export const useRatesStore = defineStore('rates', () => {
     try {
       console.log('[DEBUG Store] Fetching bank rates...')
 
-      const response = await adminAPI.getBankRates()
+      // Текущий курс каждого банка (история курсов теперь отдаётся постранично)
+      const response = await apiClient.get('/public/bank-rates/latest/')
 
       console.log('[DEBUG Store] Bank rates response:', response.data)
 
@@ -72,8 +72,8 @@ export const useRatesStore = defineStore('rates', () => {
     try {
       console.log('[DEBUG Store] Fetching market rates...')
 
-      // Используем публичный эндпоинт для рыночных курсов
-      const response = await apiClient.get('/public/rates/')
+      // Текущий рыночный курс каждого города
+      const response = await apiClient.get('/public/rates/latest/')
 
       console.log('[DEBUG Store] Market rates response:', response.data)
 
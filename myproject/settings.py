@@ -1,7 +1,6 @@
 import os
 from dotenv import load_dotenv
 from pathlib import Path
-from celery.schedules import crontab
 from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -52,6 +51,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Фильтры задаются filterset_class у представлений истории курсов (app/filters.py)
+    'DEFAULT_FILTER_BACKENDS': [
+        'django_filters.rest_framework.DjangoFilterBackend',
+    ],
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
     'DATE_FORMAT': '%Y-%m-%d',
     'TIME_FORMAT': '%H:%M:%S',
@@ -107,12 +110,74 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
 CELERY_BEAT_SCHEDULE = {
-    'update-currency-every-12-hours': {
-        'task': 'app.tasks.update_currency',
-        'schedule': crontab(minute=0, hour='*/12'),
+    # Каждый банк обновляется по своему расписанию (app/scheduler.py),
+    # диспетчер лишь проверяет, у кого подошло время
+    'dispatch-currency-updates': {
+        'task': 'app.tasks.dispatch_currency_updates',
+        'schedule': timedelta(minutes=5),
+    },
+    # Партиции истории курсов банков на месяцы вперёд (app/partitions.py)
+    'maintain-rate-partitions': {
+        'task': 'app.tasks.maintain_rate_partitions',
+        'schedule': timedelta(days=1),
     },
 }
 
+# Общий кэш (Redis): отчёты парсеров и прочие данные, общие для web и celery
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_CACHE_URL', 'redis://redis:6379/1'),
+    }
+}
+
+# Сколько секунд живёт запись кэша текущих курсов (app/rate_cache.py); обновляется при каждой записи курса
+RATE_CACHE_TIMEOUT = int(os.getenv('RATE_CACHE_TIMEOUT', str(24 * 60 * 60)))
+
+# Справочник городов (app/cities.py): файл перечитывается при изменении, mtime проверяется раз в CITIES_RELOAD_INTERVAL секунд
+CITIES_FILE = os.getenv('CITIES_FILE', str(BASE_DIR / 'frontend' / 'public' / 'cities.json'))
+CITIES_RELOAD_INTERVAL = float(os.getenv('CITIES_RELOAD_INTERVAL', '5'))
+
+# Каталог снимков публичных курсов (app/snapshots.py), который nginx отдаёт как /snapshots/
+RATE_SNAPSHOT_DIR = os.getenv('RATE_SNAPSHOT_DIR', str(BASE_DIR / 'snapshots'))
+
+# Сколько секунд статистика админ-панели читается из кэша (app/statistics.py); сбрасывается при записи
+STATISTICS_CACHE_TIMEOUT = int(os.getenv('STATISTICS_CACHE_TIMEOUT', '30'))
+
+# Месячные партиции истории курсов банков (app/partitions.py, команда rate_partitions):
+# на сколько месяцев вперёд создавать и сколько месяцев хранить (0 — хранить всё)
+RATE_PARTITIONS_AHEAD = int(os.getenv('RATE_PARTITIONS_AHEAD', '3'))
+RATE_HISTORY_RETENTION_MONTHS = int(os.getenv('RATE_HISTORY_RETENTION_MONTHS', '0'))
+
+# Сколько точек не больше отдаёт /api/public/history/: по длине диапазона выбирается шаг свёртки (app/rollups.py)
+RATE_HISTORY_MAX_POINTS = int(os.getenv('RATE_HISTORY_MAX_POINTS', '500'))
+
+# Сколько банков парсится одновременно в update_currency
+CURRENCY_UPDATE_MAX_WORKERS = int(os.getenv('CURRENCY_UPDATE_MAX_WORKERS', '8'))
+
+# Сколько загрузок банков допускается в сутки (0 — по 2 на банк, как при запуске раз в 12 часов)
+CURRENCY_DAILY_FETCH_BUDGET = int(os.getenv('CURRENCY_DAILY_FETCH_BUDGET', '0'))
+# Сколько секунд диспетчер держит блокировку, если воркер упал посреди обновления
+CURRENCY_DISPATCH_LOCK_TIMEOUT = int(os.getenv('CURRENCY_DISPATCH_LOCK_TIMEOUT', '1800'))
+
+# Общий HTTP-клиент для банков со статическими страницами (app/http_fetcher.py)
+HTTP_FETCH_TIMEOUT = float(os.getenv('HTTP_FETCH_TIMEOUT', '15'))
+HTTP_FETCH_MAX_CONNECTIONS = int(os.getenv('HTTP_FETCH_MAX_CONNECTIONS', '20'))
+HTTP_FETCH_HOST_TIMEOUTS = {
+    'nbt.tj': 20,
+    'eskhata.com': 20,
+}
+
+# Предохранитель и повторы парсеров банков (app/circuit_breaker.py)
+SCRAPER_BREAKER_THRESHOLD = int(os.getenv('SCRAPER_BREAKER_THRESHOLD', '3'))  # Неудач подряд до размыкания
+SCRAPER_BREAKER_COOLDOWN = int(os.getenv('SCRAPER_BREAKER_COOLDOWN', '1800'))  # Секунд до пробного запуска
+SCRAPER_RETRY_BASE_DELAY = float(os.getenv('SCRAPER_RETRY_BASE_DELAY', '1'))
+SCRAPER_RETRY_MAX_ATTEMPTS = int(os.getenv('SCRAPER_RETRY_MAX_ATTEMPTS', '3'))
+
+# Пул headless-браузеров для банков с JS-рендерингом (app/browser_pool.py)
+BROWSER_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '3'))
+BROWSER_POOL_MAX_PAGES = int(os.getenv('BROWSER_POOL_MAX_PAGES', '20'))
+
 # 🔥 ИСПРАВЛЕНИЕ: Добавляем логирование для приложения
 LOGGING = {
     'version': 1,
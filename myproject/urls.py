@@ -48,6 +48,7 @@ urlpatterns = [
     # 🔥 Новые endpoints
     path('api/health/', myviews.health_check, name='health-check'),
     path('api/admin/statistics/', myviews.get_admin_statistics, name='admin-statistics'),
+    path('api/admin/scrapers/health/', myviews.scrapers_health, name='scrapers-health'),
     path('api/cities/', myviews.get_cities, name='get-cities'),
 
     # Аутентификация
@@ -59,6 +60,11 @@ urlpatterns = [
 
     path('api/admin/', include(admin_router.urls)),
     path('api/workers/', include(worker_router.urls)),
+    # Текущие курсы из кэша; до роутера, иначе 'latest' примут за id записи
+    path('api/public/bank-rates/latest/', myviews.latest_bank_rates, name='latest-bank-rates'),
+    path('api/public/rates/latest/', myviews.latest_market_rates, name='latest-market-rates'),
+    path('api/public/best-rates/', myviews.best_rates_view, name='best-rates'),
+    path('api/public/history/', myviews.rate_history, name='rate-history'),
     path('api/public/', include(public_router.urls)),
 
     path('api/public/rates/', myviews.PublicRatesView.as_view(), name='public-rates'),